@@ -0,0 +1,4 @@
+from agentkit.bench.async_tools import main
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,4 @@
+from agentkit.bench.tools import main
+
+if __name__ == "__main__":
+    raise SystemExit(main())
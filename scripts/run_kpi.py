@@ -1,24 +1,44 @@
-import argparse, os
+import argparse, json, os
 from agentkit.agent.core import build_agent
+from agentkit.config import settings
 from agentkit.kpi.evaluator import KPIEvaluator
+from agentkit.tools.metrics import metrics as tool_metrics
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--scenario", default="scenarios/scenario1.json")
     ap.add_argument("--cpu", action="store_true")
+    ap.add_argument("--cpu-engine", choices=["fp32", "bf16", "int8"], default=None,
+                    help="CPU yükleme motoru (varsayılan CPU_ENGINE)")
     ap.add_argument("--no-unsloth", action="store_true")
+    ap.add_argument("--server", default=None,
+                    help="Modeli yüklemek yerine bu model sunucusuna bağlan (varsayılan AGENTKIT_MODEL_SERVER)")
     ap.add_argument("--out", default=None)
     ap.add_argument("--verbose", action="store_true")
+    ap.add_argument("--no-isolate", action="store_true", help="Senaryolar veri çatalı yerine gerçek veriye yazsın")
+    ap.add_argument("--workers", type=int, default=1, help="Paralel senaryo sayısı")
+    ap.add_argument("--tool-metrics", default=None, help="Araç ölçümlerinin (gecikme, hata, boyut) yazılacağı JSON")
+    ap.add_argument("--tool-top-k", type=int, default=None,
+                    help="İsteme yalnızca en ilgili k aracı yaz (0: tüm katalog; varsayılan AGENTKIT_TOOL_TOP_K)")
     args = ap.parse_args()
 
     if args.cpu:
         os.environ["FORCE_CPU"] = "1"
         os.environ["CUDA_VISIBLE_DEVICES"] = ""
+        # settings içe aktarılırken okundu; apply() CUDA_VISIBLE_DEVICES'ı bu değerle yeniden yazar.
+        settings.force_cpu = True
+        settings.cuda_visible_devices = ""
+    if args.cpu_engine:
+        settings.cpu.engine = args.cpu_engine
 
-    agent = build_agent(use_unsloth=not args.no_unsloth)
+    agent = build_agent(use_unsloth=not args.no_unsloth, tool_top_k=args.tool_top_k, server=args.server)
     kpi = KPIEvaluator(agent)
-    df = kpi.run(args.scenario, save_csv=args.out, verbose=args.verbose)
+    df = kpi.run(args.scenario, save_csv=args.out, verbose=args.verbose, isolate=not args.no_isolate,
+                 workers=args.workers)
     print(df.to_string(index=False))
+    if args.tool_metrics:
+        with open(args.tool_metrics, "w", encoding="utf-8") as f:
+            json.dump(tool_metrics.snapshot(), f, ensure_ascii=False, indent=2)
 
 if __name__ == "__main__":
     main()
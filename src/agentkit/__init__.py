@@ -1,2 +1,9 @@
 from agentkit.config import settings
-from agentkit.agent.core import build_agent
\ No newline at end of file
+
+
+def __getattr__(name):
+    # Ajan (langchain, torch) yalnızca istendiğinde yüklenir; araç ve depolama katmanı hafif içe aktarılır.
+    if name == "build_agent":
+        from agentkit.agent.core import build_agent
+        return build_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,27 +1,75 @@
 # src/agentkit/agent/core.py
+from typing import Any, Iterator, List, Optional
+
 from langchain.agents import AgentExecutor, create_json_chat_agent
-from langchain.memory import ConversationBufferMemory
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.tools.render import render_text_description_and_args
 from langchain.llms.base import LLM
+from langchain_core.outputs import Generation, GenerationChunk, LLMResult
 
+from agentkit.agent.memory import MEMORY_SUMMARY, MEMORY_TOKENS, TokenBudgetMemory, llm_summarizer, token_counter
 from agentkit.config import settings
-from agentkit.models.loader import ModelLoader
-from agentkit.tools.registry import tools
+from agentkit.tools import registry
+from agentkit.tools.metrics import metrics as tool_metrics
 
 class PipelineLLM(LLM):
-    def __init__(self, pipeline):
-        self.pipeline = pipeline
+    pipeline: Any  # LLM bir pydantic modeli: alan tanımlanmadan atama yapılamaz.
+    # True: ajan/LangChain `stream` ile çağırdığında metin token token gelir (sohbet CLI'ı).
+    # False: tekil çağrılar toplu üretim kuyruğundan geçer (`submit`), akış tek parça döner.
+    streaming: bool = False
+
+    def __init__(self, pipeline, streaming: bool = False):
+        super().__init__(pipeline=pipeline, streaming=streaming)
     @property
     def _llm_type(self) -> str:
         return "custom_pipeline"
-    def _call(self, prompt: str, stop=None, **kwargs) -> str:
-        out = self.pipeline(prompt)[0]["generated_text"]
+    @staticmethod
+    def _cut(out: str, stop=None) -> str:
         if stop:
             for s in stop:
                 if s in out:
                     out = out.split(s)[0]
         return out
+    def _complete(self, prompts: List[str], stop=None) -> List[str]:
+        # `stop` üretimi generate içinde bitirir; dizinin kendisi `_cut` ile kesilir.
+        # Tek istem: eşzamanlı çağrılarla (paralel KPI, sunucu) birleştirilebilsin diye kuyruktan.
+        if len(prompts) == 1 and hasattr(self.pipeline, "submit"):
+            return [self.pipeline.submit(prompts[0], stop=stop)]
+        return [out[0]["generated_text"] for out in self.pipeline(prompts, stop=stop)]
+    def _call(self, prompt: str, stop=None, **kwargs) -> str:
+        return self._cut(self._complete([prompt], stop)[0], stop)
+    def _generate(self, prompts: List[str], stop=None, run_manager=None, **kwargs) -> LLMResult:
+        # LangChain `batch()` / `generate()` tüm istemleri tek seferde verir: tek toplu generate.
+        return LLMResult(generations=[[Generation(text=self._cut(out, stop))] for out in self._complete(prompts, stop)])
+    def _stream(self, prompt: str, stop=None, run_manager=None, **kwargs) -> Iterator[GenerationChunk]:
+        if not self.streaming or not hasattr(self.pipeline, "stream"):
+            yield GenerationChunk(text=self._call(prompt, stop))
+            return
+        # Durdurma dizisinin başı olabilecek kuyruk, dizi tamamlanana kadar tutulur.
+        hold = max((len(s) for s in stop or ()), default=1) - 1
+        pending, sent = "", False
+        pieces = self.pipeline.stream(prompt, stop=stop)
+        try:
+            for piece in pieces:
+                pending += piece
+                cuts = [pending.find(s) for s in stop or () if s in pending]
+                if cuts:
+                    pending = pending[:min(cuts)]
+                    break
+                ready = max(0, len(pending) - hold)
+                if ready:
+                    chunk = GenerationChunk(text=pending[:ready])
+                    pending, sent = pending[ready:], True
+                    if run_manager:
+                        run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                    yield chunk
+            if pending or not sent:
+                # LangChain en az bir parça bekler (çıktı durdurma dizisiyle başlasa bile).
+                chunk = GenerationChunk(text=pending)
+                if run_manager and pending:
+                    run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                yield chunk
+        finally:
+            pieces.close()
 
 SYSTEM_PROMPT = """
 -Sen bir XYZ operatör firması asistanısın. Her yanıtında sadece geçerli bir JSON objesi döndür ve JSON objesi haricinde fazladan bir metin yazma. Bu asistanlık görevinde kullanabileceğin araçlar:
@@ -107,22 +155,59 @@ HUMAN_PROMPT = """
 "{input}"
 """
 
-def build_agent(use_unsloth: bool = True) -> AgentExecutor:
-    settings.apply()
-    pipe = ModelLoader(settings).build_pipeline(use_unsloth=use_unsloth)
-    llm = PipelineLLM(pipe)
+def build_agent(use_unsloth: bool = True, tool_top_k: Optional[int] = None, streaming: bool = False,
+                server: Optional[str] = None, memory_tokens: Optional[int] = None) -> AgentExecutor:
+    """Ajanı kurar; araç seçimi, akış, model sunucusu ve bellek bütçesi ortam değişkenlerinden varsayılanlanır."""
+    from agentkit.agent import retrieval
+    from agentkit.server.client import MODEL_SERVER, RemotePipeline
+
+    server = MODEL_SERVER if server is None else server
+    if server:
+        pipe = RemotePipeline(server)
+    else:
+        # Model yükleyici (torch/transformers) yalnızca yerel modelle ajan kurulurken içe aktarılır.
+        from agentkit.models.loader import ModelLoader
+
+        settings.apply()
+        pipe = ModelLoader(settings).build_pipeline(use_unsloth=use_unsloth)
+    tools = registry.get_tools()
+    if getattr(pipe, "tokenizer", None) is not None and tool_metrics.token_counter is None:
+        # Araç yanıtlarının istemde kapladığı token (örneklenen çağrılarda); araç iş parçacıklarından
+        # çağrılır, tokenizer'a pipeline'ın kilidiyle erişir.
+        tool_metrics.token_counter = token_counter(pipe)
+    if settings.gen.constrained_json and not server:
+        from agentkit.grammar import ActionGrammar
+        pipe.grammar = ActionGrammar.from_tools([t.name for t in tools])
+    llm = PipelineLLM(pipe, streaming=streaming)
     prompt = ChatPromptTemplate.from_messages([
         ("system", SYSTEM_PROMPT),
         MessagesPlaceholder("chat_history"),
         ("human", HUMAN_PROMPT),
         MessagesPlaceholder("agent_scratchpad"),
     ])
-    memory = ConversationBufferMemory(return_messages=True, memory_key="chat_history")
     agent = create_json_chat_agent(
         llm=llm,
         tools=tools,
         prompt=prompt,
-        tools_renderer=render_text_description_and_args,
+        tools_renderer=registry.render_tools,
+        # Araçlar ToolResult döner; metne çevirme burada, şablon doldurulurken bir kez yapılır.
         template_tool_response='''```json\n{observation}\n```'''
     )
-    return AgentExecutor(agent=agent, tools=tools, memory=memory, verbose=False)
+    k = retrieval.TOOL_TOP_K if tool_top_k is None else tool_top_k
+    if 0 < k < len(tools):
+        agent = retrieval.ToolRetriever(tools, top_k=k).wrap(agent)
+    # Özet, ajanın kullandığı modelle ama akışsız üretilir (sohbet ekranına düşmesin).
+    memory = new_memory(MEMORY_TOKENS if memory_tokens is None else memory_tokens, token_counter(pipe),
+                        llm_summarizer(PipelineLLM(pipe)) if MEMORY_SUMMARY else None)
+    return AgentExecutor(agent=agent, tools=tools, memory=memory, verbose=False, return_intermediate_steps=True)
+
+def new_memory(max_tokens: int = MEMORY_TOKENS, count_tokens=None, summarize=None) -> TokenBudgetMemory:
+    # Ara adımlar da döndüğünden belleğe yalnızca "output" yazılır.
+    return TokenBudgetMemory(memory_key="chat_history", input_key="input", output_key="output", max_tokens=max_tokens,
+                             summarize=summarize, **({"count_tokens": count_tokens} if count_tokens else {}))
+
+def with_fresh_memory(executor: AgentExecutor) -> AgentExecutor:
+    """Aynı model/istem/araçlarla, boş konuşma belleğine sahip yeni yürütücü (model yeniden yüklenmez)."""
+    memory = executor.memory.fresh() if hasattr(executor.memory, "fresh") else new_memory()
+    return AgentExecutor(agent=executor.agent, tools=executor.tools, memory=memory, verbose=executor.verbose,
+                         return_intermediate_steps=executor.return_intermediate_steps)
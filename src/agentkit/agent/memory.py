@@ -0,0 +1,203 @@
+# src/agentkit/agent/memory.py
+"""Token bütçeli konuşma belleği: en yeni turlar + taşan turların arka planda üretilen özeti."""
+from __future__ import annotations
+
+import os
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from langchain.memory.chat_memory import BaseChatMemory
+from langchain_core.messages import BaseMessage, SystemMessage, get_buffer_string
+from pydantic import PrivateAttr
+
+# İsteme giden geçmişin token bütçesi (sistem istemi hariç); 0: sınırsız.
+MEMORY_TOKENS = int(os.getenv("AGENTKIT_MEMORY_TOKENS", "4096"))
+MEMORY_SUMMARY = os.getenv("AGENTKIT_MEMORY_SUMMARY", "true").lower() in {"1", "true", "yes"}
+# Rol öneki ve ayırıcılar için mesaj başına eklenen pay.
+MESSAGE_OVERHEAD = 4
+SUMMARY_PREFIX = "Konuşmanın önceki bölümünün özeti: "
+SUMMARY_PROMPT = """Aşağıda bir operatör müşteri hizmetleri konuşmasının önceki özeti ve özete henüz
+girmemiş turlar var. Özeti bu turlarla güncelle. Kullanıcının kimlik bilgileri (ad, TC numarası, telefon),
+talepleri, yapılan işlemler ve sonuçları ile bekleyen konular korunmalı. En fazla {words} kelimelik düz metin
+yaz, başka bir şey yazma.
+
+Önceki özet:
+{summary}
+
+Yeni turlar:
+{turns}
+
+Güncel özet:"""
+
+log = logging.getLogger(__name__)
+
+Counter = Callable[[str], int]
+Summarizer = Callable[[str, List[BaseMessage]], str]
+
+
+def _approx_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def token_counter(pipe: Any) -> Counter:
+    """Üretim hattının tokenizer'ı ile token sayımı; tokenizer yoksa karakter/4."""
+    if hasattr(pipe, "_encode"):
+        # `_encode` tokenizer kilidini tutar (üretimle eşzamanlı çağrılabilir).
+        return lambda text: len(pipe._encode([text])[0])
+    tokenizer = getattr(pipe, "tokenizer", None)
+    if tokenizer is not None:
+        return lambda text: len(tokenizer(text)["input_ids"])
+    return _approx_tokens
+
+
+def _plain(text: str) -> str:
+    # Kısıtlı JSON modunda model özeti de eylem JSON'u olarak yazar.
+    text = text.strip()
+    if text.startswith("{"):
+        try:
+            obj = json.loads(text)
+        except ValueError:
+            return text
+        if isinstance(obj, dict) and isinstance(obj.get("action_input"), str):
+            return obj["action_input"].strip()
+    return text
+
+
+def llm_summarizer(llm: Any, words: int = 150) -> Summarizer:
+    """Önceki özeti ve yeni turları `llm` ile tek bir özete katlayan fonksiyon."""
+    def summarize(summary: str, messages: List[BaseMessage]) -> str:
+        prompt = SUMMARY_PROMPT.format(words=words, summary=summary or "(yok)",
+                                       turns=get_buffer_string(messages, human_prefix="Kullanıcı",
+                                                               ai_prefix="Asistan"))
+        return _plain(llm.invoke(prompt))
+    return summarize
+
+
+class TokenBudgetMemory(BaseChatMemory):
+    """Özet + en yeni turlar; isteme giden geçmiş `max_tokens` token'ı aşmaz."""
+
+    memory_key: str = "chat_history"
+    return_messages: bool = True
+    max_tokens: int = MEMORY_TOKENS
+    count_tokens: Counter = _approx_tokens
+    summarize: Optional[Summarizer] = None
+    summary: str = ""
+
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _idle: threading.Event = PrivateAttr(default_factory=threading.Event)
+    _tokens: List[int] = PrivateAttr(default_factory=list)
+    _pending: List[BaseMessage] = PrivateAttr(default_factory=list)
+    _summary_tokens: int = PrivateAttr(default=0)
+    _epoch: int = PrivateAttr(default=0)
+
+    def __init__(self, **data: Any):
+        super().__init__(**data)
+        self._idle.set()
+
+    @property
+    def memory_variables(self) -> List[str]:
+        return [self.memory_key]
+
+    def fresh(self) -> "TokenBudgetMemory":
+        """Aynı ayarlarla boş bellek."""
+        return type(self)(memory_key=self.memory_key, return_messages=self.return_messages,
+                          input_key=self.input_key, output_key=self.output_key, max_tokens=self.max_tokens,
+                          count_tokens=self.count_tokens, summarize=self.summarize)
+
+    def _sync(self) -> List[BaseMessage]:
+        # chat_memory'ye dışarıdan eklenen mesajların sayımı (kilit altında çağrılır).
+        messages = self.chat_memory.messages
+        for m in messages[len(self._tokens):]:
+            self._tokens.append(self.count_tokens(m.content if isinstance(m.content, str) else str(m.content))
+                                + MESSAGE_OVERHEAD)
+        return messages
+
+    # ----------------------- okuma -----------------------
+    def window(self) -> List[BaseMessage]:
+        """İsteme yazılacak mesajlar: varsa özet, ardından bütçeye sığan en yeni mesajlar (en az biri)."""
+        with self._lock:
+            messages = list(self._sync())
+            tokens = list(self._tokens)
+            summary, used = self.summary, self._summary_tokens
+        if self.max_tokens <= 0:
+            return messages
+        keep = len(messages)
+        while keep > 0 and (keep == len(messages) or used + tokens[keep - 1] <= self.max_tokens):
+            keep -= 1
+            used += tokens[keep]
+        out: List[BaseMessage] = [SystemMessage(content=SUMMARY_PREFIX + summary)] if summary else []
+        return out + messages[keep:]
+
+    def load_memory_variables(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        messages = self.window()
+        return {self.memory_key: messages if self.return_messages else get_buffer_string(messages)}
+
+    # ----------------------- yazma -----------------------
+    def save_context(self, inputs: Dict[str, Any], outputs: Dict[str, str]) -> None:
+        super().save_context(inputs, outputs)
+        if self.max_tokens <= 0:
+            return
+        with self._lock:
+            messages = self._sync()
+            limit = self.max_tokens - self._summary_tokens
+            total = sum(self._tokens)
+            if total <= limit:
+                return
+            # Bütçenin dörtte biri boş kalana kadar en eski turlar (insan + asistan) çıkarılır.
+            target, cut = limit - limit // 4, 0
+            while total > target and len(messages) - cut > 2:
+                total -= self._tokens[cut] + self._tokens[cut + 1]
+                cut += 2
+            evicted = messages[:cut]
+            self.chat_memory.messages = messages[cut:]
+            del self._tokens[:cut]
+            if self.summarize is None or not evicted:
+                return
+            self._pending.extend(evicted)
+            if not self._idle.is_set():
+                return  # çalışan özetleme bunları da alır
+            self._idle.clear()
+        threading.Thread(target=self._fold, name="memory-summary", daemon=True).start()
+
+    def _fold(self) -> None:
+        while True:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                summary, epoch = self.summary, self._epoch
+                if not batch:
+                    self._idle.set()
+                    return
+            try:
+                summary, tokens = self._fit(self.summarize(summary, batch))
+            except Exception:
+                log.warning("konuşma özeti güncellenemedi; %d mesaj özete girmedi", len(batch), exc_info=True)
+                continue
+            with self._lock:
+                if epoch == self._epoch:  # arada clear() çağrılmadıysa
+                    self.summary, self._summary_tokens = summary, tokens
+
+    def _fit(self, summary: str) -> Tuple[str, int]:
+        # Özet bütçenin en fazla yarısını kaplar; uzunsa kelime sınırından kesilir
+        # (yoksa pencereye yer kalmaz, her kayıt geçmişi iki mesaja indirir).
+        summary, cap = summary.strip(), self.max_tokens // 2
+        while summary:
+            tokens = self.count_tokens(SUMMARY_PREFIX + summary) + MESSAGE_OVERHEAD
+            if tokens <= cap:
+                return summary, tokens
+            head = summary[:len(summary) * cap // tokens]
+            summary = (head.rsplit(None, 1)[0] if " " in head.strip() else head).rstrip()
+        return "", 0
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Arka plandaki özetleme bitene kadar bekler."""
+        return self._idle.wait(timeout)
+
+    def clear(self) -> None:
+        with self._lock:
+            super().clear()
+            self._tokens.clear()
+            self._pending.clear()
+            self.summary, self._summary_tokens = "", 0
+            self._epoch += 1
@@ -0,0 +1,118 @@
+# src/agentkit/agent/retrieval.py
+"""İsteme yazılacak araçların seçimi (tool retrieval): mesajlara en yakın `AGENTKIT_TOOL_TOP_K` araç."""
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from agentkit.tools import registry
+from agentkit.tools.schemas import function_schemas
+
+# 0: kapalı, tüm katalog isteme yazılır.
+TOOL_TOP_K = int(os.getenv("AGENTKIT_TOOL_TOP_K", "0"))
+TOOL_EMBED_MODEL = os.getenv("AGENTKIT_TOOL_EMBED_MODEL", "trmteb/turkish-embedding-model")
+ALWAYS = ("getUserInfo",)
+HISTORY_TURNS = 2
+# Araç skoru: mesaj benzerliklerinin (eskiye doğru bu oranla azaltılmış) en büyüğü.
+HISTORY_DECAY = 0.85
+
+Embedder = Callable[[List[str]], Any]
+
+_models: Dict[str, Any] = {}
+_models_lock = threading.Lock()
+
+
+def sentence_embedder(model_name: str = TOOL_EMBED_MODEL) -> Embedder:
+    """SentenceTransformer ile normalize gömme; model süreç başına bir kez yüklenir."""
+    def embed(texts: List[str]) -> np.ndarray:
+        with _models_lock:
+            if model_name not in _models:
+                from sentence_transformers import SentenceTransformer
+                _models[model_name] = SentenceTransformer(model_name)
+            model = _models[model_name]
+        return model.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+    return embed
+
+
+def tool_text(schema: Dict[str, Any]) -> str:
+    """Gömülecek metin: ad, açıklama ve parametre açıklamaları."""
+    props = (schema.get("parameters") or {}).get("properties") or {}
+    params = "; ".join(f"{k}: {v.get('description', '')}" for k, v in props.items())
+    return f"{schema['name']}: {schema.get('description', '')}" + (f" ({params})" if params else "")
+
+
+def _message_text(m: Any) -> Optional[str]:
+    if isinstance(m, dict):
+        return m.get("content") if m.get("role") in ("user", "human") else None
+    return m.content if getattr(m, "type", None) == "human" and isinstance(m.content, str) else None
+
+
+class ToolRetriever:
+    """Tur başına en ilgili `top_k` aracı seçer ve istem değişkenlerini (`tools`, `tool_names`) üretir."""
+
+    def __init__(self, tools: Iterable[Any], top_k: int = TOOL_TOP_K, embed: Optional[Embedder] = None,
+                 always: Sequence[str] = ALWAYS, history_turns: int = HISTORY_TURNS,
+                 decay: float = HISTORY_DECAY, renderer: Callable[[list], str] = registry.render_tools,
+                 memo_size: int = 256):
+        self.tools = list(tools)
+        self.top_k = top_k
+        self.embed = embed or sentence_embedder()
+        self.always = set(always)
+        self.history_turns = history_turns
+        self.decay = decay
+        self.renderer = renderer
+        schemas = {s["name"]: s for s in function_schemas}
+        texts = [tool_text(schemas[t.name]) if t.name in schemas else f"{t.name}: {t.description}"
+                 for t in self.tools]
+        self._matrix = np.asarray(self.embed(texts), dtype=np.float32)
+        self._memo: "OrderedDict[tuple, Dict[str, str]]" = OrderedDict()
+        self._memo_size = memo_size
+        self._lock = threading.Lock()
+
+    def queries(self, inputs: Dict[str, Any]) -> List[str]:
+        """Güncel mesaj + en yeni `history_turns` kullanıcı mesajı (yeniden eskiye)."""
+        out = [str(inputs.get("input") or "")]
+        for m in reversed(inputs.get("chat_history") or []):
+            if len(out) > self.history_turns:
+                break
+            text = _message_text(m)
+            if text:
+                out.append(text)
+        return out
+
+    def select(self, queries: Sequence[str]) -> List[Any]:
+        """Katalog sırasını koruyarak seçilen araçlar."""
+        q = np.asarray(self.embed(list(queries)), dtype=np.float32)
+        weights = self.decay ** np.arange(len(queries), dtype=np.float32)
+        sim = q @ self._matrix.T
+        # Azaltma eski mesajların benzerliğini düşürmeli: negatif benzerlik çarpımla sıfıra (yukarı) gideceği
+        # için önce sıfırda kesilir. Güncel mesaj (ağırlık 1) kesilmez; sıralaması aynen korunur.
+        sim[1:] = np.clip(sim[1:], 0, None) * weights[1:, None]
+        scores = sim.max(axis=0)
+        chosen = {self.tools[i].name for i in np.argsort(-scores)[:self.top_k]} | self.always
+        return [t for t in self.tools if t.name in chosen]
+
+    def prompt_vars(self, inputs: Dict[str, Any]) -> Dict[str, str]:
+        key = tuple(self.queries(inputs))
+        with self._lock:
+            hit = self._memo.get(key)
+            if hit is not None:
+                self._memo.move_to_end(key)
+                return hit
+        tools = self.select(key)
+        out = {"tools": self.renderer(tools), "tool_names": ", ".join(t.name for t in tools)}
+        with self._lock:
+            self._memo[key] = out
+            while len(self._memo) > self._memo_size:
+                self._memo.popitem(last=False)
+        return out
+
+    def wrap(self, agent):
+        """`create_json_chat_agent` çıktısının önüne seçim adımı ekler; girdideki değişkenler istemdekileri ezer."""
+        from langchain_core.runnables import RunnableLambda
+
+        return RunnableLambda(lambda x: {**x, **self.prompt_vars(x)}, name="select_tools") | agent
@@ -0,0 +1,110 @@
+# src/agentkit/bench/async_tools.py
+"""Tek asyncio sürecinde eşzamanlı konuşmalar: araçları doğrudan çağırmak ile `async_api` karşılaştırması."""
+from __future__ import annotations
+
+import os
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from agentkit.bench.datagen import write_dataset
+from agentkit.bench.tools import make_args
+
+# Konuşma turlarında sırayla seçilen araçlar (okuma + yazma karışık).
+TOOLS = ["getUserInfo", "getBillDetails", "blockIncomingNumber", "activateInternationalRoaming"]
+
+
+def _pct(xs: List[float], q: float) -> float:
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(q * (len(xs) - 1)))] if xs else 0.0
+
+
+async def _heartbeat(stop: asyncio.Event, lags: List[float], period: float = 0.001) -> None:
+    while not stop.is_set():
+        t = time.perf_counter()
+        await asyncio.sleep(period)
+        lags.append(time.perf_counter() - t - period)
+
+
+async def _conversations(mode: str, n: int, conversations: int, turns: int, seed: int) -> Dict[str, Any]:
+    from agentkit.tools import api_functions as api
+    from agentkit.tools.async_api import async_function_map
+    from agentkit.tools.schemas import function_schemas
+
+    schemas = {s["name"]: s for s in function_schemas}
+
+    async def conversation(c: int) -> int:
+        rnd = random.Random(f"{seed}:{c}")
+        ok = 0
+        for _ in range(turns):
+            name = TOOLS[rnd.randrange(len(TOOLS))]
+            kw = make_args(schemas[name], rnd, n)
+            if mode == "async":
+                res = await async_function_map[name](**kw)
+            else:
+                res = getattr(api, name)(**kw)
+                await asyncio.sleep(0)  # diğer konuşmalara sıra ver
+            ok += bool(res.get("success"))
+        return ok
+
+    stop, lags = asyncio.Event(), []
+    hb = asyncio.create_task(_heartbeat(stop, lags))
+    t0 = time.perf_counter()
+    oks = await asyncio.gather(*(conversation(c) for c in range(conversations)))
+    wall = time.perf_counter() - t0
+    stop.set()
+    await hb
+    calls = conversations * turns
+    return {
+        "mode": mode,
+        "calls": calls,
+        "ok_rate": sum(oks) / calls if calls else 0.0,
+        "wall_s": wall,
+        "calls_per_s": calls / wall if wall else 0.0,
+        "loop_lag_p50_ms": 1000 * _pct(lags, 0.50),
+        "loop_lag_p99_ms": 1000 * _pct(lags, 0.99),
+        "loop_lag_max_ms": 1000 * max(lags, default=0.0),
+    }
+
+
+def run(customers: int = 10000, conversations: int = 64, turns: int = 20, storage: str = "json",
+        workers: Optional[int] = None, seed: int = 0, workdir: Optional[str] = None) -> List[Dict[str, Any]]:
+    from agentkit.tools import api_functions as api
+    from agentkit.tools import async_api
+
+    if workers:
+        async_api.shutdown()
+        async_api.TOOL_WORKERS = workers
+    rows = []
+    for mode in ("sync", "async"):
+        # Her mod aynı başlangıç verisiyle çalışır.
+        with tempfile.TemporaryDirectory(prefix="agentkit-async-", dir=workdir) as d:
+            paths = write_dataset(d, customers, seed)
+            api.USER_DB, api.PACKAGE_DB = paths["user_db"], paths["package_db"]
+            api.STORAGE, api.SQLITE_DB = storage, os.path.join(d, "agentkit.db")
+            api.getUserInfo("user_0000000")  # yükleme ölçüme girmesin
+            rows.append(asyncio.run(_conversations(mode, customers, conversations, turns, seed)))
+    async_api.shutdown()
+    return rows
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Asenkron araç çağrısı benchmark'ı")
+    ap.add_argument("--customers", type=int, default=10000)
+    ap.add_argument("--conversations", type=int, default=64)
+    ap.add_argument("--turns", type=int, default=20)
+    ap.add_argument("--storage", choices=["json", "sqlite"], default="json")
+    ap.add_argument("--workers", type=int, default=None, help="AGENTKIT_TOOL_WORKERS yerine")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workdir", default=None)
+    args = ap.parse_args(argv)
+
+    rows = run(args.customers, args.conversations, args.turns, args.storage, args.workers, args.seed, args.workdir)
+    print(f"{'mode':>6} {'calls':>7} {'ok':>5} {'wall_s':>7} {'calls/s':>8} {'lag_p50':>8} {'lag_p99':>8} {'lag_max':>8}")
+    for r in rows:
+        print(f"{r['mode']:>6} {r['calls']:>7} {r['ok_rate']:>5.2f} {r['wall_s']:>7.2f} {r['calls_per_s']:>8.0f} "
+              f"{r['loop_lag_p50_ms']:>8.2f} {r['loop_lag_p99_ms']:>8.2f} {r['loop_lag_max_ms']:>8.2f}")
+    return 0
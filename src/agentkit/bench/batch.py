@@ -0,0 +1,94 @@
+# src/agentkit/bench/batch.py
+"""Tek tek araç çağrısı ile toplu (`tools/batch.py`) çağrının verim karşılaştırması."""
+from __future__ import annotations
+
+import gc
+import os
+import json
+import time
+import random
+import argparse
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from agentkit.bench.datagen import write_dataset
+
+TARGET = "05999999999"
+OPS = [
+    ("enable5G", "enable5G", {}),
+    ("blockIncomingNumber", "blockIncomingNumber", {"target_number": TARGET}),
+    ("unblockIncomingNumber", "unblockIncomingNumber", {"target_number": TARGET}),
+    ("getBillDetails", "getBillDetails", {"period": "son"}),
+]
+
+
+def _run_mode(mode: str, d: str, ids: List[str], storage: str, chunk_size: int, compact_every: int) -> Dict[str, Any]:
+    from agentkit.storage import open_backend
+    from agentkit.tools import api_functions as api
+    from agentkit.tools.batch import batch_function_map
+
+    api.USER_DB, api.PACKAGE_DB = os.path.join(d, "user.json"), os.path.join(d, "packages.json")
+    api.STORAGE, api.SQLITE_DB = storage, os.path.join(d, "agentkit.db")
+    api.USER_JOURNAL, api.JOURNAL_COMPACT_EVERY = "", compact_every
+    api.getUserInfo(ids[0])  # yükleme ölçüme girmesin
+    timings, oks = {}, {}
+    store = getattr(api._backend(), "store", None)
+    for label, tool, kwargs in OPS:
+        if hasattr(store, "wait_compaction"):
+            store.wait_compaction()  # önceki işlemin arka plan sıkıştırması ölçüme girmesin
+        gc.collect()
+        t0 = time.perf_counter()
+        if mode == "batch":
+            res = batch_function_map[tool](ids, chunk_size=chunk_size, **kwargs)
+            ok = res["succeeded"]
+        else:
+            fn = getattr(api, tool)
+            ok = sum(bool(fn(i, **kwargs).get("success")) for i in ids)
+        timings[label] = time.perf_counter() - t0
+        oks[label] = ok
+    backend = open_backend(storage, api.USER_DB, api.PACKAGE_DB, journal_path=api.USER_DB + ".journal",
+                           sqlite_db=api.SQLITE_DB)
+    state = {i: backend.find(i) for i in ids}
+    backend.close()
+    return {"timings": timings, "ok": oks, "state": state}
+
+
+def run(customers: int = 100000, items: int = 5000, storage: str = "json", chunk_size: int = 1000, seed: int = 0,
+        compact_every: int = 500, workdir: Optional[str] = None) -> Dict[str, Any]:
+    rnd = random.Random(seed)
+    ids = [f"user_{i:07d}" for i in rnd.sample(range(customers), min(items, customers))]
+    out = {}
+    for mode in ("single", "batch"):
+        with tempfile.TemporaryDirectory(prefix="agentkit-batch-", dir=workdir) as d:
+            write_dataset(d, customers, seed)
+            out[mode] = _run_mode(mode, d, ids, storage, chunk_size, compact_every)
+    same = json.dumps(out["single"].pop("state"), sort_keys=True) == json.dumps(out["batch"].pop("state"), sort_keys=True)
+    return {"customers": customers, "items": len(ids), "storage": storage, "chunk_size": chunk_size,
+            "compact_every": compact_every, "same_final_state": same, **out}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Toplu araç çağrısı benchmark'ı")
+    ap.add_argument("--customers", type=int, default=100000)
+    ap.add_argument("--items", type=int, default=5000, help="İşlem uygulanacak müşteri sayısı")
+    ap.add_argument("--storage", choices=["json", "sqlite"], default="json")
+    ap.add_argument("--chunk-size", type=int, default=1000)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--compact-every", type=int, default=500, help="json günlüğü sıkıştırma eşiği")
+    ap.add_argument("--workdir", default=None)
+    ap.add_argument("--out", default=None, help="Sonuçları JSON olarak kaydet")
+    args = ap.parse_args(argv)
+
+    r = run(args.customers, args.items, args.storage, args.chunk_size, args.seed, args.compact_every, args.workdir)
+    print(f"{r['customers']} müşteri, {r['items']} kayıt, {r['storage']}, parça {r['chunk_size']}, "
+          f"sıkıştırma eşiği {r['compact_every']}")
+    print(f"{'op':<24} {'single_s':>9} {'batch_s':>9} {'single/s':>9} {'batch/s':>9} {'speedup':>8} {'ok':>11}")
+    for label, _, _ in OPS:
+        s, b = r["single"]["timings"][label], r["batch"]["timings"][label]
+        print(f"{label:<24} {s:>9.3f} {b:>9.3f} {r['items'] / s:>9.0f} {r['items'] / b:>9.0f} {s / b:>7.1f}x "
+              f"{r['single']['ok'][label]:>5}/{r['batch']['ok'][label]:<5}")
+    print(f"son durum aynı: {r['same_final_state']}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(r, f, indent=2, ensure_ascii=False)
+    return 0 if r["same_final_state"] else 1
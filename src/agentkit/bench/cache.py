@@ -0,0 +1,93 @@
+# src/agentkit/bench/cache.py
+"""Salt okunur araç önbelleğinin (`tools/cache.py`) konuşma başına kazancı."""
+from __future__ import annotations
+
+import os
+import time
+import random
+import argparse
+import tempfile
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from agentkit.bench.datagen import write_dataset
+
+# (araç, argümanlar); kimlik her oturumda müşterinin T.C./ID/telefonundan biri.
+FLOW = [
+    ("getUserInfo", {}),
+    ("getBillDetails", {"period": "son"}),
+    ("getUserInfo", {}),
+    ("getAvailablePackages", {}),
+    ("getUserInfo", {}),
+    ("initiatePackageChange", {"new_package_name": "Süper Paket"}),
+    ("getUserInfo", {}),
+    ("getBillDetails", {"period": "son"}),
+    ("getUsageHistory", {}),
+    ("getUserInfo", {}),
+    ("getSupportTicketStatus", {}),
+    ("getBillDetails", {"period": "son"}),
+]
+
+
+def _run_mode(enabled: bool, d: str, customers: int, sessions: int, storage: str, lazy: bool,
+              seed: int) -> Dict[str, Any]:
+    from agentkit.tools import api_functions as api
+    from agentkit.tools import cache
+
+    api.USER_DB, api.PACKAGE_DB = os.path.join(d, "user.json"), os.path.join(d, "packages.json")
+    api.STORAGE, api.SQLITE_DB, api.LAZY_LOAD = storage, os.path.join(d, "agentkit.db"), lazy
+    cache.TOOL_CACHE = enabled
+    api.getUserInfo("user_0000000")  # yükleme ölçüme girmesin
+    c = cache.cache_for(api._backend())
+    c.clear()
+    c.reset_stats()
+    rnd = random.Random(seed)
+    times: Dict[str, List[float]] = defaultdict(list)
+    t0 = time.perf_counter()
+    for _ in range(sessions):
+        u = api._backend().find(f"user_{rnd.randrange(customers):07d}")
+        ident = rnd.choice([u["customer_id"], u["tc_no"], u["phone_number"]])
+        for name, kwargs in FLOW:
+            t = time.perf_counter()
+            getattr(api, name)(ident, **kwargs)
+            times[name].append(time.perf_counter() - t)
+    wall = time.perf_counter() - t0
+    stats = c.stats()
+    cache.TOOL_CACHE = None
+    return {"enabled": enabled, "wall_s": wall, "calls": sessions * len(FLOW),
+            "mean_us": {k: 1e6 * sum(v) / len(v) for k, v in times.items()}, "stats": stats}
+
+
+def run(customers: int = 100000, sessions: int = 2000, storage: str = "json", lazy: bool = False, seed: int = 0,
+        workdir: Optional[str] = None) -> Dict[str, Any]:
+    out = {}
+    for enabled in (False, True):
+        with tempfile.TemporaryDirectory(prefix="agentkit-cache-", dir=workdir) as d:
+            write_dataset(d, customers, seed)
+            out["on" if enabled else "off"] = _run_mode(enabled, d, customers, sessions, storage, lazy, seed)
+    return {"customers": customers, "sessions": sessions, "storage": storage + (" (lazy)" if lazy else ""), **out}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Araç sonuç önbelleği benchmark'ı")
+    ap.add_argument("--customers", type=int, default=100000)
+    ap.add_argument("--sessions", type=int, default=2000)
+    ap.add_argument("--storage", choices=["json", "sqlite"], default="json")
+    ap.add_argument("--lazy", action="store_true", help="json arka ucunu AGENTKIT_LAZY_LOAD ile çalıştır")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workdir", default=None)
+    args = ap.parse_args(argv)
+
+    r = run(args.customers, args.sessions, args.storage, args.lazy, args.seed, args.workdir)
+    off, on = r["off"], r["on"]
+    print(f"{r['customers']} müşteri, {r['sessions']} oturum x {len(FLOW)} çağrı, {r['storage']}")
+    print(f"{'tool':<24} {'off_us':>8} {'on_us':>8} {'speedup':>8} {'hit_rate':>9}")
+    for name in dict.fromkeys(n for n, _ in FLOW):
+        t = on["stats"]["tools"].get(name, {"hits": 0, "misses": 0})
+        total = t["hits"] + t["misses"]
+        rate = f"{t['hits'] / total:>9.2f}" if total else f"{'-':>9}"
+        a, b = off["mean_us"][name], on["mean_us"][name]
+        print(f"{name:<24} {a:>8.1f} {b:>8.1f} {a / b:>7.1f}x {rate}")
+    print(f"toplam: {off['wall_s']:.2f}s → {on['wall_s']:.2f}s ({off['wall_s'] / on['wall_s']:.1f}x), "
+          f"isabet oranı {on['stats']['hit_rate']:.2f}, geçersiz kılma {on['stats']['invalidations']}")
+    return 0
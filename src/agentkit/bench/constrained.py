@@ -0,0 +1,204 @@
+# src/agentkit/bench/constrained.py
+"""Kısıtlı JSON çözümlemenin (`GEN_CONSTRAINED_JSON`) ayrıştırma hatalarına ve ileri geçiş sayısına etkisi."""
+from __future__ import annotations
+
+import json
+import re
+import time
+import argparse
+from typing import Any, Dict, List, Optional
+
+import torch
+
+from agentkit.bench.stopping import _steps
+
+NOISE = ("prose", "tool_name", "quote")
+ALIASES = {
+    "tc_no": "user_identifier", "number": "target_number", "contact_name": "name", "contact_phone": "phone",
+    "new_package": "new_package_name", "issue": "issue_description", "date": "preferred_date",
+    "time": "preferred_time", "from_operator": "current_operator", "service": "service_type",
+}
+_BLANK = {"integer": 0, "number": 0, "boolean": False}
+
+
+def _conform(obj: Dict[str, Any], schemas: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Altın argümanları şemaya uydurur: eski adlar çevrilir, fazlalar atılır, eksik zorunlular boş değer alır."""
+    schema = schemas.get(obj.get("action"))
+    if schema is None or not isinstance(obj.get("action_input"), dict):
+        return obj
+    props = schema.get("properties") or {}
+    args = {ALIASES.get(k, k): v for k, v in obj["action_input"].items()}
+    args = {k: v for k, v in args.items() if k in props}
+    for k in schema.get("required") or ():
+        args.setdefault(k, _BLANK.get(props[k].get("type"), ""))
+    return {**obj, "action_input": args}
+
+
+def _noisy(obj: Dict[str, Any], kind: str) -> str:
+    text = json.dumps(obj, ensure_ascii=False)
+    if kind == "prose":
+        return "Tabii, işte yanıtım:\n" + text
+    if kind == "tool_name" and obj.get("action") != "Final Answer":
+        wrong = re.sub(r"(?<!^)([A-Z])", r"_\1", obj["action"]).lower()
+        return text.replace(f'"action": "{obj["action"]}"', f'"action": "{wrong}"', 1)
+    if kind in ("quote", "tool_name"):
+        return text.replace('"thought": "', '"thought": "Kullanıcı "acil" dedi. ', 1)
+    return text
+
+
+class _Replay:
+    """Üretilen metni senaryo metnine hizalar ve sıradaki token'ı önerir."""
+
+    def __init__(self, tokenizer, script: str, prompt_len: int):
+        self.tok = tokenizer
+        self.script = script
+        self.prompt_len = prompt_len
+        self.pos = 0
+
+    def want(self, ids: List[int]) -> Optional[int]:
+        text = self.tok.decode(ids[self.prompt_len:], skip_special_tokens=True)
+        if self.script.startswith(text):
+            self.pos = len(text)
+        else:
+            # Dilbilgisi başka bir metin zorladıysa: son birkaç karakterin senaryodaki yerinden devam.
+            for n in range(min(16, len(text)), 2, -1):
+                i = self.script.find(text[-n:], max(0, self.pos - n))
+                if i >= 0:
+                    self.pos = i + n
+                    break
+        rest = self.script[self.pos:]
+        if not rest:
+            return self.tok.eos_token_id
+        ids = self.tok(rest, add_special_tokens=False)["input_ids"]
+        return ids[0] if ids else None
+
+
+class _Forcing:
+    """`generate` için: yalnızca senaryonun sıradaki token'ı."""
+
+    def __init__(self, replay: _Replay):
+        self.replay = replay
+        self.calls = 0
+
+    def __call__(self, input_ids, scores):
+        self.calls += 1
+        want = self.replay.want(input_ids[0].tolist())
+        if want is None:
+            return scores
+        out = torch.full_like(scores, float("-inf"))
+        out[:, want] = 0
+        return out
+
+
+class _Biased:
+    """Kısıtlı döngü için model vekili: senaryonun token'ına büyük pay ekler, ileri geçişleri sayar."""
+
+    def __init__(self, model, replay: _Replay, prompt: List[int]):
+        self.model = model
+        self.replay = replay
+        self.seen = list(prompt)
+        self.calls = 0
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+    def __call__(self, input_ids, **kwargs):
+        self.calls += 1
+        out = self.model(input_ids=input_ids, **kwargs)
+        self.seen += input_ids[0].tolist()
+        want = self.replay.want(self.seen)
+        if want is not None:
+            out.logits[0, -1, want] += 1e4
+        return out
+
+
+def _check(text: str, names: set) -> Dict[str, Any]:
+    from langchain.agents.output_parsers import JSONAgentOutputParser
+    from langchain_core.agents import AgentAction
+    from langchain_core.exceptions import OutputParserException
+
+    try:
+        res = JSONAgentOutputParser().parse(text)
+    except OutputParserException:
+        return {"failure": True, "action": None}
+    action = res.tool if isinstance(res, AgentAction) else "Final Answer"
+    return {"failure": action not in names, "action": action}
+
+
+def run(model: str = "sshleifer/tiny-gpt2", steps: int = 40, max_new_tokens: int = 512,
+        scenario: str = "scenario/scenarioForKPI.json") -> Dict[str, Any]:
+    from transformers import AutoModelForCausalLM, AutoTokenizer, LogitsProcessorList
+
+    from agentkit.grammar import ActionGrammar
+    from agentkit.pipeline import CustomTextGenerationPipeline
+    from agentkit.usage import usage
+    from agentkit.tools import registry
+    from agentkit.tools.schemas import function_schemas
+
+    tok = AutoTokenizer.from_pretrained(model)
+    mdl = AutoModelForCausalLM.from_pretrained(model).eval()
+    names = {t.name for t in registry.get_tools()}
+    grammar = ActionGrammar.from_tools(sorted(names))
+    names.add("Final Answer")
+    schemas = {f["name"]: f.get("parameters") or {} for f in function_schemas}
+    items = _steps(scenario, steps)
+    for i, item in enumerate(items):
+        item["object"] = _conform(item["object"], schemas)
+        item["kind"] = "clean" if i % 2 == 0 else NOISE[(i // 2) % len(NOISE)]
+        item["script"] = _noisy(item["object"], item["kind"])
+    rows = []
+    for mode in ("free", "grammar"):
+        pipe = CustomTextGenerationPipeline(mdl, tok, max_new_tokens=max_new_tokens, device="cpu", batch_size=1,
+                                            prefix_cache_mb=0, grammar=grammar if mode == "grammar" else None)
+        before = usage()["generated_tokens"]
+        forwards = 0
+        stats = {k: [0, 0] for k in ("clean",) + NOISE}  # [adım, hata]
+        matches = 0
+        t0 = time.perf_counter()
+        for item in items:
+            prompt_ids = tok(item["prompt"])["input_ids"]
+            replay = _Replay(tok, item["script"], len(prompt_ids))
+            if mode == "free":
+                proc = _Forcing(replay)
+                out = pipe(item["prompt"], logits_processor=LogitsProcessorList([proc]))[0]["generated_text"]
+                forwards += proc.calls
+            else:
+                pipe.model = _Biased(mdl, replay, prompt_ids)
+                out = pipe(item["prompt"])[0]["generated_text"]
+                forwards += pipe.model.calls
+            res = _check(out, names)
+            stats[item["kind"]][0] += 1
+            stats[item["kind"]][1] += res["failure"]
+            matches += res["action"] == item["object"].get("action")
+        wall = time.perf_counter() - t0
+        rows.append({
+            "mode": mode,
+            "tokens_per_step": (usage()["generated_tokens"] - before) / len(items),
+            "forwards_per_step": forwards / len(items),
+            "ms_per_step": 1000 * wall / len(items),
+            "parse_failure_rate": sum(f for _, f in stats.values()) / len(items),
+            "by_kind": {k: (f / n if n else None) for k, (n, f) in stats.items()},
+            "action_match": matches / len(items),
+        })
+    return {"model": model, "steps": len(items), "rows": rows}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Kısıtlı JSON çözümleme: ayrıştırma hatası ve adım başına token")
+    ap.add_argument("--model", default="sshleifer/tiny-gpt2")
+    ap.add_argument("--steps", type=int, default=40)
+    ap.add_argument("--max-new-tokens", type=int, default=512)
+    ap.add_argument("--scenario", default="scenario/scenarioForKPI.json")
+    args = ap.parse_args(argv)
+
+    r = run(args.model, args.steps, args.max_new_tokens, args.scenario)
+    print(f"{r['model']}: {r['steps']} altın asistan adımı (yarısı bozuk), CPU")
+    kinds = ("clean",) + NOISE
+    print(f"{'mode':<8} {'tok/step':>9} {'fwd/step':>9} {'ms/step':>8} {'fail':>6} "
+          + " ".join(f"{k:>9}" for k in kinds) + f" {'action':>7}")
+    for row in r["rows"]:
+        by_kind = " ".join(f"{row['by_kind'][k]:>9.2f}" if row["by_kind"][k] is not None else f"{'-':>9}"
+                           for k in kinds)
+        print(f"{row['mode']:<8} {row['tokens_per_step']:>9.1f} {row['forwards_per_step']:>9.1f} "
+              f"{row['ms_per_step']:>8.1f} {row['parse_failure_rate']:>6.2f} {by_kind} {row['action_match']:>7.2f}")
+    return 0
@@ -0,0 +1,137 @@
+# src/agentkit/bench/cpu_engine.py
+"""CPU yükleme motorlarının (`CPU_ENGINE`: fp32, bf16, int8) üretim hızı ve bellek kullanımı."""
+from __future__ import annotations
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+from typing import Any, Dict, List, Optional
+
+from agentkit.bench.generation import _prompts
+from agentkit.models.cpu import ENGINES
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def _weights_mb(model) -> float:
+    # Nicelenmiş Linear ağırlıkları parametre değil, paketlenmiş tensör: state_dict boyutu ikisini de sayar.
+    import io
+    import torch
+
+    buf = io.BytesIO()
+    torch.save(model.state_dict(), buf)
+    return buf.tell() / 2**20
+
+
+def _peak_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: KB
+
+
+def _child(model: str, engine: str, prompts: int, max_new_tokens: int, threads: int, scenario: str) -> Dict[str, Any]:
+    import torch
+
+    from agentkit.models.cpu import load_cpu
+    from agentkit.pipeline import CustomTextGenerationPipeline
+
+    if threads:
+        torch.set_num_threads(threads)
+    t0 = time.perf_counter()
+    mdl, tok = load_cpu(model, engine)
+    load_s = time.perf_counter() - t0
+    loaded = _rss_mb()
+    mdl.generation_config.min_new_tokens = max_new_tokens
+    pipe = CustomTextGenerationPipeline(mdl, tok, max_new_tokens=max_new_tokens, device="cpu", batch_size=1,
+                                        stop_on_json=False, prefix_cache_mb=0)
+    texts = _prompts(scenario, prompts)
+    pipe(texts[0])  # ısınma
+    prefill, ids = [], []
+    t0 = time.perf_counter()
+    for text in texts:
+        # Prefill: tek token'lık üretim süresi.
+        pipe.max_new_tokens = 1
+        t1 = time.perf_counter()
+        pipe(text)
+        prefill.append(time.perf_counter() - t1)
+    prefill_wall = time.perf_counter() - t0
+    pipe.max_new_tokens = max_new_tokens
+    t0 = time.perf_counter()
+    for text in texts:
+        ids.append(tok(pipe(text)[0]["generated_text"], add_special_tokens=False)["input_ids"])
+    wall = time.perf_counter() - t0
+    return {
+        "engine": engine,
+        "threads": torch.get_num_threads(),
+        "load_s": load_s,
+        "tokens_per_s": len(texts) * max_new_tokens / wall,
+        "decode_tokens_per_s": len(texts) * (max_new_tokens - 1) / max(wall - prefill_wall, 1e-9),
+        "prefill_ms": 1000 * sum(prefill) / len(prefill),
+        "weights_mb": _weights_mb(mdl),
+        "rss_mb": loaded,
+        "peak_rss_mb": _peak_mb(),
+        "ids": ids,
+    }
+
+
+def run(model: str = "sshleifer/tiny-gpt2", engines: Optional[List[str]] = None, prompts: int = 16,
+        max_new_tokens: int = 32, threads: int = 0, scenario: str = "scenario/scenarioForKPI.json") -> Dict[str, Any]:
+    rows = []
+    for engine in engines or list(ENGINES):
+        cmd = [sys.executable, "-m", "agentkit.bench.cpu_engine", "--child", engine, "--model", model,
+               "--prompts", str(prompts), "--max-new-tokens", str(max_new_tokens), "--threads", str(threads),
+               "--scenario", scenario]
+        env = {**os.environ, "PYTHONPATH": SRC, "CUDA_VISIBLE_DEVICES": ""}
+        proc = subprocess.run(cmd, capture_output=True, text=True, env=env)
+        if proc.returncode != 0:
+            rows.append({"engine": engine, "error": (proc.stderr.strip().splitlines() or ["?"])[-1]})
+            continue
+        rows.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    ref = next((r["ids"] for r in rows if r.get("engine") == "fp32" and "ids" in r), None)
+    for row in rows:
+        if ref is not None and "ids" in row:
+            same = sum(a == b for x, y in zip(row["ids"], ref) for a, b in zip(x, y))
+            row["match"] = same / max(sum(len(y) for y in ref), 1)
+        row.pop("ids", None)
+    return {"model": model, "prompts": prompts, "max_new_tokens": max_new_tokens, "rows": rows}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="CPU motorları: token/s ve RSS")
+    ap.add_argument("--model", default="sshleifer/tiny-gpt2")
+    ap.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    ap.add_argument("--prompts", type=int, default=16)
+    ap.add_argument("--max-new-tokens", type=int, default=32)
+    ap.add_argument("--threads", type=int, default=0, help="torch intra-op iş parçacığı (0: varsayılan)")
+    ap.add_argument("--scenario", default="scenario/scenarioForKPI.json")
+    ap.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_child(args.model, args.child, args.prompts, args.max_new_tokens, args.threads,
+                                args.scenario)))
+        return 0
+    r = run(args.model, args.engines, args.prompts, args.max_new_tokens, args.threads, args.scenario)
+    print(f"{r['model']}: {r['prompts']} istem x {r['max_new_tokens']} yeni token, açgözlü (CPU)")
+    print(f"{'engine':<6} {'thr':>3} {'load_s':>7} {'tok/s':>7} {'dec tok/s':>9} {'prefill_ms':>10} "
+          f"{'weights_mb':>10} {'rss_mb':>7} {'peak_mb':>8} {'match':>6}")
+    for row in r["rows"]:
+        if "error" in row:
+            print(f"{row['engine']:<6} hata: {row['error']}")
+            continue
+        match = f"{row['match']:>6.2f}" if "match" in row else f"{'-':>6}"
+        print(f"{row['engine']:<6} {row['threads']:>3} {row['load_s']:>7.2f} {row['tokens_per_s']:>7.1f} "
+              f"{row['decode_tokens_per_s']:>9.1f} {row['prefill_ms']:>10.1f} {row['weights_mb']:>10.1f} "
+              f"{row['rss_mb']:>7.0f} {row['peak_rss_mb']:>8.0f} {match}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
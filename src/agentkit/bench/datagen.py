@@ -0,0 +1,200 @@
+# src/agentkit/bench/datagen.py
+"""Deterministik sentetik müşteri / paket verisi üreticisi (data/user.json şeması, akış halinde yazılır)."""
+from __future__ import annotations
+
+import os
+import json
+import random
+import argparse
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+PACKAGE_DB = os.path.join(ROOT, "data", "packages.json")
+
+NAMES = ["Barış", "Zeynep", "Mehmet", "Ayşe", "Ahmet", "Elif", "Mustafa", "Fatma", "Emre", "Selin",
+         "Can", "Derya", "Murat", "Büşra", "Onur", "Gül", "Hakan", "Merve", "Kerem", "İrem"]
+SURNAMES = ["Koç", "Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Aydın", "Öztürk", "Arslan",
+            "Doğan", "Kılıç", "Aslan", "Çetin", "Kara", "Güneş", "Polat", "Erdoğan", "Özdemir", "Aksoy"]
+CITIES = [("İstanbul", "34"), ("Ankara", "06"), ("İzmir", "35"), ("Bursa", "16"), ("Eskişehir", "26"),
+          ("Antalya", "07"), ("Konya", "42"), ("Adana", "01"), ("Trabzon", "61"), ("Kayseri", "38")]
+STREETS = ["Atatürk Cad.", "Cumhuriyet Cad.", "Altın Sokak", "Yıldız Mah. 12. Sokak", "Mevlana Mah. 45. Sokak",
+           "Sanayi Sitesi 5. Blok", "Gül Sokak", "İnönü Bulvarı", "Fatih Mah. 3. Sokak", "Bahçelievler 7. Cadde"]
+ISSUES = ["wifi çekmiyor", "internet yavaş", "modem ışığı yanmıyor", "hat sesi yok", "fiber bağlantı kopuyor"]
+OCCUPATIONS = [("genel", 40), ("öğrenci", 15), ("esnaf", 12), ("yaslı", 12), ("ev interneti", 13), ("cocuk", 8)]
+# Katalogdaki grup adları ile müşteri meslek yazımları farklı olabilir (ör. "öğrenci" / "ogrenci").
+_GROUP_ALIASES = {"öğrenci": "ogrenci"}
+_MONTHS = ["Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran", "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık"]
+_LAST_BILL = date(2025, 6, 20)
+
+
+def load_catalog(path: str = PACKAGE_DB) -> List[dict]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def make_packages(extra: int = 0, seed: int = 0, base: Optional[List[dict]] = None) -> List[dict]:
+    """data/packages.json + her gruba dağıtılmış `extra` sentetik paket."""
+    pkgs = list(base if base is not None else load_catalog())
+    rnd = random.Random(seed)
+    groups = sorted({g for p in pkgs for g in p.get("allowed_groups", ["genel"])})
+    for k in range(extra):
+        gb = rnd.choice([5, 10, 15, 20, 30, 40, 60, 100])
+        price = 150 + gb * rnd.randint(4, 9)
+        pkgs.append({
+            "id": f"PKG_SYN_{k:05d}",
+            "name": f"Sentetik {gb} GB #{k}",
+            "category": "Mobil",
+            "price": f"{price} TL/AY",
+            "details": f"{rnd.choice([500, 1000, 2000])} DK Her Yöne, {gb}GB internet, 12 ay sabit fiyat",
+            "activation_fee": "0 TL",
+            "contract_duration_months": 12,
+            "data_limit_gb": gb,
+            "voice_limit_minutes": 1000,
+            "sms_limit": None,
+            "allowed_groups": [groups[k % len(groups)]],
+        })
+    return pkgs
+
+
+def _packages_by_group(pkgs: List[dict]) -> Dict[str, List[str]]:
+    out: Dict[str, List[str]] = {}
+    for p in pkgs:
+        for g in p.get("allowed_groups", ["genel"]):
+            out.setdefault(g, []).append(p.get("name", ""))
+    return out
+
+
+def _phone(rnd: random.Random) -> str:
+    return f"05{rnd.randint(0, 999999999):09d}"
+
+
+def make_user(i: int, seed: int = 0, by_group: Optional[Dict[str, List[str]]] = None) -> dict:
+    """`i`. müşteriyi üretir; sonuç yalnızca (i, seed) ve kataloga bağlıdır."""
+    by_group = by_group if by_group is not None else _packages_by_group(load_catalog())
+    rnd = random.Random(seed * 1_000_003 + i)
+    name, surname = rnd.choice(NAMES), rnd.choice(SURNAMES)
+    occupation = rnd.choices([o for o, _ in OCCUPATIONS], weights=[w for _, w in OCCUPATIONS])[0]
+    group_pkgs = by_group.get(_GROUP_ALIASES.get(occupation, occupation)) or by_group.get("genel") or [""]
+    package = rnd.choice(group_pkgs)
+    city, plate = rnd.choice(CITIES)
+
+    bills = []
+    n_bills = rnd.randint(0, 12)
+    for k in range(n_bills):
+        d = _LAST_BILL - timedelta(days=30 * k)
+        base = float(rnd.randrange(150, 900, 10))
+        extra = float(rnd.choice([0, 0, 0, 10, 20, 45]))
+        taxes = round(base * 0.08, 1)
+        latest = k == 0
+        status = rnd.choice(["Beklemede", "Beklemede", "Gecikmiş", "Ödendi"]) if latest else rnd.choice(["Ödendi", "Odendi"])
+        bills.append({
+            "bill_id": f"B{i:07d}-{k:02d}",
+            "bill_date": d.isoformat(),
+            "amount": round(base + extra + taxes, 1),
+            "due_date": (d + timedelta(days=20)).isoformat(),
+            "status": status,
+            "details": f"{_MONTHS[d.month - 1]} ayı {package.strip()} faturası",
+            "breakdown": {"base": base, "extra_usage": extra, "taxes": taxes},
+        })
+    payment_status = {"Ödendi": "Odendi"}.get(bills[0]["status"], bills[0]["status"]) if bills else "Odendi"
+
+    appointments = []
+    for k in range(rnd.choices([0, 1, 2, 3], weights=[70, 20, 7, 3])[0]):
+        d = date(2025, 7, 1) + timedelta(days=rnd.randint(0, 60))
+        appointments.append({
+            "appointment_id": f"APPT-{i:07d}-{k}",
+            "issue": rnd.choice(ISSUES),
+            "date": d.isoformat(),
+            "time": f"{rnd.randint(9, 16):02d}:00",
+            "status": "Planlandı",
+            "created_at": f"{(d - timedelta(days=rnd.randint(1, 14))).isoformat()} {rnd.randint(8, 20):02d}:{rnd.choice(['00', '15', '30', '45'])}",
+            "active": True,
+        })
+
+    gb = rnd.randint(1, 120)
+    minutes = rnd.randint(50, 3000)
+    return {
+        "customer_id": f"user_{i:07d}",
+        "name": name,
+        "surname": surname,
+        "tc_no": f"{10000000000 + i}",
+        "phone_number": f"05{i:09d}",
+        "current_package": package,
+        "contract_end_date": (date(2025, 1, 1) + timedelta(days=rnd.randint(0, 900))).isoformat(),
+        "payment_status": payment_status,
+        "service_status": rnd.choices(["Aktif", "Askıya Alındı"], weights=[92, 8])[0],
+        "age": 10 if occupation == "cocuk" else rnd.randint(66, 90) if occupation == "yaslı" else rnd.randint(18, 65),
+        "blocked_numbers": [_phone(rnd) for _ in range(rnd.choices([0, 1, 2, 3], weights=[60, 25, 10, 5])[0])],
+        "occupation": occupation,
+        "status": rnd.choices(["aktif", "pasif"], weights=[95, 5])[0],
+        "has_fiber_infrastructure": rnd.random() < 0.6,
+        "roaming_restricted": rnd.random() < 0.3,
+        "internet_profile": "child" if occupation == "cocuk" else "normal",
+        "address": {"street": f"{rnd.choice(STREETS)} No: {rnd.randint(1, 120)}", "city": city,
+                    "zip_code": f"{plate}{rnd.randint(0, 9)}00"},
+        "appointments": appointments,
+        "authorized_contacts": [{"name": f"{rnd.choice(NAMES)} {surname}", "phone": _phone(rnd)}
+                                for _ in range(rnd.randint(0, 2))],
+        "usage_history": {
+            "internet_gb_used_monthly": gb,
+            "internet_avg_speed_mbps": rnd.choice([20, 35, 50, 70, 100]),
+            "call_minutes_monthly": minutes,
+            "sms_count_monthly": rnd.randint(0, 300),
+            "is_data_heavy_user": gb >= 20,
+            "is_call_heavy_user": minutes >= 1000,
+        },
+        "bills": bills,
+        "child_mode_enabled": occupation == "cocuk" and rnd.random() < 0.7,
+        "network_mode": rnd.choice(["3G", "4G", "4G", "5G"]),
+        "esim_active": rnd.random() < 0.4,
+    }
+
+
+def iter_users(n: int, seed: int = 0, packages: Optional[List[dict]] = None) -> Iterator[dict]:
+    by_group = _packages_by_group(packages if packages is not None else load_catalog())
+    for i in range(n):
+        yield make_user(i, seed, by_group)
+
+
+def make_users(n: int, seed: int = 0, packages: Optional[List[dict]] = None) -> List[dict]:
+    return list(iter_users(n, seed, packages))
+
+
+def write_users(path: str, n: int, seed: int = 0, packages: Optional[List[dict]] = None) -> int:
+    """`n` müşteriyi belleğe almadan user.json biçiminde yazar; dosya boyutunu döner."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for i, u in enumerate(iter_users(n, seed, packages)):
+            if i:
+                f.write(",\n")
+            f.write(json.dumps(u, ensure_ascii=False))
+        f.write("\n]\n")
+    return os.path.getsize(path)
+
+
+def write_dataset(out_dir: str, customers: int, seed: int = 0, extra_packages: int = 0) -> Dict[str, str]:
+    """out_dir altına user.json ve packages.json yazar."""
+    os.makedirs(out_dir, exist_ok=True)
+    pkgs = make_packages(extra_packages, seed)
+    package_db = os.path.join(out_dir, "packages.json")
+    with open(package_db, "w", encoding="utf-8") as f:
+        json.dump(pkgs, f, ensure_ascii=False, indent=2)
+    user_db = os.path.join(out_dir, "user.json")
+    write_users(user_db, customers, seed, pkgs)
+    return {"user_db": user_db, "package_db": package_db}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Sentetik müşteri/paket verisi üretici")
+    ap.add_argument("--customers", type=int, default=10000)
+    ap.add_argument("--packages", type=int, default=0, help="Kataloga eklenecek sentetik paket sayısı")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out-dir", required=True)
+    args = ap.parse_args(argv)
+
+    paths = write_dataset(args.out_dir, args.customers, args.seed, args.packages)
+    size = os.path.getsize(paths["user_db"])
+    print(f"{args.customers} müşteri → {paths['user_db']} ({size / 2 ** 20:.1f} MB), paketler → {paths['package_db']}")
+    return 0
@@ -0,0 +1,111 @@
+# src/agentkit/bench/generation.py
+"""Toplu üretimin (`CustomTextGenerationPipeline`) batch boyutuna ve `submit` eşzamanlılığına göre verimi."""
+from __future__ import annotations
+
+import json
+import time
+import argparse
+import threading
+from typing import Any, Dict, List, Optional
+
+PREAMBLE = "Sen bir XYZ operatör firması asistanısın. Yanıtını JSON olarak ver.\nKullanıcı: "
+
+
+def _prompts(path: str, n: int) -> List[str]:
+    with open(path, encoding="utf-8-sig") as f:
+        data = json.load(f)
+    msgs = [step.get("content", "") for scn in (data if isinstance(data, list) else [data])
+            for step in scn.get("conversations", []) if step.get("role") == "user"]
+    return [PREAMBLE + msgs[i % len(msgs)] for i in range(n)]
+
+
+def _load(model: str, max_new_tokens: int, batch_size: int):
+    import torch
+    from transformers import AutoModelForCausalLM, AutoTokenizer
+    from agentkit.pipeline import CustomTextGenerationPipeline
+
+    torch.manual_seed(0)
+    tok = AutoTokenizer.from_pretrained(model)
+    mdl = AutoModelForCausalLM.from_pretrained(model).eval()
+    # Rastgele modelin çıktısında `{...}` görülünce erken durmasın: tüm satırlar aynı uzunlukta.
+    # Önek önbelleği kapalı: tekrar üretilen istemler önceki çalıştırmadan faydalanmasın.
+    return CustomTextGenerationPipeline(mdl, tok, max_new_tokens=max_new_tokens, device="cpu", batch_size=batch_size,
+                                        stop_on_json=False, prefix_cache_mb=0)
+
+
+def run(model: str = "sshleifer/tiny-gpt2", batch_sizes: Optional[List[int]] = None, prompts: int = 64,
+        max_new_tokens: int = 32, threads: int = 0, scenario: str = "scenario/scenarioForKPI.json") -> Dict[str, Any]:
+    texts = _prompts(scenario, prompts)
+    pipe = _load(model, max_new_tokens, 1)
+    # Tüm satırlar aynı sayıda token üretsin (erken EOS verimi çarpıtmasın).
+    pipe.model.generation_config.min_new_tokens = max_new_tokens
+    pipe(texts[:2], batch_size=2)  # ısınma
+    reference: List[str] = []
+    rows = []
+    for bs in batch_sizes or [1, 2, 4, 8, 16]:
+        t0 = time.perf_counter()
+        outs = [o[0]["generated_text"] for o in pipe(texts, batch_size=bs)]
+        wall = time.perf_counter() - t0
+        reference = reference or outs
+        rows.append({
+            "mode": "batch",
+            "batch_size": bs,
+            "wall_s": wall,
+            "prompts_per_s": len(texts) / wall,
+            "tokens_per_s": len(texts) * max_new_tokens / wall,
+            "batch_latency_ms": 1000 * wall / -(-len(texts) // bs),
+            "match": sum(a == b for a, b in zip(outs, reference)) / len(texts),
+        })
+    if threads:
+        for bs in sorted({1, threads}):
+            pipe.batch_size = bs
+            results: List[Optional[str]] = [None] * len(texts)
+            it = iter(range(len(texts)))
+            lock = threading.Lock()
+
+            def worker() -> None:
+                while True:
+                    with lock:
+                        i = next(it, None)
+                    if i is None:
+                        return
+                    results[i] = pipe.submit(texts[i])
+
+            t0 = time.perf_counter()
+            pool = [threading.Thread(target=worker) for _ in range(threads)]
+            for t in pool:
+                t.start()
+            for t in pool:
+                t.join()
+            wall = time.perf_counter() - t0
+            rows.append({
+                "mode": f"{threads} threads",
+                "batch_size": bs,
+                "wall_s": wall,
+                "prompts_per_s": len(texts) / wall,
+                "tokens_per_s": len(texts) * max_new_tokens / wall,
+                "batch_latency_ms": None,
+                "match": sum(a == b for a, b in zip(results, reference)) / len(texts),
+            })
+    return {"model": model, "prompts": len(texts), "max_new_tokens": max_new_tokens, "rows": rows}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Toplu üretim verimi (batch boyutuna göre)")
+    ap.add_argument("--model", default="sshleifer/tiny-gpt2")
+    ap.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    ap.add_argument("--prompts", type=int, default=64)
+    ap.add_argument("--max-new-tokens", type=int, default=32)
+    ap.add_argument("--threads", type=int, default=0, help="submit() ile eşzamanlı tekil çağrı yapan iş parçacığı sayısı")
+    ap.add_argument("--scenario", default="scenario/scenarioForKPI.json")
+    args = ap.parse_args(argv)
+
+    r = run(args.model, args.batch_sizes, args.prompts, args.max_new_tokens, args.threads, args.scenario)
+    print(f"{r['model']}: {r['prompts']} istem x {r['max_new_tokens']} yeni token (CPU)")
+    print(f"{'mode':<12} {'batch':>5} {'wall_s':>8} {'prompt/s':>9} {'tok/s':>9} {'batch_ms':>9} {'speedup':>8} {'match':>6}")
+    base = r["rows"][0]["prompts_per_s"]
+    for row in r["rows"]:
+        lat = f"{row['batch_latency_ms']:>9.1f}" if row["batch_latency_ms"] is not None else f"{'-':>9}"
+        print(f"{row['mode']:<12} {row['batch_size']:>5} {row['wall_s']:>8.2f} {row['prompts_per_s']:>9.1f} "
+              f"{row['tokens_per_s']:>9.0f} {lat} {row['prompts_per_s'] / base:>7.1f}x {row['match']:>6.2f}")
+    return 0
@@ -0,0 +1,122 @@
+# src/agentkit/bench/importtime.py
+"""Açılış (import) süresi benchmark'ı (`python -X importtime`, her hedef ayrı süreçte)."""
+from __future__ import annotations
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+_REGISTRY_USE = ("from agentkit.tools import registry; ts = registry.tools; "
+                 "getattr(registry, 'render_tools', None) and registry.render_tools(ts)")
+
+# ad → (ifade, önbellek modu); None: önbellek kullanılmaz / ölçüme etkisi yok.
+TARGETS: Dict[str, tuple] = {
+    "api_functions": ("import agentkit.tools.api_functions", None),
+    "registry": ("import agentkit.tools.registry", None),
+    "registry_use_cold": (_REGISTRY_USE, "cold"),
+    "registry_use_warm": (_REGISTRY_USE, "warm"),
+    "agent.core": ("import agentkit.agent.core", "warm"),
+    "run_chat": ("from agentkit.chat.cli import main", "warm"),
+    "run_kpi": ("from agentkit.agent.core import build_agent; from agentkit.kpi.evaluator import KPIEvaluator", "warm"),
+}
+
+
+def _parse_importtime(stderr: str) -> Dict[str, int]:
+    # "import time:   self [us] | cumulative | imported package" → üst düzey paket başına öz süre (µs).
+    out: Dict[str, int] = defaultdict(int)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            out[parts[2].strip().split(".")[0]] += int(parts[0])
+        except ValueError:
+            continue
+    return dict(out)
+
+
+def _once(stmt: str, src: str, cache_dir: str) -> Dict[str, Any]:
+    code = f"import time; _t = time.perf_counter(); {stmt}; print(time.perf_counter() - _t)"
+    env = {**os.environ, "PYTHONPATH": src, "AGENTKIT_CACHE_DIR": cache_dir}
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True,
+                          env=env, cwd=ROOT)
+    if proc.returncode != 0:
+        errors = [l for l in proc.stderr.splitlines() if not l.startswith("import time:")]
+        return {"error": (errors or [f"exit {proc.returncode}"])[-1]}
+    return {"wall_ms": 1000 * float(proc.stdout.strip().splitlines()[-1]), "packages_us": _parse_importtime(proc.stderr)}
+
+
+def measure(stmt: str, src: str, cache: Optional[str], repeat: int) -> Dict[str, Any]:
+    """`repeat` süreç içindeki en hızlı çalıştırma."""
+    best: Optional[Dict[str, Any]] = None
+    with tempfile.TemporaryDirectory(prefix="agentkit-cache-") as warm_dir:
+        if cache == "warm":
+            _once(_REGISTRY_USE, src, warm_dir)
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory(prefix="agentkit-cache-") as cold_dir:
+                r = _once(stmt, src, warm_dir if cache == "warm" else cold_dir)
+            if "error" in r:
+                return r
+            if best is None or r["wall_ms"] < best["wall_ms"]:
+                best = r
+    return best or {"error": "repeat=0"}
+
+
+def _export(ref: str, dest: str) -> str:
+    """`ref` commit'indeki `src` ağacını `dest` altına çıkarır."""
+    archive = subprocess.run(["git", "archive", ref, "src"], cwd=ROOT, capture_output=True, check=True)
+    subprocess.run(["tar", "-x", "-C", dest], input=archive.stdout, check=True)
+    return os.path.join(dest, "src")
+
+
+def run(targets: Optional[List[str]] = None, repeat: int = 5, ref: Optional[str] = None) -> Dict[str, Any]:
+    names = targets or list(TARGETS)
+    trees = {"current": os.path.join(ROOT, "src")}
+    with tempfile.TemporaryDirectory(prefix="agentkit-ref-") as d:
+        if ref:
+            trees[ref] = _export(ref, d)
+        results = {tree: {n: measure(TARGETS[n][0], src, TARGETS[n][1], repeat) for n in names}
+                   for tree, src in trees.items()}
+    return {"repeat": repeat, "ref": ref, "results": results}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Açılış (import) süresi benchmark'ı")
+    ap.add_argument("--targets", nargs="+", choices=list(TARGETS), default=None)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--ref", default=None, help="karşılaştırılacak git commit'i (ör. HEAD~1)")
+    ap.add_argument("--top", type=int, default=5, help="hedef başına gösterilecek en pahalı paket sayısı")
+    ap.add_argument("--out", default=None)
+    args = ap.parse_args(argv)
+
+    report = run(args.targets, args.repeat, args.ref)
+    cur = report["results"]["current"]
+    base = report["results"].get(args.ref or "", {})
+    print(f"{'target':<20} {'wall_ms':>9}" + (f" {'ref_ms':>9} {'speedup':>8}" if base else "") + "  top packages (self ms)")
+    for name, r in cur.items():
+        b = base.get(name, {})
+        line = f"{name:<20} " + (f"{r['wall_ms']:>9.1f}" if "error" not in r else f"{'-':>9}")
+        if base:
+            line += f" {b['wall_ms']:>9.1f}" if "wall_ms" in b else f" {'-':>9}"
+            line += f" {b['wall_ms'] / r['wall_ms']:>7.1f}x" if "wall_ms" in b and "wall_ms" in r else f" {'-':>8}"
+        if "error" in r:
+            line += f"  HATA: {r['error']}"
+        else:
+            top = sorted(r["packages_us"].items(), key=lambda kv: -kv[1])[:args.top]
+            line += "  " + ", ".join(f"{p} {us / 1000:.0f}" for p, us in top)
+        if "error" in b:
+            line += f"  (ref HATA: {b['error']})"
+        print(line)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
@@ -0,0 +1,69 @@
+# src/agentkit/bench/journal.py
+"""Yazma maliyeti karşılaştırması: tüm user.json'u yeniden yazmak vs. günlüğe ekleme."""
+from __future__ import annotations
+
+import os
+import json
+import time
+import argparse
+import tempfile
+from typing import Dict, List
+
+from agentkit.bench.datagen import write_users
+from agentkit.storage.store import CustomerStore
+
+
+def _bench_one(n: int, writes: int, journal: bool, workdir: str) -> Dict[str, float]:
+    path = os.path.join(workdir, f"user_{n}_{'j' if journal else 'f'}.json")
+    write_users(path, n)
+    store = CustomerStore(path, journal_path=path + ".journal" if journal else None, compact_every=10 ** 9)
+    t0 = time.perf_counter()
+    store.users()
+    load_s = time.perf_counter() - t0
+
+    lat = []
+    for i in range(writes):
+        u = store.find(f"{10000000000 + (i * 7919) % n}")
+        u["esim_active"] = not u.get("esim_active")
+        t0 = time.perf_counter()
+        store.save([u])
+        lat.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    CustomerStore(path, journal_path=path + ".journal" if journal else None).users()
+    cold_s = time.perf_counter() - t0
+    lat.sort()
+    return {
+        "customers": n,
+        "mode": "journal" if journal else "full_rewrite",
+        "write_mean_ms": 1000 * sum(lat) / len(lat),
+        "write_p95_ms": 1000 * lat[int(0.95 * (len(lat) - 1))],
+        "initial_load_s": load_s,
+        "cold_start_replay_s": cold_s,
+    }
+
+
+def run(sizes: List[int], writes: int) -> List[Dict[str, float]]:
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="agentkit-journal-") as d:
+        for n in sizes:
+            for journal in (False, True):
+                rows.append(_bench_one(n, writes, journal, d))
+    return rows
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="user.json yazma maliyeti benchmark'ı")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    ap.add_argument("--writes", type=int, default=50)
+    ap.add_argument("--out", default=None, help="Sonuçları JSON olarak kaydet")
+    args = ap.parse_args(argv)
+
+    rows = run(args.sizes, args.writes)
+    print(f"{'customers':>10} {'mode':>13} {'write_mean_ms':>14} {'write_p95_ms':>13} {'cold_start_s':>13}")
+    for r in rows:
+        print(f"{r['customers']:>10} {r['mode']:>13} {r['write_mean_ms']:>14.3f} {r['write_p95_ms']:>13.3f} {r['cold_start_replay_s']:>13.3f}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+    return 0
@@ -0,0 +1,100 @@
+# src/agentkit/bench/lazy.py
+"""Tam (CustomerStore) ve tembel (LazyCustomerStore) yükleme: açılış süresi, tepe RSS, arama gecikmesi."""
+from __future__ import annotations
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import resource
+import tempfile
+import subprocess
+from typing import Dict, List, Optional
+
+from agentkit.bench.datagen import write_users
+
+
+def _rss_mb() -> float:
+    # Linux'ta ru_maxrss KB cinsindendir.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def _child(mode: str, path: str, n: int, lookups: int) -> Dict[str, float]:
+    from agentkit.storage.lazy import LazyCustomerStore
+    from agentkit.storage.store import CustomerStore
+
+    base_rss = _rss_mb()
+    t0 = time.perf_counter()
+    store = (LazyCustomerStore if mode == "lazy" else CustomerStore)(path)
+    store.refresh()
+    open_s = time.perf_counter() - t0
+
+    rnd = random.Random(0)
+    keys = []
+    for _ in range(lookups):
+        i = rnd.randrange(n)
+        keys.append(rnd.choice((f"{10000000000 + i}", f"user_{i:07d}", f"05{i:09d}")))
+    lat = []
+    for k in keys:
+        t0 = time.perf_counter()
+        u = store.find(k)
+        lat.append(time.perf_counter() - t0)
+        assert u is not None, k
+    lat.sort()
+    return {
+        "mode": mode,
+        "customers": n,
+        "open_s": open_s,
+        "base_rss_mb": base_rss,
+        "peak_rss_mb": _rss_mb(),
+        "lookup_p50_us": 1e6 * lat[len(lat) // 2],
+        "lookup_p99_us": 1e6 * lat[int(0.99 * (len(lat) - 1))],
+    }
+
+
+def _measure(mode: str, path: str, n: int, lookups: int) -> Optional[Dict[str, float]]:
+    code = f"import json; from agentkit.bench.lazy import _child; print(json.dumps(_child({mode!r}, {path!r}, {n}, {lookups})))"
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if proc.returncode != 0:
+        # Tam yükleme büyük dosyalarda bellek yetersizliğinden ölebilir.
+        return {"mode": mode, "customers": n, "error": (proc.stderr.strip().splitlines() or [f"exit {proc.returncode}"])[-1]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run(sizes: List[int], lookups: int, modes: List[str], workdir: Optional[str] = None) -> List[Dict[str, float]]:
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="agentkit-lazy-", dir=workdir) as d:
+        for n in sizes:
+            path = os.path.join(d, f"user_{n}.json")
+            size = write_users(path, n)
+            for mode in modes:
+                row = _measure(mode, path, n, lookups)
+                row["file_mb"] = size / 2 ** 20
+                rows.append(row)
+            os.remove(path)
+    return rows
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Tembel müşteri yükleyici benchmark'ı")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000])
+    ap.add_argument("--lookups", type=int, default=20000)
+    ap.add_argument("--modes", nargs="+", choices=["eager", "lazy"], default=["eager", "lazy"])
+    ap.add_argument("--workdir", default=None, help="Üretilen dosyalar için dizin (varsayılan: sistem geçici dizini)")
+    ap.add_argument("--out", default=None, help="Sonuçları JSON olarak kaydet")
+    args = ap.parse_args(argv)
+
+    rows = run(args.sizes, args.lookups, args.modes, args.workdir)
+    print(f"{'customers':>10} {'mode':>6} {'file_mb':>8} {'open_s':>8} {'rss_mb':>8} {'base_mb':>8} {'p50_us':>8} {'p99_us':>8}")
+    for r in rows:
+        if "error" in r:
+            print(f"{r['customers']:>10} {r['mode']:>6} {r['file_mb']:>8.0f}  HATA: {r['error']}")
+            continue
+        print(f"{r['customers']:>10} {r['mode']:>6} {r['file_mb']:>8.0f} {r['open_s']:>8.2f} {r['peak_rss_mb']:>8.0f} "
+              f"{r['base_rss_mb']:>8.0f} {r['lookup_p50_us']:>8.1f} {r['lookup_p99_us']:>8.1f}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+    return 0
@@ -0,0 +1,114 @@
+# src/agentkit/bench/memory.py
+"""Konuşma belleğinin (`agent/memory.py`) uzun konuşmalarda istem boyu ve tur başına prefill süresine etkisi."""
+from __future__ import annotations
+
+import time
+import argparse
+import statistics
+from typing import Any, Dict, List, Tuple
+
+from agentkit.config import settings
+
+MODES = ("buffer", "window", "summary")
+CHECKPOINTS = (1, 25, 50, 100)
+
+
+def _turns(path: str, n: int) -> List[Tuple[str, str]]:
+    """(kullanıcı mesajı, nihai cevap) çiftleri; senaryolar bitince baştan."""
+    from agentkit.kpi.evaluator import KPIEvaluator
+
+    pairs = []
+    for scn in KPIEvaluator._load_scenarios(path):
+        user = None
+        for step in scn.get("conversations", []):
+            if step.get("role") == "user":
+                user = step.get("content", "")
+            elif step.get("role") == "assistant" and user is not None:
+                for obj in KPIEvaluator._extract_json_objects(step.get("content", "")):
+                    if KPIEvaluator._norm(obj.get("action")) == "final answer":
+                        pairs.append((user, str(obj.get("action_input", ""))))
+                        user = None
+                        break
+    return [pairs[i % len(pairs)] for i in range(n)]
+
+
+def run(model: str = settings.model_name, turns: int = 120, budget: int = 2048, max_length: int = 16384,
+        summary_tokens: int = 128, scenario: str = "scenario/scenarioForKPI.json") -> Dict[str, Any]:
+    from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
+    from transformers import AutoModelForCausalLM, AutoTokenizer
+
+    from agentkit.agent.core import HUMAN_PROMPT, SYSTEM_PROMPT, PipelineLLM, new_memory
+    from agentkit.agent.memory import llm_summarizer, token_counter
+    from agentkit.pipeline import CustomTextGenerationPipeline
+    from agentkit.tools import registry
+
+    tools = registry.get_tools()
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", SYSTEM_PROMPT),
+        MessagesPlaceholder("chat_history"),
+        ("human", HUMAN_PROMPT),
+        MessagesPlaceholder("agent_scratchpad"),
+    ]).partial(tools=registry.render_tools(tools), tool_names=", ".join(t.name for t in tools))
+    pairs = _turns(scenario, turns)
+
+    tok = AutoTokenizer.from_pretrained(model)
+    mdl = AutoModelForCausalLM.from_pretrained(model).eval()
+    rows = []
+    for mode in MODES:
+        pipe = CustomTextGenerationPipeline(mdl, tok, max_new_tokens=1, max_length=max_length, device="cpu",
+                                            batch_size=1, stop_on_json=False)
+        summarize = None
+        if mode == "summary":
+            writer = CustomTextGenerationPipeline(mdl, tok, max_new_tokens=summary_tokens, max_length=max_length,
+                                                  device="cpu", batch_size=1, stop_on_json=False, prefix_cache_mb=0)
+            summarize = llm_summarizer(PipelineLLM(writer))
+        memory = new_memory(0 if mode == "buffer" else budget, token_counter(pipe), summarize)
+        pipe("ısınma")
+        lengths, times = [], []
+        t_all = time.perf_counter()
+        for user, final in pairs:
+            history = memory.load_memory_variables({})["chat_history"]
+            text = prompt.format_prompt(input=user, chat_history=history, agent_scratchpad=[]).to_string()
+            lengths.append(len(tok(text)["input_ids"]))
+            t0 = time.perf_counter()
+            pipe(text)
+            times.append(time.perf_counter() - t0)
+            memory.save_context({"input": user}, {"output": final})
+        wall = time.perf_counter() - t_all
+        memory.wait()
+        head, tail = times[:20], times[-20:]
+        rows.append({
+            "mode": mode,
+            "tokens_at": {t: lengths[t - 1] for t in CHECKPOINTS + (len(pairs),) if t <= len(pairs)},
+            "tokens_max": max(lengths),
+            "ms_first20": 1000 * statistics.mean(head),
+            "ms_last20": 1000 * statistics.mean(tail),
+            "ms_p95": 1000 * sorted(times)[int(0.95 * (len(times) - 1))],
+            "wall_s": wall,
+            "cut": sum(n > max_length for n in lengths),
+            "reuse_rate": pipe.prefix_cache.stats()["reuse_rate"] if pipe.prefix_cache is not None else 0.0,
+            "summary_tokens": memory._summary_tokens,
+        })
+    return {"model": model, "turns": len(pairs), "budget": budget, "max_length": max_length, "rows": rows}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Konuşma belleği: uzun konuşmada istem boyu ve tur başına prefill")
+    ap.add_argument("--model", default=settings.model_name)
+    ap.add_argument("--turns", type=int, default=120)
+    ap.add_argument("--budget", type=int, default=2048, help="geçmiş için token bütçesi (window/summary)")
+    ap.add_argument("--max-length", type=int, default=16384, help="pipeline istem sınırı (aşan istem kesilir)")
+    ap.add_argument("--summary-tokens", type=int, default=128, help="özet için en fazla yeni token")
+    ap.add_argument("--scenario", default="scenario/scenarioForKPI.json")
+    args = ap.parse_args(argv)
+
+    r = run(args.model, args.turns, args.budget, args.max_length, args.summary_tokens, args.scenario)
+    print(f"{r['model']}: {r['turns']} turluk konuşma, bütçe {r['budget']} token, max_length {r['max_length']}, CPU")
+    marks = list(r["rows"][0]["tokens_at"])
+    print(f"{'mode':<8} " + " ".join(f"{'tok@' + str(t):>8}" for t in marks)
+          + f" {'tok_max':>8} {'ms@1-20':>8} {'ms@son20':>9} {'p95_ms':>7} {'wall_s':>7} {'cut':>4} {'reuse':>6}")
+    for row in r["rows"]:
+        print(f"{row['mode']:<8} " + " ".join(f"{row['tokens_at'][t]:>8}" for t in marks)
+              + f" {row['tokens_max']:>8} {row['ms_first20']:>8.1f} {row['ms_last20']:>9.1f} {row['ms_p95']:>7.1f} "
+                f"{row['wall_s']:>7.1f} {row['cut']:>4} {row['reuse_rate']:>6.2f}")
+    return 0
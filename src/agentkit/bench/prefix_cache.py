@@ -0,0 +1,118 @@
+# src/agentkit/bench/prefix_cache.py
+"""Önek KV önbelleğinin (`kv_cache.py`) ajan adımı başına prefill süresine etkisi."""
+from __future__ import annotations
+
+import json
+import time
+import argparse
+import statistics
+from typing import Any, Dict, List
+
+from agentkit.config import settings
+
+OBSERVATION = '```json\n{"success": true, "message": "İşlem tamamlandı."}\n```'
+
+
+def _sessions(path: str, n: int) -> List[List[Dict[str, Any]]]:
+    """Senaryo başına adım girdileri: {"input", "chat_history", "agent_scratchpad"}."""
+    from langchain_core.messages import AIMessage, HumanMessage
+
+    from agentkit.kpi.evaluator import KPIEvaluator
+
+    out = []
+    for scn in KPIEvaluator._load_scenarios(path)[:n]:
+        steps: List[Dict[str, Any]] = []
+        history: list = []
+        user = None
+        for step in scn.get("conversations", []):
+            if step.get("role") == "user":
+                user = step.get("content", "")
+                continue
+            if step.get("role") != "assistant" or user is None:
+                continue
+            scratch: list = []
+            final = ""
+            for obj in KPIEvaluator._extract_json_objects(step.get("content", "")):
+                steps.append({"input": user, "chat_history": list(history), "agent_scratchpad": list(scratch)})
+                if KPIEvaluator._norm(obj.get("action")) == "final answer":
+                    final = str(obj.get("action_input", ""))
+                    break
+                scratch += [AIMessage(content=json.dumps(obj, ensure_ascii=False)), HumanMessage(content=OBSERVATION)]
+            history += [HumanMessage(content=user), AIMessage(content=final)]
+            user = None
+        out.append(steps)
+    return out
+
+
+def run(model: str = settings.model_name, sessions: int = 4, scenarios: int = 12,
+        scenario: str = "scenario/scenarioForKPI.json") -> Dict[str, Any]:
+    from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
+    from transformers import AutoModelForCausalLM, AutoTokenizer
+
+    from agentkit.agent.core import HUMAN_PROMPT, SYSTEM_PROMPT
+    from agentkit.pipeline import CustomTextGenerationPipeline
+    from agentkit.tools import registry
+
+    tools = registry.get_tools()
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", SYSTEM_PROMPT),
+        MessagesPlaceholder("chat_history"),
+        ("human", HUMAN_PROMPT),
+        MessagesPlaceholder("agent_scratchpad"),
+    ]).partial(tools=registry.render_tools(tools), tool_names=", ".join(t.name for t in tools))
+
+    # Oturumları sırayla ilerlet: her turda her oturumdan bir adım.
+    per_session = _sessions(scenario, scenarios)
+    order: List[str] = []
+    for group in range(0, len(per_session), sessions):
+        chunk = per_session[group:group + sessions]
+        for i in range(max(len(s) for s in chunk)):
+            order += [prompt.format_prompt(**s[i]).to_string() for s in chunk if i < len(s)]
+
+    tok = AutoTokenizer.from_pretrained(model)
+    mdl = AutoModelForCausalLM.from_pretrained(model).eval()
+    rows, firsts = [], []
+    for mb in (0, 1024):
+        pipe = CustomTextGenerationPipeline(mdl, tok, max_new_tokens=1, device="cpu", batch_size=1,
+                                            stop_on_json=False, prefix_cache_mb=mb)
+        pipe(order[0][:200])  # ısınma
+        if pipe.prefix_cache is not None:
+            pipe.prefix_cache.clear()
+        times, outs = [], []
+        for text in order:
+            t0 = time.perf_counter()
+            outs.append(pipe(text)[0]["generated_text"])
+            times.append(time.perf_counter() - t0)
+        firsts.append(outs)
+        stats = pipe.prefix_cache.stats() if pipe.prefix_cache is not None else None
+        rows.append({
+            "cache": "on" if mb else "off",
+            "prefill_ms_mean": 1000 * statistics.mean(times),
+            "prefill_ms_p50": 1000 * statistics.median(times),
+            "reuse_rate": stats["reuse_rate"] if stats else 0.0,
+            "hit_rate": stats["hit_rate"] if stats else 0.0,
+            "cache_mb": stats["bytes"] / 2**20 if stats else 0.0,
+        })
+    lengths = [len(ids) for ids in pipe._encode(order)]
+    return {"model": model, "steps": len(order), "sessions": sessions,
+            "prompt_tokens_mean": statistics.mean(lengths), "rows": rows,
+            "match": sum(a == b for a, b in zip(*firsts)) / len(order)}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Önek KV önbelleği: adım başına prefill süresi")
+    ap.add_argument("--model", default=settings.model_name)
+    ap.add_argument("--sessions", type=int, default=4, help="iç içe ilerleyen oturum sayısı")
+    ap.add_argument("--scenarios", type=int, default=12)
+    ap.add_argument("--scenario", default="scenario/scenarioForKPI.json")
+    args = ap.parse_args(argv)
+
+    r = run(args.model, args.sessions, args.scenarios, args.scenario)
+    print(f"{r['model']}: {r['steps']} ajan adımı, {r['sessions']} iç içe oturum, "
+          f"ortalama istem {r['prompt_tokens_mean']:.0f} token (CPU)")
+    print(f"{'cache':<6} {'prefill_ms':>11} {'p50_ms':>8} {'reuse':>6} {'hit':>5} {'cache_mb':>9}")
+    for row in r["rows"]:
+        print(f"{row['cache']:<6} {row['prefill_ms_mean']:>11.1f} {row['prefill_ms_p50']:>8.1f} "
+              f"{row['reuse_rate']:>6.2f} {row['hit_rate']:>5.2f} {row['cache_mb']:>9.1f}")
+    print(f"ilk token eşleşmesi {r['match']:.2f}")
+    return 0
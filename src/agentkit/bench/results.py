@@ -0,0 +1,105 @@
+# src/agentkit/bench/results.py
+"""Araç sonucu serileştirme: `json.dumps` metni ile `ToolResult.to_json()` (orjson) karşılaştırması."""
+from __future__ import annotations
+
+import json
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from agentkit.bench.datagen import write_dataset
+from agentkit.bench.tools import make_args
+
+
+def _time_us(fn: Callable[[Any], Any], items: List[Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for x in items:
+            fn(x)
+        best = min(best, time.perf_counter() - t0)
+    return 1e6 * best / len(items)
+
+
+def _peak_bytes(fn: Callable[[Any], Any], items: List[Any]) -> float:
+    """Sonuç başına ortalama tepe ayırma (çıktı metni dahil)."""
+    total = 0
+    tracemalloc.start()
+    for x in items:
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        out = fn(x)
+        _, peak = tracemalloc.get_traced_memory()
+        total += peak - base
+        del out
+    tracemalloc.stop()
+    return total / len(items)
+
+
+def collect(customers: int, calls: int, seed: int = 0, tools: Optional[List[str]] = None,
+            workdir: Optional[str] = None) -> Dict[str, list]:
+    """Her araç için `calls` adet sonuç (ToolResult) toplar."""
+    from agentkit.tools import api_functions as api
+    from agentkit.tools.schemas import function_schemas
+
+    only = set(tools or ())
+    out: Dict[str, list] = {}
+    with tempfile.TemporaryDirectory(prefix="agentkit-results-", dir=workdir) as d:
+        paths = write_dataset(d, customers, seed)
+        api.USER_DB, api.PACKAGE_DB = paths["user_db"], paths["package_db"]
+        for schema in function_schemas:
+            name = schema["name"]
+            if only and name not in only:
+                continue
+            fn = getattr(api, name, None)
+            if fn is None:
+                continue
+            rnd = random.Random(f"{seed}:{name}")
+            random.seed(seed)
+            out[name] = [fn(**make_args(schema, rnd, customers)) for _ in range(calls)]
+    return out
+
+
+def run(customers: int = 10000, calls: int = 500, seed: int = 0, repeat: int = 5,
+        tools: Optional[List[str]] = None, workdir: Optional[str] = None) -> List[Dict[str, Any]]:
+    old = lambda r: json.dumps(r, ensure_ascii=False)
+    new = lambda r: r.to_json()
+    rows = []
+    for name, results in collect(customers, calls, seed, tools, workdir).items():
+        rows.append({
+            "tool": name,
+            "bytes": sum(len(old(r).encode("utf-8")) for r in results) / len(results),
+            "json_us": _time_us(old, results, repeat),
+            "orjson_us": _time_us(new, results, repeat),
+            "json_alloc_b": _peak_bytes(old, results),
+            "orjson_alloc_b": _peak_bytes(new, results),
+        })
+    return rows
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Araç sonucu serileştirme benchmark'ı")
+    ap.add_argument("--customers", type=int, default=10000)
+    ap.add_argument("--calls", type=int, default=500, help="Araç başına sonuç sayısı")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--tools", nargs="*", default=None, help="Yalnızca bu araçlar")
+    ap.add_argument("--workdir", default=None)
+    ap.add_argument("--out", default=None, help="Sonuçları JSON olarak kaydet")
+    args = ap.parse_args(argv)
+
+    rows = run(args.customers, args.calls, args.seed, args.repeat, args.tools, args.workdir)
+    print(f"{'tool':<30} {'bytes':>7} {'json_us':>8} {'orjson_us':>9} {'speedup':>8} {'json_B':>8} {'orjson_B':>9}")
+    for r in rows:
+        print(f"{r['tool']:<30} {r['bytes']:>7.0f} {r['json_us']:>8.2f} {r['orjson_us']:>9.2f} "
+              f"{r['json_us'] / r['orjson_us']:>7.1f}x {r['json_alloc_b']:>8.0f} {r['orjson_alloc_b']:>9.0f}")
+    tj, to = sum(r["json_us"] for r in rows), sum(r["orjson_us"] for r in rows)
+    aj, ao = sum(r["json_alloc_b"] for r in rows), sum(r["orjson_alloc_b"] for r in rows)
+    print(f"{'TOPLAM':<30} {'':>7} {tj:>8.2f} {to:>9.2f} {tj / to:>7.1f}x {aj:>8.0f} {ao:>9.0f}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2, ensure_ascii=False)
+    return 0
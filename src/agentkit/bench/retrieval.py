@@ -0,0 +1,121 @@
+# src/agentkit/bench/retrieval.py
+"""Araç seçiminin (`agent/retrieval.py`) istem boyutu ve seçim isabeti (model çalıştırılmaz)."""
+from __future__ import annotations
+
+import time
+import argparse
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from agentkit.config import settings
+
+
+def _turns(scn: Dict[str, Any]) -> List[Tuple[Dict[str, Any], List[str]]]:
+    """(retriever girdisi, o turda altın yanıtın çağırdığı araçlar) çiftleri."""
+    from agentkit.kpi.evaluator import KPIEvaluator
+
+    out: List[Tuple[Dict[str, Any], List[str]]] = []
+    history: List[Dict[str, str]] = []
+    for step in scn.get("conversations", []):
+        if step.get("role") == "user":
+            out.append(({"input": step.get("content", ""), "chat_history": list(history)}, []))
+            history.append({"role": "user", "content": step.get("content", "")})
+        elif step.get("role") == "assistant" and out:
+            for obj in KPIEvaluator._extract_json_objects(step.get("content", "")):
+                action = obj.get("action")
+                if action and KPIEvaluator._norm(action) != "final answer":
+                    out[-1][1].append(action)
+    return out
+
+
+def _counter(tokenizer: Optional[str]) -> Tuple[Callable[[str], int], str]:
+    if tokenizer:
+        try:
+            from transformers import AutoTokenizer
+            tok = AutoTokenizer.from_pretrained(tokenizer)
+            return (lambda text: len(tok(text)["input_ids"])), "tokens"
+        except Exception as e:
+            print(f"tokenizer yüklenemedi ({type(e).__name__}); istem boyutu karakter olarak raporlanıyor")
+    return len, "chars"
+
+
+def run(scenario: str = "scenario/scenarioForKPI.json", ks: Optional[List[int]] = None,
+        embed_model: Optional[str] = None, tokenizer: Optional[str] = None, embed=None) -> Dict[str, Any]:
+    from langchain.prompts import SystemMessagePromptTemplate
+
+    from agentkit.agent import retrieval
+    from agentkit.agent.core import SYSTEM_PROMPT
+    from agentkit.kpi.evaluator import KPIEvaluator
+    from agentkit.tools import registry
+
+    tools = registry.get_tools()
+    names = {t.name for t in tools}
+    embed = embed or retrieval.sentence_embedder(embed_model or retrieval.TOOL_EMBED_MODEL)
+    count, unit = _counter(tokenizer)
+    system = SystemMessagePromptTemplate.from_template(SYSTEM_PROMPT)
+
+    def prompt_size(selected: list) -> int:
+        text = system.format(tools=registry.render_tools(selected), tool_names=", ".join(t.name for t in selected))
+        return count(text.content)
+
+    scenarios = [_turns(scn) for scn in KPIEvaluator._load_scenarios(scenario)]
+    turns = [t for scn in scenarios for t in scn]
+    full = prompt_size(tools)
+    rows = []
+    for k in ks or [4, 6, 8, 12]:
+        r = retrieval.ToolRetriever(tools, top_k=k, embed=embed)
+        sizes: Dict[Tuple[str, ...], int] = {}
+        hit_turns = tool_turns = hit_tools = gold_tools = ok_scenarios = tool_scenarios = 0
+        select_s = 0.0
+        total_size = 0
+        for scn in scenarios:
+            scn_ok, scn_tools = True, False
+            for inputs, gold in scn:
+                t0 = time.perf_counter()
+                selected = r.select(r.queries(inputs))
+                select_s += time.perf_counter() - t0
+                key = tuple(t.name for t in selected)
+                if key not in sizes:
+                    sizes[key] = prompt_size(selected)
+                total_size += sizes[key]
+                gold = [g for g in gold if g in names]
+                if not gold:
+                    continue
+                hit = sum(g in key for g in gold)
+                tool_turns += 1
+                scn_tools = True
+                gold_tools += len(gold)
+                hit_tools += hit
+                hit_turns += hit == len(gold)
+                scn_ok &= hit == len(gold)
+            tool_scenarios += scn_tools
+            ok_scenarios += scn_tools and scn_ok
+        rows.append({
+            "k": k,
+            "turn_hit_rate": hit_turns / tool_turns if tool_turns else 0.0,
+            "tool_recall": hit_tools / gold_tools if gold_tools else 0.0,
+            "scenario_hit_rate": ok_scenarios / tool_scenarios if tool_scenarios else 0.0,
+            "prompt_mean": total_size / len(turns) if turns else 0.0,
+            "select_ms": 1000 * select_s / len(turns) if turns else 0.0,
+        })
+    return {"scenarios": len(scenarios), "turns": len(turns), "tools": len(tools), "unit": unit,
+            "full_prompt": full, "rows": rows}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Araç seçimi: istem boyutu ve seçim isabeti")
+    ap.add_argument("--scenario", default="scenario/scenarioForKPI.json")
+    ap.add_argument("--k", type=int, nargs="+", default=[4, 6, 8, 12])
+    ap.add_argument("--embed-model", default=None, help="varsayılan AGENTKIT_TOOL_EMBED_MODEL")
+    ap.add_argument("--tokenizer", default=settings.model_name, help="istem token sayımı için")
+    args = ap.parse_args(argv)
+
+    r = run(args.scenario, args.k, args.embed_model, args.tokenizer)
+    unit = r["unit"]
+    print(f"{r['scenarios']} senaryo, {r['turns']} kullanıcı turu, {r['tools']} araç; "
+          f"tüm katalogla sistem istemi {r['full_prompt']} {unit}")
+    print(f"{'k':>3} {'turn_hit':>9} {'tool_recall':>12} {'scn_hit':>8} {'prompt_' + unit:>14} {'saving':>7} {'select_ms':>10}")
+    for row in r["rows"]:
+        saving = 1 - row["prompt_mean"] / r["full_prompt"] if r["full_prompt"] else 0.0
+        print(f"{row['k']:>3} {row['turn_hit_rate']:>9.2f} {row['tool_recall']:>12.2f} {row['scenario_hit_rate']:>8.2f} "
+              f"{row['prompt_mean']:>14.0f} {saving:>6.0%} {row['select_ms']:>10.2f}")
+    return 0
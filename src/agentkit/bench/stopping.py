@@ -0,0 +1,108 @@
+# src/agentkit/bench/stopping.py
+"""Üretim içi durdurmanın (`GEN_STOP_ON_JSON`, `stop` dizileri) adım başına token sayısına ve süreye etkisi."""
+from __future__ import annotations
+
+import json
+import time
+import argparse
+from typing import Any, Dict, List
+
+import torch
+
+from agentkit.bench.generation import PREAMBLE
+
+STOP = ["\nObservation"]  # create_json_chat_agent'ın varsayılan durdurma dizisi
+TAILS = [
+    '\nObservation: {"success": true, "message": "İşlem tamamlandı."}\n',
+    "\n\nBaşka bir konuda yardımcı olabileceğim bir şey var mı? Size yardımcı olmaktan memnuniyet duyarım. ",
+]
+MODES = {"off": (None, False), "stop": (STOP, False), "stop+json": (STOP, True)}
+
+
+def _steps(path: str, n: int) -> List[Dict[str, Any]]:
+    from agentkit.kpi.evaluator import KPIEvaluator
+
+    out = []
+    for scn in KPIEvaluator._load_scenarios(path):
+        user = ""
+        for step in scn.get("conversations", []):
+            if step.get("role") == "user":
+                user = step.get("content", "")
+            elif step.get("role") == "assistant":
+                for obj in KPIEvaluator._extract_json_objects(step.get("content", "")):
+                    out.append({"prompt": PREAMBLE + user, "object": obj})
+                    if len(out) >= n:
+                        return out
+    return out
+
+
+class _Replay:
+    """Üretimi verilen token dizisine zorlar (tek satır)."""
+
+    def __init__(self, ids: List[int], prompt_len: int):
+        self.ids = ids
+        self.prompt_len = prompt_len
+
+    def __call__(self, input_ids, scores):
+        step = input_ids.shape[1] - self.prompt_len
+        forced = torch.full_like(scores, float("-inf"))
+        forced[:, self.ids[min(step, len(self.ids) - 1)]] = 0
+        return forced
+
+
+def run(model: str = "sshleifer/tiny-gpt2", steps: int = 40, max_new_tokens: int = 512,
+        scenario: str = "scenario/scenarioForKPI.json") -> Dict[str, Any]:
+    from transformers import AutoModelForCausalLM, AutoTokenizer, LogitsProcessorList
+
+    from agentkit.agent.core import PipelineLLM
+    from agentkit.kpi.evaluator import KPIEvaluator
+    from agentkit.pipeline import CustomTextGenerationPipeline
+    from agentkit.usage import usage
+
+    tok = AutoTokenizer.from_pretrained(model)
+    mdl = AutoModelForCausalLM.from_pretrained(model).eval()
+    pipe = CustomTextGenerationPipeline(mdl, tok, max_new_tokens=max_new_tokens, device="cpu", batch_size=1)
+    items = _steps(scenario, steps)
+    for i, item in enumerate(items):
+        text = json.dumps(item["object"], ensure_ascii=False)
+        tail = TAILS[i % len(TAILS)]
+        ids = tok(text, add_special_tokens=False)["input_ids"]
+        while len(ids) < max_new_tokens:
+            ids += tok(tail, add_special_tokens=False)["input_ids"]
+        item["script"] = ids
+        item["prompt_len"] = len(tok(item["prompt"])["input_ids"])
+    rows = []
+    for mode, (stop, json_object) in MODES.items():
+        pipe.stop_on_json = json_object
+        before = usage()["generated_tokens"]
+        ok = 0
+        t0 = time.perf_counter()
+        for item in items:
+            proc = LogitsProcessorList([_Replay(item["script"], item["prompt_len"])])
+            out = pipe(item["prompt"], stop=stop, logits_processor=proc)[0]["generated_text"]
+            objs = KPIEvaluator._extract_json_objects(PipelineLLM._cut(out, STOP))
+            ok += bool(objs) and objs[0] == item["object"]
+        wall = time.perf_counter() - t0
+        rows.append({
+            "mode": mode,
+            "tokens_per_step": (usage()["generated_tokens"] - before) / len(items),
+            "ms_per_step": 1000 * wall / len(items),
+            "match": ok / len(items),
+        })
+    return {"model": model, "steps": len(items), "max_new_tokens": max_new_tokens, "rows": rows}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Üretim içi durdurma: adım başına üretilen token")
+    ap.add_argument("--model", default="sshleifer/tiny-gpt2")
+    ap.add_argument("--steps", type=int, default=40)
+    ap.add_argument("--max-new-tokens", type=int, default=512)
+    ap.add_argument("--scenario", default="scenario/scenarioForKPI.json")
+    args = ap.parse_args(argv)
+
+    r = run(args.model, args.steps, args.max_new_tokens, args.scenario)
+    print(f"{r['model']}: {r['steps']} altın asistan adımı, max_new_tokens={r['max_new_tokens']} (CPU)")
+    print(f"{'mode':<10} {'tok/step':>9} {'ms/step':>9} {'match':>6}")
+    for row in r["rows"]:
+        print(f"{row['mode']:<10} {row['tokens_per_step']:>9.1f} {row['ms_per_step']:>9.1f} {row['match']:>6.2f}")
+    return 0
@@ -0,0 +1,57 @@
+# src/agentkit/bench/streaming.py
+"""Akışlı üretimde ilk token süresi (TTFT) ile tam yanıt süresinin karşılaştırması."""
+from __future__ import annotations
+
+import time
+import argparse
+import statistics
+from typing import Any, Dict
+
+from agentkit.bench.generation import _load, _prompts
+
+
+def run(model: str = "sshleifer/tiny-gpt2", prompts: int = 8, max_new_tokens: int = 128,
+        scenario: str = "scenario/scenarioForKPI.json") -> Dict[str, Any]:
+    texts = _prompts(scenario, prompts)
+    pipe = _load(model, max_new_tokens, 1)
+    pipe.model.generation_config.min_new_tokens = max_new_tokens
+    pipe(texts[0])  # ısınma
+    ttft, stream_total, full, match = [], [], [], 0
+    for text in texts:
+        t0 = time.perf_counter()
+        first, parts = None, []
+        for piece in pipe.stream(text):
+            if first is None:
+                first = time.perf_counter() - t0
+            parts.append(piece)
+        stream_total.append(time.perf_counter() - t0)
+        ttft.append(first if first is not None else stream_total[-1])
+        t0 = time.perf_counter()
+        out = pipe(text)[0]["generated_text"]
+        full.append(time.perf_counter() - t0)
+        match += "".join(parts) == out
+    return {
+        "model": model,
+        "prompts": len(texts),
+        "max_new_tokens": max_new_tokens,
+        "ttft_ms": 1000 * statistics.median(ttft),
+        "stream_total_ms": 1000 * statistics.median(stream_total),
+        "full_ms": 1000 * statistics.median(full),
+        "match": match / len(texts),
+    }
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Akışlı üretim: ilk token süresi ve tam yanıt süresi")
+    ap.add_argument("--model", default="sshleifer/tiny-gpt2")
+    ap.add_argument("--prompts", type=int, default=8)
+    ap.add_argument("--max-new-tokens", type=int, default=128)
+    ap.add_argument("--scenario", default="scenario/scenarioForKPI.json")
+    args = ap.parse_args(argv)
+
+    r = run(args.model, args.prompts, args.max_new_tokens, args.scenario)
+    print(f"{r['model']}: {r['prompts']} istem x {r['max_new_tokens']} yeni token (CPU), medyan")
+    print(f"akışlı:  ilk token {r['ttft_ms']:.1f} ms, son token {r['stream_total_ms']:.1f} ms")
+    print(f"akışsız: ilk/son token {r['full_ms']:.1f} ms")
+    print(f"algılanan gecikme {r['full_ms'] / r['ttft_ms']:.1f}x daha kısa; çıktı eşleşmesi {r['match']:.2f}")
+    return 0
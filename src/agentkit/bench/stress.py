@@ -0,0 +1,193 @@
+# src/agentkit/bench/stress.py
+"""Eşzamanlı yazma stres testi: kayıp güncelleme (lost update) olmadığını doğrular."""
+from __future__ import annotations
+
+import os
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+import multiprocessing as mp
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from agentkit.bench.datagen import make_users
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+GB_PRICE = 50
+
+
+def _prepare(workdir: str, customers: int) -> Tuple[str, List[dict]]:
+    users = make_users(customers)
+    for u in users:
+        # Her müşteriye düzenlenebilir tek bir fatura ve boş engelli listesi.
+        u["bills"] = [{"bill_id": f"B-{u['customer_id']}", "bill_date": "2025-06-20", "amount": 0.0,
+                       "due_date": "2025-07-10", "status": "Beklemede", "details": "", "breakdown": {"base": 0.0}}]
+        u["blocked_numbers"] = []
+        u.setdefault("usage_history", {})["internet_gb_used_monthly"] = 0
+    path = os.path.join(workdir, "user.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(users, f, ensure_ascii=False)
+    return path, users
+
+
+def _configure(api, workdir: str, storage: str, lazy: bool = False) -> None:
+    api.USER_DB = os.path.join(workdir, "user.json")
+    api.PACKAGE_DB = os.path.join(ROOT, "data", "packages.json")
+    api.STORAGE = storage
+    api.SQLITE_DB = os.path.join(workdir, "agentkit.db")
+    api.USER_JOURNAL = ""
+    api.LAZY_LOAD = lazy
+
+
+def _worker(args) -> Dict[str, Counter]:
+    workdir, storage, lazy, threads, ops, seed, customers = args
+    from agentkit.tools import api_functions as api
+    _configure(api, workdir, storage, lazy)
+    users = make_users(customers)
+    sent, received, blocked, errors = Counter(), Counter(), Counter(), Counter()
+    tally_lock = threading.Lock()
+
+    def run(tid: int) -> None:
+        rnd = random.Random(seed * 1000 + tid)
+        for i in range(ops):
+            a, b = rnd.choice(users), rnd.choice(users)
+            if rnd.random() < 0.5:
+                amount = rnd.randint(1, 10)
+                res = api.sendGiftPackage(a["tc_no"], b["phone_number"], "internet", amount)
+                with tally_lock:
+                    if res.get("success"):
+                        sent[a["customer_id"]] += amount
+                        received[b["customer_id"]] += amount
+                    else:
+                        errors[res.get("error", "?")] += 1
+            else:
+                num = f"05{seed:03d}{tid:03d}{i:03d}"[:11]
+                res = api.blockIncomingNumber(a["customer_id"], num)
+                with tally_lock:
+                    if res.get("success"):
+                        blocked[a["customer_id"]] += 1
+                    else:
+                        errors[res.get("error", "?")] += 1
+
+    ts = [threading.Thread(target=run, args=(t,)) for t in range(threads)]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    return {"sent": sent, "received": received, "blocked": blocked, "errors": errors}
+
+
+def run(processes: int, threads: int, ops: int, customers: int, storage: str, lazy: bool = False) -> Dict[str, object]:
+    with tempfile.TemporaryDirectory(prefix="agentkit-stress-") as d:
+        _prepare(d, customers)
+        jobs = [(d, storage, lazy, threads, ops, p + 1, customers) for p in range(processes)]
+        t0 = time.perf_counter()
+        if processes == 1:
+            results = [_worker(jobs[0])]
+        else:
+            with mp.get_context("spawn").Pool(processes) as pool:
+                results = pool.map(_worker, jobs)
+        elapsed = time.perf_counter() - t0
+
+        sent, received, blocked, errors = Counter(), Counter(), Counter(), Counter()
+        for r in results:
+            sent.update(r["sent"]); received.update(r["received"]); blocked.update(r["blocked"]); errors.update(r["errors"])
+
+        # Doğrulama: durum, bu süreçte sıfırdan açılan bir arka uçla diskten okunur.
+        from agentkit.storage import open_backend
+        backend = open_backend(storage, os.path.join(d, "user.json"), os.path.join(ROOT, "data", "packages.json"),
+                               journal_path=os.path.join(d, "user.json.journal"), sqlite_db=os.path.join(d, "agentkit.db"), lazy=lazy)
+        lost = []
+        for u in backend.users():
+            cid = u["customer_id"]
+            exp = {"bill": float(GB_PRICE * sent[cid]), "usage": received[cid], "blocked": blocked[cid]}
+            got = {"bill": float(u["bills"][0]["amount"]),
+                   "usage": u["usage_history"]["internet_gb_used_monthly"],
+                   "blocked": len(u.get("blocked_numbers", []))}
+            if exp != got:
+                lost.append({"customer_id": cid, "expected": exp, "got": got})
+        backend.close()
+        total_ops = processes * threads * ops
+        return {
+            "storage": storage,
+            "lazy": lazy,
+            "processes": processes,
+            "threads": threads,
+            "operations": total_ops,
+            "elapsed_s": elapsed,
+            "ops_per_s": total_ops / elapsed if elapsed else 0.0,
+            "rejected": dict(errors),
+            "lost_updates": lost,
+        }
+
+
+def _cache_writer(conn, workdir: str, storage: str, lazy: bool) -> None:
+    from agentkit.tools import api_functions as api
+    _configure(api, workdir, storage, lazy)
+    for cid, package in iter(conn.recv, None):
+        conn.send(bool(api.initiatePackageChange(cid, package).get("success")))
+
+
+def cache_check(rounds: int, customers: int, storage: str, lazy: bool = False) -> Dict[str, object]:
+    """Bu süreç `getUserInfo`'yu önbellekle okur, ikinci bir süreç aynı müşterinin paketini değiştirir."""
+    from agentkit.tools import api_functions as api, cache
+    with tempfile.TemporaryDirectory(prefix="agentkit-cache-") as d:
+        _, users = _prepare(d, customers)
+        _configure(api, d, storage, lazy)
+        cache.TOOL_CACHE = True  # json arka ucunda varsayılan kapalı
+        ctx = mp.get_context("spawn")
+        here, there = ctx.Pipe()
+        writer = ctx.Process(target=_cache_writer, args=(there, d, storage, lazy), daemon=True)
+        writer.start()
+        writes, stale = 0, []
+        try:
+            for i in range(rounds):
+                cid = users[i % len(users)]["customer_id"]
+                api.getUserInfo(cid)
+                api.getUserInfo(cid)  # önbellekten
+                package = f"Paket-{i}"
+                here.send((cid, package))
+                if not here.recv():
+                    continue  # ör. gecikmiş ödeme: paket değişmez
+                writes += 1
+                got = api.getUserInfo(cid)["data"]["current_package"]
+                if got != package:
+                    stale.append({"customer_id": cid, "expected": package, "got": got})
+        finally:
+            here.send(None)
+            writer.join()
+        stats = cache.cache_for(api._backend()).stats()
+        api._backend().close()
+        return {"storage": storage, "lazy": lazy, "rounds": rounds, "writes": writes,
+                "hits": stats["hits"], "stale": stale}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Araç katmanı eşzamanlılık stres testi")
+    ap.add_argument("--processes", type=int, default=2)
+    ap.add_argument("--threads", type=int, default=8)
+    ap.add_argument("--ops", type=int, default=250, help="İş parçacığı başına işlem sayısı")
+    ap.add_argument("--customers", type=int, default=50)
+    ap.add_argument("--storage", choices=["json", "sqlite"], default="json")
+    ap.add_argument("--lazy", action="store_true", help="json arka ucunda tembel yükleyiciyi kullan")
+    ap.add_argument("--cache-check", type=int, default=0, metavar="ROUNDS",
+                    help="stres yerine iki süreçli önbellek geçersiz kılma kontrolü (tur sayısı)")
+    args = ap.parse_args(argv)
+
+    if args.cache_check:
+        res = cache_check(args.cache_check, args.customers, args.storage, args.lazy)
+        print(f"{res['writes']} yazma (diğer süreçte), önbellek isabeti: {res['hits']}, "
+              f"eski sonuç: {len(res['stale'])}")
+        for item in res["stale"][:10]:
+            print("  ESKİ:", item)
+        return 1 if res["stale"] or not res["hits"] else 0
+
+    res = run(args.processes, args.threads, args.ops, args.customers, args.storage, args.lazy)
+    print(f"{res['operations']} işlem, {res['elapsed_s']:.2f}s ({res['ops_per_s']:.0f} işlem/s), "
+          f"reddedilen: {sum(res['rejected'].values())}, kayıp güncelleme: {len(res['lost_updates'])}")
+    for item in res["lost_updates"][:10]:
+        print("  KAYIP:", item)
+    return 1 if res["lost_updates"] else 0
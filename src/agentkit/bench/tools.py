@@ -0,0 +1,249 @@
+# src/agentkit/bench/tools.py
+"""Araç katmanı ölçeklenme benchmark'ı: araç başına gecikme, verim ve bellek (`--compare` ile oranlar)."""
+from __future__ import annotations
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import resource
+import tempfile
+import subprocess
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from agentkit.bench.datagen import write_dataset
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+# Parametre adına göre örnek argüman üreticileri: (rnd, müşteri indeksi, müşteri sayısı) → değer.
+_ArgFn = Callable[[random.Random, int, int], Any]
+_ARGS: Dict[str, _ArgFn] = {
+    "user_identifier": lambda r, i, n: r.choice((f"{10000000000 + i}", f"user_{i:07d}", f"05{i:09d}")),
+    "sender_id": lambda r, i, n: f"user_{i:07d}",
+    "receiver_number": lambda r, i, n: f"05{r.randrange(n):09d}",
+    "target_number": lambda r, i, n: f"05{r.randint(0, 999999999):09d}",
+    "phone": lambda r, i, n: f"05{r.randint(0, 999999999):09d}",
+    "name": lambda r, i, n: "Ayşe Yılmaz",
+    "new_package_name": lambda r, i, n: "Harika 5 GB",
+    "bill_id": lambda r, i, n: f"B{i:07d}-00",
+    "period": lambda r, i, n: None,
+    "package_type": lambda r, i, n: r.choice(("internet", "dakika")),
+    "amount": lambda r, i, n: r.randint(1, 3),
+    "reason": lambda r, i, n: "benchmark",
+    "issue_description": lambda r, i, n: "internet yavaş",
+    "preferred_date": lambda r, i, n: "2030-01-%02d" % r.choice((7, 8, 9, 10, 11)),
+    "preferred_time": lambda r, i, n: "%02d:00" % r.randint(9, 16),
+    "duration_days": lambda r, i, n: 7,
+    "total_amount": lambda r, i, n: 300.0,
+    "installments": lambda r, i, n: 3,
+    "current_operator": lambda r, i, n: "Diğer",
+    "address": lambda r, i, n: "Atatürk Cad. No: 11, İzmir",
+    "new_address": lambda r, i, n: {"street": "Gül Sokak No: 4", "city": "Ankara", "zip_code": "06100"},
+    "address_street": lambda r, i, n: "Atatürk Cad. No: 11",
+    "address_city": lambda r, i, n: "İzmir",
+    "address_zip_code": lambda r, i, n: "35000",
+    "service_type": lambda r, i, n: "Fiber İnternet",
+}
+
+
+def make_args(schema: dict, rnd: random.Random, n: int) -> Dict[str, Any]:
+    """Şemadaki parametreler için rastgele bir müşteriye yönelik argümanlar üretir."""
+    i = rnd.randrange(n)
+    out = {}
+    for p in schema.get("parameters", {}).get("properties", {}):
+        fn = _ARGS.get(p)
+        value = fn(rnd, i, n) if fn else "x"
+        if value is not None:
+            out[p] = value
+    return out
+
+
+def _rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def _pct(xs: List[float], q: float) -> float:
+    return xs[min(len(xs) - 1, int(q * (len(xs) - 1)))]
+
+
+def _succeeded(res: Any) -> bool:
+    if isinstance(res, dict):
+        return bool(res.get("success"))
+    try:
+        return bool(json.loads(res).get("success"))
+    except (TypeError, ValueError, AttributeError):
+        return False
+
+
+def _child(cfg: Dict[str, Any]) -> Dict[str, Any]:
+    """Tek boyut için ölçüm; ayrı süreçte çalışır."""
+    from agentkit.tools import api_functions as api
+    from agentkit.tools.schemas import function_schemas
+
+    api.USER_DB, api.PACKAGE_DB = cfg["user_db"], cfg["package_db"]
+    api.STORAGE, api.LAZY_LOAD = cfg["storage"], cfg["lazy"]
+    api.SQLITE_DB = os.path.join(os.path.dirname(cfg["user_db"]), "agentkit.db")
+    api.USER_JOURNAL, api.JOURNAL_COMPACT_EVERY = "", cfg["compact_every"]
+    n, calls = cfg["customers"], cfg["calls"]
+    only = set(cfg.get("tools") or ())
+
+    base_rss = _rss_mb()
+    t0 = time.perf_counter()
+    api.getUserInfo(f"user_{n - 1:07d}")  # ilk çağrı: veri yükleme / indeks kurma
+    load_s = time.perf_counter() - t0
+    load_rss = _rss_mb()
+
+    rows = []
+    for schema in function_schemas:
+        name = schema["name"]
+        if only and name not in only:
+            continue
+        fn = getattr(api, name, None)
+        if fn is None:
+            continue
+        rnd = random.Random(f"{cfg['seed']}:{name}")
+        arg_sets = [make_args(schema, rnd, n) for _ in range(calls)]
+        random.seed(cfg["seed"])  # araçların kendi rastgele değerleri (randevu no, arama geçmişi) için
+        lat, ser, ok = [], 0.0, 0
+        t_all = time.perf_counter()
+        for kw in arg_sets:
+            t = time.perf_counter()
+            res = fn(**kw)
+            t_ser = time.perf_counter()
+            str(res)  # ajan sınırı: gözlem metne çevrilir
+            t_end = time.perf_counter()
+            lat.append(t_end - t)
+            ser += t_end - t_ser
+            ok += _succeeded(res)
+        wall = time.perf_counter() - t_all
+
+        # Bellek: ayrı, kısa bir geçişte (tracemalloc çağrıları yavaşlatır).
+        tracemalloc.start()
+        for kw in arg_sets[: cfg["mem_calls"]]:
+            str(fn(**kw))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        lat.sort()
+        rows.append({
+            "tool": name,
+            "calls": calls,
+            "ok_rate": ok / calls if calls else 0.0,
+            "mean_ms": 1000 * sum(lat) / len(lat),
+            "p50_ms": 1000 * _pct(lat, 0.50),
+            "p95_ms": 1000 * _pct(lat, 0.95),
+            "p99_ms": 1000 * _pct(lat, 0.99),
+            "throughput_per_s": calls / wall if wall else 0.0,
+            "serialize_us": 1e6 * ser / calls if calls else 0.0,
+            "alloc_peak_kb": peak / 1024,
+        })
+    return {
+        "customers": n,
+        "load_s": load_s,
+        "base_rss_mb": base_rss,
+        "rss_after_load_mb": load_rss,
+        "peak_rss_mb": _rss_mb(),
+        "tools": rows,
+    }
+
+
+def _measure(cfg: Dict[str, Any]) -> Dict[str, Any]:
+    code = f"import json; from agentkit.bench.tools import _child; print(json.dumps(_child(json.loads({json.dumps(cfg)!r}))))"
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if proc.returncode != 0:
+        return {"customers": cfg["customers"], "error": (proc.stderr.strip().splitlines() or [f"exit {proc.returncode}"])[-1]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run(sizes: List[int], calls: int = 200, storage: str = "json", lazy: bool = False, seed: int = 0,
+        compact_every: int = 500, mem_calls: int = 20, tools: Optional[List[str]] = None,
+        workdir: Optional[str] = None) -> Dict[str, Any]:
+    results = []
+    for n in sizes:
+        with tempfile.TemporaryDirectory(prefix="agentkit-bench-", dir=workdir) as d:
+            t0 = time.perf_counter()
+            paths = write_dataset(d, n, seed)
+            gen_s = time.perf_counter() - t0
+            cfg = {**paths, "customers": n, "calls": calls, "storage": storage, "lazy": lazy, "seed": seed,
+                   "compact_every": compact_every, "mem_calls": mem_calls, "tools": tools or []}
+            res = _measure(cfg)
+            res["file_mb"] = os.path.getsize(paths["user_db"]) / 2 ** 20
+            res["generate_s"] = gen_s
+            results.append(res)
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "storage": storage,
+            "lazy": lazy,
+            "calls": calls,
+            "seed": seed,
+            "compact_every": compact_every,
+        },
+        "results": results,
+    }
+
+
+def _print(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+    base = {}
+    for r in (baseline or {}).get("results", []):
+        for t in r.get("tools", []):
+            base[(r["customers"], t["tool"])] = t
+    for r in report["results"]:
+        if "error" in r:
+            print(f"\n{r['customers']} müşteri: HATA: {r['error']}")
+            continue
+        print(f"\n{r['customers']} müşteri ({r['file_mb']:.0f} MB): yükleme {r['load_s']:.2f}s, "
+              f"RSS yükleme sonrası {r['rss_after_load_mb']:.0f} MB, tepe {r['peak_rss_mb']:.0f} MB")
+        head = f"{'tool':<30} {'mean_ms':>9} {'p95_ms':>9} {'calls/s':>10} {'ok':>5} {'alloc_kb':>9} {'ser_us':>7}"
+        print(head + ("  vs_base" if base else ""))
+        for t in r["tools"]:
+            line = (f"{t['tool']:<30} {t['mean_ms']:>9.3f} {t['p95_ms']:>9.3f} {t['throughput_per_s']:>10.0f} "
+                    f"{t['ok_rate']:>5.2f} {t['alloc_peak_kb']:>9.1f} {t.get('serialize_us', 0.0):>7.1f}")
+            b = base.get((r["customers"], t["tool"]))
+            if b and b.get("mean_ms"):
+                line += f"  x{t['mean_ms'] / b['mean_ms']:.2f}"
+            print(line)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Araç katmanı ölçeklenme benchmark'ı")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    ap.add_argument("--calls", type=int, default=200, help="Araç başına çağrı sayısı")
+    ap.add_argument("--storage", choices=["json", "sqlite"], default="json")
+    ap.add_argument("--lazy", action="store_true")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--compact-every", type=int, default=500)
+    ap.add_argument("--mem-calls", type=int, default=20, help="tracemalloc geçişindeki çağrı sayısı")
+    ap.add_argument("--tools", nargs="*", default=None, help="Yalnızca bu araçlar")
+    ap.add_argument("--workdir", default=None)
+    ap.add_argument("--out", default=None, help="Sonuçları JSON olarak kaydet")
+    ap.add_argument("--compare", default=None, help="Önceki sonuç dosyası; ortalama gecikme oranı basılır")
+    args = ap.parse_args(argv)
+
+    report = run(args.sizes, args.calls, args.storage, args.lazy, args.seed, args.compact_every,
+                 args.mem_calls, args.tools, args.workdir)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    _print(report, baseline)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return 1 if any("error" in r for r in report["results"]) else 0
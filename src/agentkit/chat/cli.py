@@ -1,23 +1,54 @@
-import argparse, os
+import argparse, json, os, time
 from agentkit.agent.core import build_agent
+from agentkit.config import settings
+from agentkit.chat.streaming import FinalAnswerPrinter
+from agentkit.tools.metrics import metrics as tool_metrics
+
+def reply(agent, payload, printer=None):
+    """Ajanı çalıştırır; akış açıksa Final Answer yazıldıkça ekrana basılır."""
+    config = None
+    if printer is not None:
+        printer.start()
+        config = {"callbacks": [printer]}
+    t0 = time.perf_counter()
+    resp = agent.invoke(payload, config=config)
+    total = time.perf_counter() - t0
+    text = resp.get("output", "")
+    if printer is not None and printer.streamed:
+        print(f"\n[ilk token {printer.ttft:.2f}s, toplam {total:.2f}s]\n")
+    else:
+        print("\n🔵 Yanıt:\n" + text + "\n")
+        print(f"[toplam {total:.2f}s]\n")
+    return text
 
 def main():
     p = argparse.ArgumentParser()
     p.add_argument("--cpu", action="store_true")
+    p.add_argument("--cpu-engine", choices=["fp32", "bf16", "int8"], default=None,
+                   help="CPU yükleme motoru (varsayılan CPU_ENGINE)")
     p.add_argument("--no-unsloth", action="store_true")
+    p.add_argument("--server", default=None,
+                   help="Modeli yüklemek yerine bu model sunucusuna bağlan (varsayılan AGENTKIT_MODEL_SERVER)")
     p.add_argument("--audio", action="store_true")
     p.add_argument("--asr-model", default="selimc/whisper-large-v3-turbo-turkish")
     p.add_argument("--tts-model", default="tts_models/tr/common-voice/glow-tts")
     p.add_argument("--speaker", default=None)
     p.add_argument("--stt-lang", default="tr")
     p.add_argument("--tts-out", default=None)
+    p.add_argument("--no-stream", action="store_true", help="yanıtı üretim bitince tek seferde yaz")
     args = p.parse_args()
 
     if args.cpu:
         os.environ["FORCE_CPU"] = "1"
         os.environ["CUDA_VISIBLE_DEVICES"] = ""
+        # settings içe aktarılırken okundu; apply() CUDA_VISIBLE_DEVICES'ı bu değerle yeniden yazar.
+        settings.force_cpu = True
+        settings.cuda_visible_devices = ""
+    if args.cpu_engine:
+        settings.cpu.engine = args.cpu_engine
 
-    agent = build_agent(use_unsloth=not args.no_unsloth)
+    agent = build_agent(use_unsloth=not args.no_unsloth, streaming=not args.no_stream, server=args.server)
+    printer = None if args.no_stream else FinalAnswerPrinter()
 
     audio_tool = None
     if args.audio:
@@ -33,7 +64,7 @@ def main():
             print(f"[audio kapalı] {e}")
 
     print("Chat hazır. Çıkış: 'çık' / 'exit' / 'quit'.")
-    print("Ses komutları: '/stt <ses_dosyası>'  '/tts [çıkış.wav]'")
+    print("Ses komutları: '/stt <ses_dosyası>'  '/tts [çıkış.wav]'  Araç ölçümleri: '/metrics [çıkış.json]'")
     first, last_reply = True, ""
 
     while True:
@@ -60,10 +91,8 @@ def main():
                 text = audio_tool.transcribe_audio(in_audio, language=args.stt_lang)
                 print(f"[STT] {text}")
                 payload = {"input": text, "chat_history": []} if first else {"input": text}
-                resp = agent.invoke(payload)
+                last_reply = reply(agent, payload, printer)
                 first = False
-                last_reply = resp.get("output", "")
-                print("\n🔵 Yanıt:\n" + last_reply + "\n")
             except Exception as e:
                 print(f"❌ STT hata: {e}")
             continue
@@ -88,14 +117,23 @@ def main():
                 print(f"❌ TTS hata: {e}")
             continue
 
+        if msg.startswith("/metrics"):
+            parts = msg.split(" ", 1)
+            if len(parts) > 1 and parts[1].strip():
+                with open(parts[1].strip(), "w", encoding="utf-8") as f:
+                    json.dump(tool_metrics.snapshot(), f, ensure_ascii=False, indent=2)
+                print(f"[metrics] kaydedildi → {parts[1].strip()}")
+            else:
+                print(tool_metrics.format_table())
+            continue
+
         if not msg:
             print("⚠️ Boş mesaj.")
             continue
 
-        resp = agent.invoke({"input": msg, "chat_history": []}) if first else agent.invoke({"input": msg})
+        payload = {"input": msg, "chat_history": []} if first else {"input": msg}
+        last_reply = reply(agent, payload, printer)
         first = False
-        last_reply = resp.get("output", "")
-        print("\n🔵 Yanıt:\n" + last_reply + "\n")
 
 if __name__ == "__main__":
     main()
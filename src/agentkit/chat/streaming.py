@@ -0,0 +1,131 @@
+# src/agentkit/chat/streaming.py
+"""Sohbet CLI'ı için akış çıktısı: Final Answer metni üretildikçe yazılır, TTFT ölçülür."""
+from __future__ import annotations
+
+import re
+import sys
+import time
+from typing import Any, Optional, TextIO
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+_ACTION = re.compile(r'"action"\s*:\s*"((?:[^"\\]|\\.)*)"')
+_INPUT = re.compile(r'"action_input"\s*:\s*"')
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+_HEX = frozenset("0123456789abcdefABCDEF")
+
+
+def _hex4(text: str) -> Optional[int]:
+    # int(..., 16) boşluk, işaret ve "_" de kabul eder; \uXXXX tam dört onaltılık rakamdır.
+    return int(text, 16) if len(text) == 4 and _HEX.issuperset(text) else None
+
+
+class FinalAnswerExtractor:
+    """Model çıktısından, yazıldıkça, Final Answer metnini çıkarır."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.buf = ""
+        self.action: Optional[str] = None
+        self.pos: Optional[int] = None  # action_input dizgesinde sıradaki çözülecek karakter
+        self.done = False
+
+    def feed(self, text: str) -> str:
+        """Yeni parçayı ekler; bu parçayla görünür hale gelen metni döner."""
+        if self.done:
+            return ""
+        self.buf += text
+        if self.action is None:
+            m = _ACTION.search(self.buf)
+            if m:
+                self.action = m.group(1)
+        if self.pos is None:
+            m = _INPUT.search(self.buf)
+            if m:
+                self.pos = m.end()
+        if self.action is None or self.pos is None:
+            return ""
+        if self.action.strip().lower() != "final answer":
+            self.done = True
+            return ""
+        return self._decode()
+
+    def _decode(self) -> str:
+        out, buf, i = [], self.buf, self.pos
+        while i < len(buf):
+            ch = buf[i]
+            if ch == '"':
+                self.done = True
+                break
+            if ch != "\\":
+                out.append(ch)
+                i += 1
+                continue
+            if i + 1 >= len(buf):
+                break  # kaçışın devamı henüz gelmedi
+            esc = buf[i + 1]
+            if esc != "u":
+                out.append(_ESCAPES.get(esc, esc))
+                i += 2
+                continue
+            if i + 6 > len(buf):
+                break
+            code = _hex4(buf[i + 2:i + 6])
+            if code is None:
+                out.append("\\u")  # bozuk kaçış: ham metin
+                i += 2
+            elif 0xD800 <= code < 0xDC00:
+                # Vekil çift: ikinci yarı da gelene kadar beklenir.
+                rest = buf[i + 6:i + 12]
+                if len(rest) < 6 and "\\u".startswith(rest[:2]):
+                    break
+                low = _hex4(rest[2:]) if rest.startswith("\\u") else None
+                if low is not None and 0xDC00 <= low < 0xE000:
+                    out.append(chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)))
+                    i += 12
+                else:
+                    out.append("\ufffd")  # eşi olmayan vekil
+                    i += 6
+            elif 0xDC00 <= code < 0xE000:
+                out.append("\ufffd")
+                i += 6
+            else:
+                out.append(chr(code))
+                i += 6
+        self.pos = i
+        return "".join(out)
+
+
+class FinalAnswerPrinter(BaseCallbackHandler):
+    """
+    Final Answer metnini üretildikçe yazar. `start()` her kullanıcı
+    mesajından önce çağrılır; `ttft` ilk görünür karaktere kadar geçen süre
+    (saniye), hiçbir şey akmadıysa None.
+    """
+
+    def __init__(self, out: TextIO = sys.stdout, header: str = "\n🔵 Yanıt:\n"):
+        self.out = out
+        self.header = header
+        self.extractor = FinalAnswerExtractor()
+        self.start()
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self.ttft: Optional[float] = None
+        self.streamed = False
+
+    def on_llm_start(self, serialized: Any, prompts: Any, **kwargs: Any) -> None:
+        self.extractor.reset()
+
+    def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        text = self.extractor.feed(token)
+        if not text:
+            return
+        if not self.streamed:
+            self.ttft = time.perf_counter() - self.started
+            self.streamed = True
+            self.out.write(self.header)
+        self.out.write(text)
+        self.out.flush()
@@ -6,10 +6,14 @@ import logging
 from dataclasses import dataclass, field
 from typing import Dict, Optional
 
-try:
-    import torch
-except Exception:  # torch opsiyonel kurulumlarda import hatası olursa
-    torch = None  # type: ignore
+
+def _torch():
+    # torch yalnızca apply() içinde yüklenir: model sunucusuna bağlanan istemci torch'suz açılır.
+    try:
+        import torch
+    except Exception:  # torch opsiyonel kurulumlarda import hatası olursa
+        return None
+    return torch
 
 
 @dataclass
@@ -28,6 +32,20 @@ class GenerationConfig:
     temperature: float = 0.0
     do_sample: bool = False
     use_cache: bool = True
+    batch_size: int = 8                 # tek generate çağrısındaki en fazla istem
+    batch_tokens: int = 16384           # tek generate çağrısındaki en fazla istem token'ı (dolgu dahil)
+    batch_wait_ms: float = 0.0          # eşzamanlı istemleri toplamak için bekleme
+    stop_on_json: bool = True           # üst düzey JSON nesnesi kapanınca üretimi bitir
+    prefix_cache_mb: float = 1024.0     # önek KV önbelleği üst sınırı (0: kapalı)
+    constrained_json: bool = False      # ajan çıktısını eylem JSON dilbilgisine zorla
+
+
+@dataclass
+class CPUConfig:
+    """`FORCE_CPU` yolunda yükleme motoru ve torch iş parçacıkları."""
+    engine: str = "fp32"                # fp32 | bf16 | int8 (Linear ağırlıkları int8, dinamik aktivasyon)
+    intra_op_threads: int = 0           # tek işlem içi paralellik (0: torch varsayılanı, fiziksel çekirdek)
+    inter_op_threads: int = 0           # bağımsız işlemler arası paralellik (0: torch varsayılanı)
 
 
 @dataclass
@@ -58,6 +76,7 @@ class Settings:
     )
     device: DeviceConfig = field(default_factory=DeviceConfig)
     gen: GenerationConfig = field(default_factory=GenerationConfig)
+    cpu: CPUConfig = field(default_factory=CPUConfig)
 
     def apply(self) -> None:
         """
@@ -77,6 +96,9 @@ class Settings:
             os.environ.get("UNSLOTH_DISABLE_FAST_GENERATION"),
         )
 
+        torch = _torch()
+        if torch is not None and self.force_cpu:
+            self.apply_cpu_threads()
         if torch is not None and not self.force_cpu:
             try:
                 if self.prefer_cuda_default_tensor and torch.cuda.is_available():
@@ -88,6 +110,20 @@ class Settings:
             except Exception as e:
                 logging.getLogger(__name__).warning("Torch default tensor ayarlanamadı: %s", e)
 
+    def apply_cpu_threads(self) -> None:
+        """`CPU_THREADS` / `CPU_INTEROP_THREADS`; inter-op sayısı yalnızca ilk paralel işten önce değiştirilebilir."""
+        torch = _torch()
+        log = logging.getLogger(__name__)
+        if self.cpu.intra_op_threads > 0:
+            torch.set_num_threads(self.cpu.intra_op_threads)
+        if self.cpu.inter_op_threads > 0:
+            try:
+                torch.set_num_interop_threads(self.cpu.inter_op_threads)
+            except RuntimeError as e:
+                log.warning("inter-op iş parçacığı sayısı ayarlanamadı: %s", e)
+        log.info("CPU engine=%s, torch threads intra=%d inter=%d", self.cpu.engine,
+                 torch.get_num_threads(), torch.get_num_interop_threads())
+
     @classmethod
     def from_env(cls) -> "Settings":
         """
@@ -111,6 +147,16 @@ class Settings:
         temperature = float(os.getenv("TEMPERATURE", "0.0"))
         do_sample = os.getenv("DO_SAMPLE", "false").lower() in {"1", "true", "yes"}
         use_cache = os.getenv("USE_CACHE", "true").lower() in {"1", "true", "yes"}
+        batch_size = int(os.getenv("GEN_BATCH_SIZE", "8"))
+        batch_tokens = int(os.getenv("GEN_BATCH_TOKENS", "16384"))
+        batch_wait_ms = float(os.getenv("GEN_BATCH_WAIT_MS", "0"))
+        stop_on_json = os.getenv("GEN_STOP_ON_JSON", "true").lower() in {"1", "true", "yes"}
+        prefix_cache_mb = float(os.getenv("GEN_PREFIX_CACHE_MB", "1024"))
+        constrained_json = os.getenv("GEN_CONSTRAINED_JSON", "false").lower() in {"1", "true", "yes"}
+
+        cpu_engine = os.getenv("CPU_ENGINE", "fp32").lower()
+        intra_op_threads = int(os.getenv("CPU_THREADS", "0"))
+        inter_op_threads = int(os.getenv("CPU_INTEROP_THREADS", "0"))
 
         return cls(
             cuda_visible_devices=os.getenv("CUDA_VISIBLE_DEVICES", "0,1"),
@@ -133,6 +179,17 @@ class Settings:
                 temperature=temperature,
                 do_sample=do_sample,
                 use_cache=use_cache,
+                batch_size=batch_size,
+                batch_tokens=batch_tokens,
+                batch_wait_ms=batch_wait_ms,
+                stop_on_json=stop_on_json,
+                prefix_cache_mb=prefix_cache_mb,
+                constrained_json=constrained_json,
+            ),
+            cpu=CPUConfig(
+                engine=cpu_engine,
+                intra_op_threads=intra_op_threads,
+                inter_op_threads=inter_op_threads,
             ),
         )
 
@@ -0,0 +1,367 @@
+# src/agentkit/grammar.py
+"""Ajan eylem JSON'u için dilbilgisi (kısıtlı çözümleme): `action` kayıtlı araç adı ya da Final Answer,
+`action_input` `function_schemas`'tan.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+FINAL = "Final Answer"
+_HEX = set("0123456789abcdefABCDEF")
+_DIGITS = set("0123456789")
+_GENERIC: Dict[str, Any] = {}  # şemasız (serbest) JSON değeri
+
+
+def _trie(options: Iterable[str]) -> dict:
+    """Seçenek dizgeleri → karakter ağacı; yapraklarda "" anahtarı seçeneğin kendisini tutar."""
+    root: dict = {}
+    for opt in options:
+        node = root
+        for ch in opt:
+            node = node.setdefault(ch, {})
+        node[""] = opt
+    return root
+
+
+class GrammarState:
+    """Tek bir üretimin dilbilgisi durumu; çerçeveler değişmez demetler, `copy()` yalnızca yığını kopyalar."""
+
+    __slots__ = ("stack",)
+
+    def __init__(self, stack: List[tuple]):
+        self.stack = stack
+
+    def copy(self) -> "GrammarState":
+        return GrammarState(list(self.stack))
+
+    @property
+    def done(self) -> bool:
+        return not self.stack
+
+    def accepts(self, text: str) -> bool:
+        """`text` bu durumdan sonra geçerli mi (durum değişmez)."""
+        if not text:
+            return False
+        probe = self.copy()
+        return all(probe.feed(ch) for ch in text)
+
+    def advance(self, text: str) -> None:
+        for ch in text:
+            if not self.feed(ch):
+                raise ValueError(f"dilbilgisine uymayan karakter: {ch!r}")
+
+    def forced(self) -> str:
+        """Durumdan itibaren tek seçenekli karakterler (modele sorulmadan eklenebilir); durum değişmez."""
+        out: List[str] = []
+        probe = self.copy()
+        while probe.stack:
+            opts = probe._next_chars()
+            if opts is None or len(opts) != 1:
+                break
+            ch = next(iter(opts))
+            probe.feed(ch)
+            out.append(ch)
+        return "".join(out)
+
+    def closing(self) -> str:
+        """Durumu en kısa yoldan bitiren metin (bütçe dolarken zorla kapatmak için); durum değişmez."""
+        out: List[str] = []
+        probe = self.copy()
+        while probe.stack:
+            top = probe.stack[-1]
+            if top[0] == "choice":
+                # Seçenek sonrası çerçeveleri değiştirdiğinden (ör. eylemin argüman şeması) her biri denenir.
+                best = None
+                for rest in _suffixes(top[1]):
+                    p = probe.copy()
+                    p.advance(rest)
+                    text = rest + p.closing()
+                    if best is None or len(text) < len(best):
+                        best = text
+                out.append(best or "")
+                break
+            if top[0] == "num" and top[1] in (2, 4, 5):
+                probe.stack.pop()  # sayı burada bitebilir
+                continue
+            text = probe._shortest()
+            probe.advance(text)
+            out.append(text)
+        return "".join(out)
+
+    def _shortest(self) -> str:
+        """Tepe çerçeve için en kısa ilerleme (seçim çerçevesi hariç)."""
+        top = self.stack[-1]
+        kind = top[0]
+        if kind == "lit":
+            return top[1][top[2]:]
+        if kind == "str":
+            return '"' if top[1] == 0 else "n" if top[1] == -1 else "0" * top[1]
+        if kind == "num":
+            return "0"
+        if kind == "val":
+            return _shortest_value(top[1])
+        if kind == "arr":
+            state = top[2]
+            return "[" if state == "open" else " " if state == "comma" else \
+                _shortest_value(top[1]) if state == "item" else "]"
+        _, props, required, _, state = top
+        if state == "open":
+            return "{"
+        if state == "comma":
+            return " "
+        if required:
+            # Zorunlu anahtarların sırası uzunluğu değiştirmez.
+            return (", " if state == "sep" else "") + f'"{min(required)}": '
+        if state in ("first", "sep"):
+            return "}"
+        return '"'
+
+    # ----------------------- çerçeveler -----------------------
+    def _next_chars(self) -> Optional[set]:
+        """Sıradaki olası karakterler; serbest metin ya da bitebilen sayı için None."""
+        top = self.stack[-1]
+        kind = top[0]
+        if kind == "lit":
+            return {top[1][top[2]]}
+        if kind == "choice":
+            return {ch for ch in top[1] if ch}
+        if kind == "obj":
+            _, props, required, _, state = top
+            if state == "open":
+                return {"{"}
+            if state == "first":
+                return ({'"'} if props is None or props else set()) | (set() if required else {"}"})
+            if state == "sep":
+                return ({","} if props is None or props else set()) | (set() if required else {"}"})
+            if state == "comma":
+                return {" "}
+            return {'"'}
+        if kind == "val":
+            t = top[1].get("type")
+            if "enum" in top[1] or t in ("boolean", "integer", "number") or top[1] is _GENERIC:
+                return None
+            return {'"'} if t == "string" else {"{"} if t == "object" else None
+        return None
+
+    def _push_value(self, schema: Dict[str, Any]) -> None:
+        self.stack.append(("val", schema))
+
+    def feed(self, ch: str) -> bool:
+        stack = self.stack
+        while stack:
+            top = stack[-1]
+            kind = top[0]
+            if kind == "lit":
+                _, text, i = top
+                if ch != text[i]:
+                    return False
+                if i + 1 == len(text):
+                    stack.pop()
+                else:
+                    stack[-1] = ("lit", text, i + 1)
+                return True
+            if kind == "str":
+                esc = top[1]
+                if esc == 0:
+                    if ch == '"':
+                        stack.pop()
+                    elif ch == "\\":
+                        stack[-1] = ("str", -1)
+                    elif ord(ch) < 0x20:
+                        return False
+                    return True
+                if esc == -1:
+                    if ch == "u":
+                        stack[-1] = ("str", 4)
+                    elif ch in '"\\/bfnrt':
+                        stack[-1] = ("str", 0)
+                    else:
+                        return False
+                    return True
+                if ch not in _HEX:
+                    return False
+                stack[-1] = ("str", esc - 1 if esc > 1 else 0)
+                return True
+            if kind == "choice":
+                _, node, done = top
+                nxt = node.get(ch) if ch else None
+                if nxt is None:
+                    return False
+                if "" in nxt:
+                    stack.pop()
+                    done(self, nxt[""])
+                else:
+                    stack[-1] = ("choice", nxt, done)
+                return True
+            if kind == "num":
+                # 0: başlangıç, 1: "-" sonrası, 2: tam kısım, 3: "." sonrası, 4: kesir, 5: baştaki tek "0"
+                _, phase, integer = top
+                if ch in _DIGITS and phase != 5:
+                    stack[-1] = ("num", (5 if ch == "0" else 2) if phase < 2 else 4 if phase >= 3 else 2, integer)
+                    return True
+                if phase == 0 and ch == "-":
+                    stack[-1] = ("num", 1, integer)
+                    return True
+                if phase in (2, 5) and ch == "." and not integer:
+                    stack[-1] = ("num", 3, integer)
+                    return True
+                if phase in (2, 4, 5):
+                    stack.pop()  # sayı bitti; karakter alttaki çerçeveye
+                    continue
+                return False
+            if kind == "val":
+                stack.pop()
+                schema = top[1]
+                if "enum" in schema:
+                    stack.append(("choice", _trie(json.dumps(v, ensure_ascii=False) for v in schema["enum"]),
+                                  _noop))
+                    continue
+                t = schema.get("type") if schema is not _GENERIC else None
+                if t == "string" or (t is None and ch == '"'):
+                    stack.append(("str", 0))
+                    if ch != '"':
+                        return False
+                    return True
+                if t in ("integer", "number") or (t is None and (ch == "-" or ch in _DIGITS)):
+                    stack.append(("num", 0, t == "integer"))
+                    continue
+                if t == "boolean" or (t is None and ch in "tfn"):
+                    stack.append(("choice", _trie(["true", "false"] if t == "boolean" else ["true", "false", "null"]),
+                                  _noop))
+                    continue
+                if t == "object" or (t is None and ch == "{"):
+                    props = schema.get("properties")
+                    stack.append(("obj", dict(props) if props else None, frozenset(schema.get("required") or ()),
+                                  schema, "open"))
+                    continue
+                if t == "array" or (t is None and ch == "["):
+                    stack.append(("arr", schema.get("items") or _GENERIC, "open"))
+                    continue
+                return False
+            if kind == "arr":
+                _, items, state = top
+                if state == "open":
+                    if ch != "[":
+                        return False
+                    stack[-1] = ("arr", items, "first")
+                    return True
+                if state == "first" and ch == "]":
+                    stack.pop()
+                    return True
+                if state in ("first", "item"):
+                    stack[-1] = ("arr", items, "sep")
+                    self._push_value(items)
+                    continue
+                if state == "sep":
+                    if ch == "]":
+                        stack.pop()
+                        return True
+                    if ch == ",":
+                        stack[-1] = ("arr", items, "comma")
+                        return True
+                    return False
+                if state == "comma":
+                    if ch != " ":
+                        return False
+                    stack[-1] = ("arr", items, "item")
+                    return True
+            if kind == "obj":
+                _, props, required, schema, state = top
+                if state == "open":
+                    if ch != "{":
+                        return False
+                    stack[-1] = ("obj", props, required, schema, "first")
+                    return True
+                if ch == "}" and state in ("first", "sep") and not required:
+                    stack.pop()
+                    return True
+                if state == "sep":
+                    if ch != "," or props == {}:
+                        return False
+                    stack[-1] = ("obj", props, required, schema, "comma")
+                    return True
+                if state == "comma":
+                    if ch != " ":
+                        return False
+                    stack[-1] = ("obj", props, required, schema, "key")
+                    return True
+                # "first" / "key": anahtar başlıyor
+                if ch != '"':
+                    return False
+                if props is None:
+                    stack[-1] = ("obj", None, required, schema, "sep")
+                    stack += [("val", _GENERIC), ("lit", ": ", 0), ("str", 0)]
+                    return True
+                if not props:
+                    return False
+                stack[-1] = ("obj", props, required, schema, "sep")
+                stack.append(("choice", _trie(f'{k}": ' for k in props), _key_chosen))
+                return True
+            raise AssertionError(kind)
+        return False
+
+
+def _suffixes(node: dict, prefix: str = "") -> Iterable[str]:
+    for ch, nxt in node.items():
+        if ch:
+            yield from ([prefix + ch] if "" in nxt else _suffixes(nxt, prefix + ch))
+
+
+def _shortest_value(schema: Dict[str, Any]) -> str:
+    if "enum" in schema:
+        return min((json.dumps(v, ensure_ascii=False) for v in schema["enum"]), key=len)
+    t = schema.get("type") if schema is not _GENERIC else None
+    return {"string": '""', "boolean": "true", "object": "{", "array": "[", None: "0"}.get(t, "0")
+
+
+def _noop(state: GrammarState, option: str) -> None:
+    pass
+
+
+def _key_chosen(state: GrammarState, option: str) -> None:
+    # Seçim çerçevesi çıkarıldı; altta nesne çerçevesi var.
+    key = option[:-3]
+    _, props, required, schema, st = state.stack[-1]
+    rest = {k: v for k, v in props.items() if k != key}
+    state.stack[-1] = ("obj", rest, required - {key}, schema, st)
+    state._push_value(props[key] or _GENERIC)
+
+
+class ActionGrammar:
+    """Eylem adı → `action_input` şeması; her üretim için `start()` ile yeni durum."""
+
+    def __init__(self, actions: Dict[str, Dict[str, Any]]):
+        self.actions = dict(actions)
+        self._names = _trie(f'{name}"' for name in self.actions)
+        # Bütçenin sonunda kapanışa ayrılan pay (karakter): eylem seçildikten sonraki en uzun kapanış
+        # + yarım anahtar/kaçış payı. Token sayısı karakter sayısını pek aşmaz.
+        self.reserve = 32
+        for name in self.actions:
+            state = self.start()
+            state.advance(f'{{"thought": "", "action": "{name}"')
+            self.reserve = max(self.reserve, len(state.closing()) + 32)
+
+    @classmethod
+    def from_tools(cls, names: Sequence[str], schemas: Optional[Sequence[Dict[str, Any]]] = None) -> "ActionGrammar":
+        """Araç adları (şemalar varsayılan olarak `function_schemas`) + Final Answer."""
+        if schemas is None:
+            from agentkit.tools.schemas import function_schemas as schemas
+        by_name = {s["name"]: s.get("parameters") or {"type": "object"} for s in schemas}
+        actions = {name: by_name.get(name, {"type": "object"}) for name in names}
+        actions[FINAL] = {"type": "string"}
+        return cls(actions)
+
+    def start(self) -> GrammarState:
+        # Yığının sonu önce işlenir.
+        return GrammarState([
+            ("choice", self._names, self._action_chosen),
+            ("lit", ', "action": "', 0),
+            ("str", 0),
+            ("lit", '{"thought": "', 0),
+        ])
+
+    def _action_chosen(self, state: GrammarState, option: str) -> None:
+        schema = self.actions[option[:-1]]
+        state.stack += [("lit", "}", 0), ("val", schema), ("lit", ', "action_input": ', 0)]
+
@@ -1,10 +1,17 @@
 # src/agentkit/kpi/evaluator.py
 import io, json, time, pathlib, contextlib
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Tuple, Optional
 import numpy as np
 import pandas as pd
+from langchain_core.exceptions import OutputParserException
 from sentence_transformers import SentenceTransformer, util
 
+from agentkit.agent.core import with_fresh_memory
+from agentkit.usage import usage as llm_usage
+from agentkit.tools import api_functions as api
+from agentkit.tools.cache import cache_for
+
 class KPIEvaluator:
     def __init__(self, agent_executor, emb_model_name: str = "trmteb/turkish-embedding-model", similarity_threshold: float = 0.65):
         self.agent = agent_executor
@@ -83,41 +90,63 @@ class KPIEvaluator:
         data = json.loads(raw.decode("utf-8-sig", errors="replace"))
         return data if isinstance(data, list) else [data]
 
-    def evaluate(self, scn: Dict, verbose: bool = False) -> Dict[str, Any]:
+    def evaluate(self, scn: Dict, verbose: bool = False, agent=None, capture_stdout: bool = True) -> Dict[str, Any]:
+        agent = agent or self.agent
         scn_id = scn.get("id") or scn.get("name") or "SCENARIO"
         conversations = scn.get("conversations", [])
         critical = scn.get("critical_steps", []) or []
         gold_tools, gold_finals = self._load_gold_from_scenario(scn)
         expected_tools = critical if critical else gold_tools
 
+        cache = cache_for(api._backend())
+        cache_before = cache.stats()
+        usage_before = llm_usage()
         latencies, stdout_chunks = [], []
+        agent_tools, agent_finals, tool_results = [], [], []
+        structured = True
         first = True
+        # Ayrıştırılamayan model çıktısı ya da kayıtlı olmayan araç adı: yürütücüde boşa giden bir tur.
+        parse_failures = 0
+        tool_names = {t.name for t in getattr(agent, "tools", [])}
         for step in conversations:
             if step.get("role") != "user": continue
             user_msg = step.get("content", "")
             t0 = time.time()
             buf = io.StringIO()
+            resp = None
             try:
-                with contextlib.redirect_stdout(buf):
+                # sys.stdout süreç geneli: paralel çalışmada yakalanmaz, ara adımlar kullanılır.
+                with contextlib.redirect_stdout(buf) if capture_stdout else contextlib.nullcontext():
                     if first:
-                        resp = self.agent.invoke({"input": user_msg, "chat_history": []})
+                        resp = agent.invoke({"input": user_msg, "chat_history": []})
                         first = False
                     else:
-                        resp = self.agent.invoke({"input": user_msg})
-            except Exception:
-                pass
+                        resp = agent.invoke({"input": user_msg})
+            except Exception as e:
+                # AgentExecutor ayrıştırma hatasını ValueError içinde yeniden fırlatır.
+                if isinstance(e, OutputParserException) or isinstance(e.__context__, OutputParserException):
+                    parse_failures += 1
             t1 = time.time()
             latencies.append(max(0.001, t1 - t0))
             stdout_chunks.append(buf.getvalue())
+            # Ara adımlar (AgentAction, gözlem) varsa araç çağrıları ve sonuçları doğrudan okunur.
+            if isinstance(resp, dict) and "intermediate_steps" in resp:
+                for action, observation in resp["intermediate_steps"]:
+                    agent_tools.append(getattr(action, "tool", None))
+                    if tool_names and getattr(action, "tool", None) not in tool_names:
+                        parse_failures += 1
+                    tool_results.append(observation)
+                agent_finals.append({"action": "Final Answer", "action_input": resp.get("output")})
+            elif resp is not None:
+                structured = False
 
-        combined = "\n".join(stdout_chunks)
-        objs = self._extract_json_objects(combined)
-        agent_tools, agent_finals = [], []
-        for obj in objs:
-            action = obj.get("action")
-            if not action: continue
-            if self._norm(action) == "final answer": agent_finals.append(obj)
-            else: agent_tools.append(action)
+        if not structured:
+            agent_tools, agent_finals = [], []
+            for obj in self._extract_json_objects("\n".join(stdout_chunks)):
+                action = obj.get("action")
+                if not action: continue
+                if self._norm(action) == "final answer": agent_finals.append(obj)
+                else: agent_tools.append(action)
 
         correct, total_calls, scenario_ok = self._sequential_tool_match(agent_tools, expected_tools)
         tool_success = (correct / total_calls) if total_calls > 0 else np.nan
@@ -127,4 +156,61 @@ class KPIEvaluator:
         for g, p in pairs:
             if g or p:
                 try: sims.append(self._cosine(g, p))
-                except Excep
+                except Exception: pass
+        semantic = float(np.mean(sims)) if sims else np.nan
+        tool_ok = [r.get("success") for r in tool_results if isinstance(r, dict)]
+        # Senaryo (oturum) boyunca salt okunur araç önbelleğinin isabet oranı.
+        cache_after = cache.stats()
+        hits = cache_after["hits"] - cache_before["hits"]
+        lookups = hits + cache_after["misses"] - cache_before["misses"]
+        # İstem boyutu (araç seçimi açık/kapalı karşılaştırması için); sayaçlar iş parçacığına özeldir.
+        usage_after = llm_usage()
+        llm_calls = usage_after["calls"] - usage_before["calls"]
+        prompt_tokens = usage_after["prompt_tokens"] - usage_before["prompt_tokens"]
+        generated_tokens = usage_after["generated_tokens"] - usage_before["generated_tokens"]
+
+        row = {
+            "scenario_id": scn_id,
+            "expected_tools": ", ".join(expected_tools),
+            "agent_tools": ", ".join(t or "" for t in agent_tools),
+            "tool_success_rate": tool_success,
+            "scenario_success": bool(scenario_ok),
+            "semantic_similarity": semantic,
+            "semantic_success": bool(sims) and semantic >= self.th,
+            "tool_result_ok_rate": (sum(map(bool, tool_ok)) / len(tool_ok)) if tool_ok else np.nan,
+            "tool_cache_hit_rate": (hits / lookups) if lookups else np.nan,
+            "llm_calls": llm_calls,
+            "prompt_tokens_mean": (prompt_tokens / llm_calls) if llm_calls else np.nan,
+            "generated_tokens_mean": (generated_tokens / llm_calls) if llm_calls else np.nan,
+            "parse_failures": parse_failures,
+            "parse_failure_rate": (parse_failures / llm_calls) if llm_calls else np.nan,
+            "response_time_mean": float(np.mean(latencies)) if latencies else np.nan,
+            "total_response_time": float(np.sum(latencies)) if latencies else 0.0,
+        }
+        if verbose:
+            print(f"[{scn_id}] araçlar: {row['agent_tools'] or '-'} | beklenen: {row['expected_tools'] or '-'} | "
+                  f"isabet: {tool_success} | benzerlik: {semantic}")
+        return row
+
+    def run(self, path: str, save_csv: Optional[str] = None, verbose: bool = False, isolate: bool = True,
+            workers: int = 1) -> pd.DataFrame:
+        """Senaryoları boş bellekle ve (`isolate`) veri kümesinin çatalında, `workers` iş parçacığında koşar."""
+        base = api._backend() if isolate else None
+
+        def one(scn: Dict) -> Dict[str, Any]:
+            agent = with_fresh_memory(self.agent)
+            if base is None:
+                return self.evaluate(scn, verbose=verbose, agent=agent, capture_stdout=workers <= 1)
+            with api.use_backend(base.fork()):
+                return self.evaluate(scn, verbose=verbose, agent=agent, capture_stdout=workers <= 1)
+
+        scenarios = self._load_scenarios(path)
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kpi") as ex:
+                rows = list(ex.map(one, scenarios))
+        else:
+            rows = [one(scn) for scn in scenarios]
+        df = pd.DataFrame(rows)
+        if save_csv:
+            df.to_csv(save_csv, index=False, encoding="utf-8")
+        return df
@@ -0,0 +1,151 @@
+# src/agentkit/kv_cache.py
+"""Önek KV önbelleği: tekil çağrılarda istemin daha önce görülmüş önekinin KV tensörleri yeniden kullanılır."""
+from __future__ import annotations
+
+import copy
+import weakref
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def cache_nbytes(cache: Any) -> int:
+    """`DynamicCache` katmanlarındaki anahtar/değer tensörlerinin toplam boyutu."""
+    total = 0
+    for layer in getattr(cache, "layers", ()):
+        for name in ("keys", "values"):
+            t = getattr(layer, name, None)
+            if t is not None and hasattr(t, "nbytes"):
+                total += t.nbytes
+    return total
+
+
+def _sliding(cache: Any) -> bool:
+    return any(getattr(layer, "is_sliding", False) for layer in getattr(cache, "layers", ()))
+
+
+def prefix_copy(cache: Any, n: int) -> Any:
+    """Her katmanın ilk `n` konumunun kopyası (yeni `DynamicCache`); kaynak değişmez."""
+    past = copy.copy(cache)
+    past.layers = []
+    for layer in cache.layers:
+        new = copy.copy(layer)
+        if getattr(layer, "keys", None) is not None:
+            new.keys = layer.keys[..., :n, :].clone()
+            new.values = layer.values[..., :n, :].clone()
+        past.layers.append(new)
+    return past
+
+
+class PrefixKVCache:
+    """Token öneki → geçmiş KV; LRU, bayt sınırlı, iş parçacığı güvenli."""
+
+    def __init__(self, max_bytes: int, min_prefix: int = 16):
+        self.max_bytes = max_bytes
+        self.min_prefix = min_prefix  # bundan kısa ortak önekler için kopyalamaya değmez
+        self._entries: "OrderedDict[int, Tuple[np.ndarray, Any, int]]" = OrderedDict()
+        self._next = 0
+        self._bytes = 0
+        # Verilen kopyalar (generate'te kullanılıyor): saklanana ya da atılana kadar sınıra dahil.
+        self._lent = 0
+        self._loans: Dict[int, Any] = {}
+        # RLock: kopyanın çöp toplayıcı sonlandırıcısı kilidi tutan iş parçacığında çalışabilir.
+        self._lock = threading.RLock()
+        self.hits = self.misses = self.reused_tokens = self.prefilled_tokens = 0
+
+    @staticmethod
+    def _common(a: np.ndarray, b: np.ndarray) -> int:
+        n = min(len(a), len(b))
+        diff = np.flatnonzero(a[:n] != b[:n])
+        return int(diff[0]) if len(diff) else n
+
+    def lookup(self, ids: Sequence[int]) -> Tuple[Optional[Any], int]:
+        """
+        (önbellek kopyası, yeniden kullanılan token sayısı). Kopya `generate`
+        tarafından genişletilebilir; saklanan girdi değişmez. Eşleşme yoksa
+        (None, 0).
+        """
+        query = np.asarray(ids, dtype=np.int64)
+        # En az bir token prefill edilmeli: model son token'ın çıktısını üretir.
+        limit = len(query) - 1
+        with self._lock:
+            best, best_len = None, 0
+            for key, (tokens, cache, _) in self._entries.items():
+                n = min(self._common(tokens, query), limit)
+                if n > best_len:
+                    best, best_len = key, n
+            if best is None or best_len < self.min_prefix:
+                self.misses += 1
+                self.prefilled_tokens += len(query)
+                return None, 0
+            self._entries.move_to_end(best)
+            tokens, cache, size = self._entries[best]
+            self.hits += 1
+            self.reused_tokens += best_len
+            self.prefilled_tokens += len(query) - best_len
+            lent = size * best_len // max(len(tokens), 1)
+            self._lent += lent
+            self._evict()
+        # Saklanan girdi değişmez: kopya kilit dışında, girdi atılsa da tuttuğumuz referanstan alınır.
+        try:
+            past = prefix_copy(cache, best_len)
+        except BaseException:
+            with self._lock:
+                self._lent -= lent
+            raise
+        with self._lock:
+            self._loans[id(past)] = weakref.finalize(past, self._release, id(past), lent)
+        return past, best_len
+
+    def _release(self, key: int, nbytes: int) -> None:
+        with self._lock:
+            self._lent -= nbytes
+            self._loans.pop(key, None)
+
+    def _evict(self) -> None:
+        while self._bytes + self._lent > self.max_bytes and self._entries:
+            self._bytes -= self._entries.popitem(last=False)[1][2]
+
+    def store(self, ids: Sequence[int], cache: Any) -> None:
+        """`ids`: önbellekte KV'si bulunan token'lar (`cache.get_seq_length()` kadar)."""
+        with self._lock:
+            loan = self._loans.get(id(cache))
+        if loan is not None:
+            loan()  # kopya artık girdi olarak sayılacak
+        tokens = np.asarray(ids, dtype=np.int64)
+        size = cache_nbytes(cache)
+        # Kayan pencereli katmanlarda ilk n konum, dizinin ilk n token'ı olmayabilir.
+        if size > self.max_bytes or len(tokens) < self.min_prefix or _sliding(cache):
+            return
+        with self._lock:
+            # Yeni girdinin kapsadığı (öneki olan) eski girdiler gereksiz.
+            for key in [k for k, (t, _, _) in self._entries.items()
+                        if len(t) <= len(tokens) and self._common(t, tokens) == len(t)]:
+                self._bytes -= self._entries.pop(key)[2]
+            self._entries[self._next] = (tokens, cache, size)
+            self._next += 1
+            self._bytes += size
+            self._evict()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            total = self.reused_tokens + self.prefilled_tokens
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "reused_tokens": self.reused_tokens,
+                "prefilled_tokens": self.prefilled_tokens,
+                "reuse_rate": self.reused_tokens / total if total else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "lent_bytes": self._lent,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
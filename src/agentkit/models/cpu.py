@@ -0,0 +1,57 @@
+# src/agentkit/models/cpu.py
+"""CPU yükleme motorları (`FORCE_CPU` / `--cpu`, `CPU_ENGINE`: fp32, bf16, dinamik int8)."""
+from __future__ import annotations
+
+import logging
+from typing import Any, Tuple
+
+ENGINES = ("fp32", "bf16", "int8")
+
+log = logging.getLogger(__name__)
+
+
+def _conv1d_to_linear(model: Any) -> int:
+    """`transformers` `Conv1D` (ağırlık [in, out]) → `nn.Linear` (ağırlık [out, in]); çevrilen katman sayısı."""
+    import torch
+    from transformers.pytorch_utils import Conv1D
+
+    targets = [(name, mod) for name, mod in model.named_modules() if isinstance(mod, Conv1D)]
+    for name, mod in targets:
+        parent_name, _, attr = name.rpartition(".")
+        parent = model.get_submodule(parent_name) if parent_name else model
+        in_f, out_f = mod.weight.shape
+        lin = torch.nn.Linear(in_f, out_f, bias=mod.bias is not None)
+        with torch.no_grad():
+            lin.weight.copy_(mod.weight.t())
+            if mod.bias is not None:
+                lin.bias.copy_(mod.bias)
+        setattr(parent, attr, lin)
+    return len(targets)
+
+
+def quantize_int8(model: Any) -> Any:
+    """`nn.Linear` katmanlarını dinamik int8'e çevirir (yerinde); modeli döner."""
+    import torch
+
+    if "fbgemm" not in torch.backends.quantized.supported_engines and \
+            "x86" not in torch.backends.quantized.supported_engines:
+        torch.backends.quantized.engine = "qnnpack"  # ARM
+    converted = _conv1d_to_linear(model)
+    torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    log.info("int8 dinamik niceleme: %d Conv1D katmanı Linear'a çevrildi", converted)
+    return model
+
+
+def load_cpu(name: str, engine: str = "fp32") -> Tuple[Any, Any]:
+    """(model, tokenizer); model `eval()` modunda ve CPU'da."""
+    import torch
+    from transformers import AutoModelForCausalLM, AutoTokenizer
+
+    if engine not in ENGINES:
+        raise ValueError(f"Bilinmeyen CPU_ENGINE: {engine!r} (seçenekler: {', '.join(ENGINES)})")
+    tok = AutoTokenizer.from_pretrained(name)
+    dtype = torch.bfloat16 if engine == "bf16" else torch.float32
+    mdl = AutoModelForCausalLM.from_pretrained(name, torch_dtype=dtype, low_cpu_mem_usage=True).eval()
+    if engine == "int8":
+        quantize_int8(mdl)
+    return mdl, tok
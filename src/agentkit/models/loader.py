@@ -8,6 +8,10 @@ class ModelLoader:
 
     def load(self, model_name=None, use_unsloth=True):
         name = model_name or self.cfg.model_name
+        if self.cfg.force_cpu:
+            # unsloth ve 4bit yükleme GPU ister; CPU'da `CPU_ENGINE` motoru kullanılır.
+            from agentkit.models.cpu import load_cpu
+            return load_cpu(name, self.cfg.cpu.engine)
         if use_unsloth:
             from unsloth import FastLanguageModel
             model, tokenizer = FastLanguageModel.from_pretrained(
@@ -35,4 +39,9 @@ class ModelLoader:
             max_new_tokens=self.cfg.gen.max_new_tokens,
             temperature=self.cfg.gen.temperature,
             do_sample=self.cfg.gen.do_sample,
+            batch_size=self.cfg.gen.batch_size,
+            batch_tokens=self.cfg.gen.batch_tokens,
+            batch_wait_ms=self.cfg.gen.batch_wait_ms,
+            stop_on_json=self.cfg.gen.stop_on_json,
+            prefix_cache_mb=self.cfg.gen.prefix_cache_mb,
         )
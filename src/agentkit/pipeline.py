@@ -1,7 +1,21 @@
 # src/agentkit/pipeline.py
+import time
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
 import torch
 
+from agentkit.kv_cache import PrefixKVCache
+from agentkit.usage import record as record_usage
+
+Stops = Optional[Sequence[str]]
+
+
 class CustomTextGenerationPipeline:
+    """`model.generate` sarmalayıcısı; istemleri toplu üretir, `submit` ile eşzamanlı çağrıları birleştirir."""
+
     def __init__(
         self,
         model,
@@ -12,6 +26,12 @@ class CustomTextGenerationPipeline:
         do_sample: bool = False,
         return_full_text: bool = False,
         device: str | None = None,
+        batch_size: int = 8,
+        batch_tokens: int = 16384,
+        batch_wait_ms: float = 0.0,
+        stop_on_json: bool = True,
+        prefix_cache_mb: float = 1024.0,
+        grammar=None,
     ):
         self.model = model
         self.tokenizer = tokenizer
@@ -21,26 +41,455 @@ class CustomTextGenerationPipeline:
         self.do_sample = do_sample
         self.return_full_text = return_full_text
         self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+        self.batch_size = max(1, batch_size)
+        self.batch_tokens = batch_tokens
+        self.batch_wait_ms = batch_wait_ms
+        self.stop_on_json = stop_on_json
+        self.grammar = grammar
+        self._pieces: Dict[int, str] = {}
+        self._forced: Dict[str, Optional[List[int]]] = {}
+        self.prefix_cache = PrefixKVCache(int(prefix_cache_mb * 2**20)) if prefix_cache_mb > 0 else None
+        # Yalnızca decoder modeller: dolgu solda olmalı ki üretim her satırda istemin hemen ardından başlasın.
+        self.tokenizer.padding_side = "left"
+        # İstem `max_length`'i aşarsa en eski bağlam kesilsin, üretimin devam ettiği son tur değil.
+        self.tokenizer.truncation_side = "left"
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._worker: threading.Thread | None = None
+        self._worker_lock = threading.Lock()
+        self._tok_lock = threading.Lock()
+        self._gen_lock = threading.Lock()
+        # Token metinleri önlerine bu token konarak çözülür (SentencePiece baştaki boşluğu düşürmesin).
+        self._anchor = self.tokenizer("a", add_special_tokens=False)["input_ids"][-1]
+        self._anchor_text = self.tokenizer.decode([self._anchor], clean_up_tokenization_spaces=False)
+
+    def _encode(self, prompts: List[str]) -> List[List[int]]:
+        # Hızlı tokenizer'lar kesme/dolgu ayarını çağrı sırasında değiştirir; eşzamanlı çağrı güvenli değil.
+        with self._tok_lock:
+            return self.tokenizer(prompts, truncation=True, max_length=self.max_length)["input_ids"]
+
+    def _fits(self, batch: List[List[int]], ids: List[int], batch_size: int | None = None) -> bool:
+        longest = max([len(ids)] + [len(b) for b in batch])
+        return len(batch) < (batch_size or self.batch_size) and longest * (len(batch) + 1) <= self.batch_tokens
+
+    def _piece(self, token_id: int) -> str:
+        """Tek token'ın metni (önbellekli); durdurma ölçütü ve kısıtlı çözümleme için."""
+        text = self._pieces.get(token_id)
+        if text is None:
+            text = self.tokenizer.decode([self._anchor, token_id], skip_special_tokens=True,
+                                         clean_up_tokenization_spaces=False)[len(self._anchor_text):]
+            self._pieces[token_id] = text
+        return text
+
+    def _stopping(self, prompt_len: int, stops: Sequence[Stops]) -> list:
+        if not self.stop_on_json and not any(stops):
+            return []
+        return [_StopCriteria(self._piece, prompt_len, stops, self.stop_on_json)]
+
+    def _past(self, batch: List[List[int]]):
+        """Tek satırlı çağrıda önbellekten (ya da boş) `DynamicCache`; önbellek kapalıysa veya toplu çağrıda None."""
+        if self.prefix_cache is None or len(batch) != 1:
+            return None
+        from transformers import DynamicCache
+
+        past, _ = self.prefix_cache.lookup(batch[0])
+        return past if past is not None else DynamicCache(config=self.model.config)
+
+    def _remember(self, row, past) -> None:
+        # Önbellekte son üretilen token hariç tüm dizinin KV'si var.
+        self.prefix_cache.store(row[:past.get_seq_length()].tolist(), past)
+
+    # ----------------------- kısıtlı çözümleme -----------------------
+    def _forced_ids(self, text: str) -> Optional[List[int]]:
+        """Zorunlu metnin token'ları; token metinleri art arda `text` etmiyorsa None (token token üretilir)."""
+        if text not in self._forced:
+            found = None
+            for ids in (self.tokenizer(text, add_special_tokens=False)["input_ids"],
+                        self.tokenizer(self._anchor_text + text, add_special_tokens=False)["input_ids"][1:]):
+                # Çıktının ortasına eklenecek: SentencePiece'in başa koyduğu boşluk da sayılır.
+                if ids and "".join(self._piece(t) for t in ids) == text:
+                    found = ids
+                    break
+            self._forced[text] = found
+        return self._forced[text]
+
+    def _closing_ids(self, text: str) -> Optional[List[int]]:
+        ids = self._forced_ids(text)
+        if ids is None and text:
+            chars = [self._forced_ids(ch) for ch in text]
+            ids = None if None in chars else [t for part in chars for t in part]
+        return ids
+
+    def _closing_len(self, state) -> int:
+        text = state.closing()
+        ids = self._closing_ids(text)
+        return len(text) if ids is None else len(ids)
+
+    def _pick(self, logits, state, fits=None) -> Optional[int]:
+        """Dilbilgisine (ve `fits` verilmişse bütçeye) uyan en olası token (örneklemede ilk 64 geçerli aday)."""
+        def ok(t: int) -> bool:
+            piece = self._piece(t)
+            if not state.accepts(piece):
+                return False
+            if fits is None:
+                return True
+            probe = state.copy()
+            probe.advance(piece)
+            return fits(probe)
+
+        if self.do_sample and self.temperature > 0:
+            top = torch.topk(logits, min(64, logits.shape[-1]))
+            good = [i for i, t in enumerate(top.indices.tolist()) if ok(t)]
+            if good:
+                probs = torch.softmax(top.values[good].float() / self.temperature, dim=-1)
+                return int(top.indices[good][torch.multinomial(probs, 1)])
+        for k in (64, logits.shape[-1]):
+            for t in torch.topk(logits, min(k, logits.shape[-1])).indices.tolist():
+                if ok(t):
+                    return t
+        return None
+
+    def _constrained(self, ids: List[int]) -> Iterator[List[int]]:
+        """
+        Dilbilgisine uyan yeni token'lar, eklendikçe (zorunlu metin tek parça).
+        Bütçenin son `grammar.reserve` token'ında yalnızca ardından en kısa
+        kapanış hâlâ sığan token'lar seçilir; sığmazsa kapanış zorla eklenir,
+        çıktı her zaman geçerli JSON'dur.
+        """
+        from transformers import DynamicCache
+
+        state = self.grammar.start()
+        past = self._past([ids])
+        if past is None:
+            past = DynamicCache(config=self.model.config)
+        pending = list(ids[past.get_seq_length():])
+        out: List[int] = []
+        reserve = getattr(self.grammar, "reserve", 0)
+
+        def step(fits=None) -> Optional[int]:
+            nonlocal pending
+            inp = torch.tensor([pending], device=self.device)
+            # Kilit adım başına alınır; akış tüketicisi beklerken diğer üretimler ilerleyebilir.
+            with self._gen_lock:
+                logits = self.model(input_ids=inp, past_key_values=past, use_cache=True).logits[0, -1]
+            tok = self._pick(logits, state, fits)
+            if tok is not None:
+                state.advance(self._piece(tok))
+                pending = [tok]
+            return tok
+
+        try:
+            with torch.no_grad():
+                while not state.done:
+                    left = self.max_new_tokens - len(out)
+                    fits = None
+                    if left <= reserve:
+                        if self._closing_len(state) >= left:
+                            break
+                        fits = lambda probe, left=left: self._closing_len(probe) < left
+                    forced = state.forced()
+                    chunk = self._forced_ids(forced) if forced else None
+                    if chunk and len(chunk) < left:
+                        state.advance(forced)
+                        pending += chunk
+                    else:
+                        tok = step(fits)
+                        if tok is None:
+                            break
+                        chunk = [tok]
+                    out += chunk
+                    yield chunk
+                if not state.done:
+                    # Bütçe doldu ya da uygun token yok: en kısa kapanış (bütçe aşılabilir).
+                    text = state.closing()
+                    chunk = self._closing_ids(text)
+                    if chunk is not None:
+                        state.advance(text)
+                        out += chunk
+                        yield chunk
+                    while not state.done:
+                        rest = state.closing()
+                        tok = step(lambda probe, n=len(rest): len(probe.closing()) < n)
+                        if tok is None:
+                            break
+                        out.append(tok)
+                        yield [tok]
+        finally:
+            if self.prefix_cache is not None:
+                self._remember(torch.tensor(ids + out), past)
+
+    def _generate_constrained(self, batch: List[List[int]]) -> List[Tuple[str, int]]:
+        results = []
+        for ids in batch:
+            out = [t for chunk in self._constrained(ids) for t in chunk]
+            with self._tok_lock:
+                text = self.tokenizer.decode(ids + out if self.return_full_text else out, skip_special_tokens=True)
+            results.append((text if self.return_full_text else text.lstrip(), len(out)))
+        return results
+
+    def _generate(self, batch: List[List[int]], stops: Optional[Sequence[Stops]] = None,
+                  **kwargs) -> List[Tuple[str, int]]:
+        """Token dizilerinden tek `generate` çağrısıyla üretilen (metin, üretilen token sayısı) çiftleri."""
+        from transformers import StoppingCriteriaList
+
+        if self.grammar is not None:
+            return self._generate_constrained(batch)
 
-    def __call__(self, inputs, **kwargs):
-        prompt = inputs[0] if isinstance(inputs, list) else inputs
-        enc = self.tokenizer(
-            prompt,
-            return_tensors="pt",
-            truncation=True,
-            max_length=self.max_length,
-        )
+        with self._tok_lock:
+            enc = self.tokenizer.pad({"input_ids": batch}, return_tensors="pt")
         enc = {k: v.to(self.device) for k, v in enc.items()}
-        out = self.model.generate(
-            **enc,
-            max_new_tokens=self.max_new_tokens,
-            temperature=self.temperature,
-            do_sample=self.do_sample,
-        )
-        full_text = self.tokenizer.decode(out[0], skip_special_tokens=True)
-        if self.return_full_text:
-            gen = full_text
-        else:
-            prompt_text = self.tokenizer.decode(enc["input_ids"][0], skip_special_tokens=True)
-            gen = full_text[len(prompt_text):].lstrip() if full_text.startswith(prompt_text) else full_text
-        return [{"generated_text": gen}]
+        prompt_len = enc["input_ids"].shape[1]
+        criteria = self._stopping(prompt_len, stops or [None] * len(batch))
+        past = None if "past_key_values" in kwargs else self._past(batch)
+        if past is not None:
+            kwargs["past_key_values"] = past
+        with self._gen_lock:
+            out = self.model.generate(
+                **enc,
+                max_new_tokens=self.max_new_tokens,
+                temperature=self.temperature,
+                do_sample=self.do_sample,
+                pad_token_id=self.tokenizer.pad_token_id,
+                stopping_criteria=StoppingCriteriaList(criteria),
+                **kwargs,
+            )
+        if past is not None:
+            self._remember(out[0], past)
+        # Sol dolgu: tüm satırlarda istem aynı uzunlukta, üretilen kısım ondan sonrası.
+        new = out[:, prompt_len:]
+        counts = (new != self.tokenizer.pad_token_id).sum(dim=1).tolist()
+        rows = out if self.return_full_text else new
+        with self._tok_lock:
+            texts = self.tokenizer.batch_decode(rows, skip_special_tokens=True)
+        if not self.return_full_text:
+            texts = [t.lstrip() for t in texts]
+        return list(zip(texts, counts))
+
+    @staticmethod
+    def _record(batch: List[List[int]]) -> None:
+        record_usage(calls=len(batch), prompt_tokens=sum(len(ids) for ids in batch))
+
+    @staticmethod
+    def _record_generated(n: int) -> None:
+        record_usage(generated_tokens=n)
+
+    def __call__(self, inputs, batch_size: int | None = None, stop: Stops = None, **kwargs):
+        single = isinstance(inputs, str)
+        encoded = self._encode([inputs] if single else list(inputs))
+        self._record(encoded)
+        results: List[Tuple[str, int]] = []
+        batch: List[List[int]] = []
+        for ids in encoded:
+            if batch and not self._fits(batch, ids, batch_size):
+                results.extend(self._generate(batch, [stop] * len(batch), **kwargs))
+                batch = []
+            batch.append(ids)
+        if batch:
+            results.extend(self._generate(batch, [stop] * len(batch), **kwargs))
+        self._record_generated(sum(n for _, n in results))
+        texts = [t for t, _ in results]
+        if single:
+            return [{"generated_text": texts[0]}]
+        return [[{"generated_text": t}] for t in texts]
+
+    # ----------------------- akış -----------------------
+    def stream(self, prompt: str, stop: Stops = None, **kwargs) -> Iterator[str]:
+        """
+        Üretilen metni parça parça verir; `generate` arka plandaki bir iş
+        parçacığında çalışır. Üreteç erken kapatılırsa (ör. durdurma dizisi
+        görüldü) üretim bir sonraki adımda kesilir.
+        """
+        from transformers import StoppingCriteriaList, TextIteratorStreamer
+
+        ids = self._encode([prompt])[0]
+        self._record([ids])
+        if self.grammar is not None:
+            yield from self._stream_constrained(ids)
+            return
+        with self._tok_lock:
+            enc = self.tokenizer.pad({"input_ids": [ids]}, return_tensors="pt")
+        enc = {k: v.to(self.device) for k, v in enc.items()}
+        streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True)
+        cancel = threading.Event()
+        errors: List[BaseException] = []
+        generated: List[int] = []
+        prompt_len = enc["input_ids"].shape[1]
+        criteria = [_Cancelled(cancel)] + self._stopping(prompt_len, [stop])
+        past = None if "past_key_values" in kwargs else self._past([ids])
+        if past is not None:
+            kwargs["past_key_values"] = past
+
+        def run() -> None:
+            try:
+                with self._gen_lock:
+                    out = self.model.generate(
+                        **enc,
+                        max_new_tokens=self.max_new_tokens,
+                        temperature=self.temperature,
+                        do_sample=self.do_sample,
+                        pad_token_id=self.tokenizer.pad_token_id,
+                        streamer=streamer,
+                        stopping_criteria=StoppingCriteriaList(criteria),
+                        **kwargs,
+                    )
+                generated.append(out.shape[1] - prompt_len)
+                if past is not None:
+                    self._remember(out[0], past)
+            except Exception as e:
+                errors.append(e)
+                streamer.end()
+
+        thread = threading.Thread(target=run, name="agentkit-stream", daemon=True)
+        thread.start()
+        leading = True
+        try:
+            for text in streamer:
+                if leading:
+                    # Toplu üretimdeki `lstrip` ile aynı çıktı.
+                    text = text.lstrip()
+                    leading = not text
+                if text:
+                    yield text
+        finally:
+            cancel.set()
+            thread.join()
+            self._record_generated(sum(generated))
+        if errors:
+            raise errors[0]
+
+    def _stream_constrained(self, ids: List[int]) -> Iterator[str]:
+        out: List[int] = []
+        sent = ""
+        chunks = self._constrained(ids)
+        try:
+            for chunk in chunks:
+                out += chunk
+                text = self.tokenizer.decode(out, skip_special_tokens=True).lstrip()
+                # Yarım kalan çok baytlı karakter bir sonraki token'la tamamlanır.
+                if text.endswith("\ufffd") or len(text) <= len(sent):
+                    continue
+                yield text[len(sent):]
+                sent = text
+        finally:
+            chunks.close()
+            self._record_generated(len(out))
+
+    # ----------------------- eşzamanlı çağrılar -----------------------
+    def submit(self, prompt: str, stop: Stops = None) -> str:
+        """Tek istem; eşzamanlı çağrılarla aynı `generate` içinde üretilir."""
+        if self._worker is None:
+            with self._worker_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._serve, name="agentkit-generate", daemon=True)
+                    self._worker.start()
+        ids = self._encode([prompt])[0]
+        self._record([ids])
+        fut: Future = Future()
+        self._queue.put((ids, stop, fut))
+        text, n = fut.result()
+        self._record_generated(n)
+        return text
+
+    def _serve(self) -> None:
+        carry = None
+        while True:
+            batch = [carry or self._queue.get()]
+            carry = None
+            deadline = time.monotonic() + self.batch_wait_ms / 1000
+            while True:
+                try:
+                    timeout = deadline - time.monotonic()
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if not self._fits([ids for ids, _, _ in batch], item[0]):
+                    carry = item  # sonraki toplu çağrının ilk istemi
+                    break
+                batch.append(item)
+            try:
+                results = self._generate([ids for ids, _, _ in batch], [stop for _, stop, _ in batch])
+            except Exception as e:
+                for _, _, fut in batch:
+                    fut.set_exception(e)
+                continue
+            for (_, _, fut), res in zip(batch, results):
+                fut.set_result(res)
+
+
+class _Cancelled:
+    """`generate` durdurma ölçütü: olay işaretlenince tüm satırlar biter."""
+
+    def __init__(self, event: threading.Event):
+        self.event = event
+
+    def __call__(self, input_ids, scores, **kwargs):
+        return torch.full((input_ids.shape[0],), self.event.is_set(), dtype=torch.bool, device=input_ids.device)
+
+
+class _JSONScanner:
+    """İlk üst düzey `{...}` nesnesinin kapanışını dizgeleri ve kaçışları gözeterek izler."""
+
+    __slots__ = ("depth", "in_str", "esc")
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.in_str = self.esc = False
+
+    def feed(self, text: str) -> bool:
+        for ch in text:
+            if self.in_str:
+                if self.esc:
+                    self.esc = False
+                elif ch == "\\":
+                    self.esc = True
+                elif ch == '"':
+                    self.in_str = False
+            elif self.depth == 0:
+                # Nesneden önceki metin (ör. ```json) atlanır.
+                if ch == "{":
+                    self.depth = 1
+            elif ch == '"':
+                self.in_str = True
+            elif ch in "{[":
+                self.depth += 1
+            elif ch in "}]":
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        return False
+
+
+class _StopCriteria:
+    """Satır başına durdurma ölçütü: durdurma dizisi göründü ya da JSON nesnesi kapandı."""
+
+    def __init__(self, piece, prompt_len: int, stops: Sequence[Stops], json_object: bool):
+        self.piece = piece
+        self.prompt_len = prompt_len
+        self.stops = [[s for s in (row or ()) if s] for row in stops]
+        self.keep = [max((len(s) for s in row), default=0) for row in self.stops]
+        self.tails = [""] * len(stops)
+        self.scanners = [_JSONScanner() if json_object else None for _ in stops]
+        self.done = [False] * len(stops)
+        self.seen = 0
+
+    def __call__(self, input_ids, scores, **kwargs):
+        new = input_ids[:, self.prompt_len + self.seen:].tolist()
+        self.seen = input_ids.shape[1] - self.prompt_len
+        for i, tokens in enumerate(new):
+            if self.done[i]:
+                continue
+            text = "".join(self.piece(t) for t in tokens)
+            if not text:
+                continue
+            scanner = self.scanners[i]
+            if scanner is not None and scanner.feed(text):
+                self.done[i] = True
+                continue
+            if self.keep[i]:
+                tail = self.tails[i] + text
+                if any(s in tail for s in self.stops[i]):
+                    self.done[i] = True
+                    continue
+                self.tails[i] = tail[-self.keep[i]:]
+        return torch.tensor(self.done, dtype=torch.bool, device=input_ids.device)
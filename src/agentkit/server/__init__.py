@@ -0,0 +1 @@
+from agentkit.server.client import RemotePipeline
@@ -0,0 +1,115 @@
+# src/agentkit/server/client.py
+"""Model sunucusu istemcisi: `RemotePipeline` üretim hattı arayüzünü `server/daemon.py`'ye yönlendirir."""
+from __future__ import annotations
+
+import os
+import json
+import socket
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from agentkit.usage import record as record_usage
+
+MODEL_SERVER = os.getenv("AGENTKIT_MODEL_SERVER", "")
+DEFAULT_ADDRESS = "unix:" + os.path.join(
+    os.path.expanduser(os.getenv("AGENTKIT_CACHE_DIR", os.path.join("~", ".cache", "agentkit"))), "model.sock")
+
+
+def parse_address(address: str) -> Tuple[int, Any]:
+    """(soket ailesi, soket adresi): `unix:/yol` ya da `/yol` → AF_UNIX, `host:port` → AF_INET."""
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, os.path.expanduser(address[len("unix:"):])
+    if "/" in address or address.startswith("~"):
+        return socket.AF_UNIX, os.path.expanduser(address)
+    host, _, port = address.rpartition(":")
+    return socket.AF_INET, (host or "127.0.0.1", int(port))
+
+
+class _RemoteTokenizer:
+    """`tokenizer(text)["input_ids"]` çağrıları için (araç yanıtlarının token sayımı)."""
+
+    def __init__(self, pipe: "RemotePipeline"):
+        self._pipe = pipe
+
+    def __call__(self, text, **kwargs) -> Dict[str, Any]:
+        single = isinstance(text, str)
+        ids = self._pipe._request({"op": "tokenize", "texts": [text] if single else list(text)})["input_ids"]
+        return {"input_ids": ids[0] if single else ids}
+
+
+class RemotePipeline:
+    """Model sunucusundaki üretim hattına ince istemci."""
+
+    def __init__(self, address: str = DEFAULT_ADDRESS, timeout: Optional[float] = None):
+        self.address = address
+        self.family, self.sockaddr = parse_address(address)
+        self.timeout = timeout
+        self.info = self._request({"op": "info"})  # sunucu yoksa burada ConnectionError
+        self.model_name = self.info.get("model", "")
+        self.tokenizer = _RemoteTokenizer(self)
+
+    # ----------------------- bağlantı -----------------------
+    def _lines(self, payload: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        sock = socket.socket(self.family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            try:
+                sock.connect(self.sockaddr)
+            except OSError as e:
+                raise ConnectionError(f"Model sunucusuna bağlanılamadı ({self.address}): {e}. "
+                                      f"Sunucuyu `python scripts/run_server.py` ile başlatın.") from e
+            sock.sendall(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as f:
+                for line in f:
+                    msg = json.loads(line)
+                    if "error" in msg:
+                        raise RuntimeError(f"Model sunucusu: {msg['error']}")
+                    yield msg
+        finally:
+            sock.close()
+
+    def _request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        lines = self._lines(payload)
+        try:
+            msg = next(lines, None)
+        finally:
+            lines.close()
+        if msg is None:
+            raise ConnectionError(f"Model sunucusu yanıt vermeden bağlantıyı kapattı ({self.address})")
+        return msg
+
+    @staticmethod
+    def _record(msg: Dict[str, Any]) -> None:
+        record_usage(calls=msg.get("calls", 0), prompt_tokens=msg.get("prompt_tokens", 0),
+                     generated_tokens=msg.get("generated_tokens", 0))
+
+    # ----------------------- üretim -----------------------
+    def _generate(self, prompts: List[str], stop: Optional[Sequence[str]], batch_size: Optional[int]) -> List[str]:
+        msg = self._request({"op": "generate", "prompts": prompts, "stop": list(stop) if stop else None,
+                             "batch_size": batch_size})
+        self._record(msg)
+        return msg["texts"]
+
+    def __call__(self, inputs, batch_size: Optional[int] = None, stop: Optional[Sequence[str]] = None, **kwargs):
+        if kwargs:
+            raise TypeError(f"Model sunucusu ek generate argümanlarını desteklemiyor: {sorted(kwargs)}")
+        single = isinstance(inputs, str)
+        texts = self._generate([inputs] if single else list(inputs), stop, batch_size)
+        if single:
+            return [{"generated_text": texts[0]}]
+        return [[{"generated_text": t}] for t in texts]
+
+    def submit(self, prompt: str, stop: Optional[Sequence[str]] = None) -> str:
+        """Tek istem; sunucuda diğer istemcilerin eşzamanlı istemleriyle birlikte üretilir."""
+        return self._generate([prompt], stop, None)[0]
+
+    def stream(self, prompt: str, stop: Optional[Sequence[str]] = None) -> Iterator[str]:
+        # Erken kapatılan akışın kullanım sayıları istemciye ulaşmaz (akış yalnızca sohbette; KPI kullanmaz).
+        lines = self._lines({"op": "stream", "prompt": prompt, "stop": list(stop) if stop else None})
+        try:
+            for msg in lines:
+                if "text" in msg:
+                    yield msg["text"]
+                else:
+                    self._record(msg)
+        finally:
+            lines.close()
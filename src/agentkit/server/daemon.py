@@ -0,0 +1,194 @@
+# src/agentkit/server/daemon.py
+"""Kalıcı model sunucusu: modeli bir kez yükler, `RemotePipeline` istemcilerine hizmet eder (bkz. `client.py`)."""
+from __future__ import annotations
+
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import logging
+import argparse
+import socketserver
+from typing import Any, Callable, Dict
+
+from agentkit.server.client import DEFAULT_ADDRESS, MODEL_SERVER, parse_address
+from agentkit.usage import usage
+
+log = logging.getLogger(__name__)
+
+
+def _delta(before: Dict[str, int]) -> Dict[str, int]:
+    after = usage()
+    return {k: after[k] - before[k] for k in after}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def _write(self, msg: Dict[str, Any]) -> None:
+        self.wfile.write(json.dumps(msg, ensure_ascii=False).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        app: ModelServer = self.server.app  # type: ignore[attr-defined]
+        try:
+            req = json.loads(line)
+            app.handle(req, self._write)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # istemci ayrıldı (ör. akış erken kapatıldı)
+        except Exception as e:
+            log.exception("istek başarısız")
+            try:
+                self._write({"error": f"{type(e).__name__}: {e}"})
+            except OSError:
+                pass
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class ModelServer:
+    """Yüklü üretim hattını soket üzerinden sunar."""
+
+    def __init__(self, pipe, address: str = DEFAULT_ADDRESS, model_name: str = ""):
+        self.pipe = pipe
+        self.address = address
+        self.model_name = model_name
+        self.started = time.time()
+        self.requests = 0
+        family, self.sockaddr = parse_address(address)
+        if family == socket.AF_UNIX:
+            self._claim_socket(self.sockaddr)
+            self._server = _UnixServer(self.sockaddr, _Handler)
+            os.chmod(self.sockaddr, 0o600)
+        else:
+            self._server = _TCPServer(self.sockaddr, _Handler)
+        self._server.app = self  # type: ignore[attr-defined]
+        self._ops: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            "info": self.info, "generate": self.generate, "tokenize": self.tokenize,
+        }
+
+    @staticmethod
+    def _claim_socket(path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if not os.path.exists(path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            os.unlink(path)  # eski sunucudan kalan soket
+            return
+        finally:
+            probe.close()
+        raise RuntimeError(f"{path} üzerinde çalışan bir model sunucusu var")
+
+    def handle(self, req: Dict[str, Any], write: Callable[[Dict[str, Any]], None]) -> None:
+        self.requests += 1
+        op = req.get("op")
+        if op == "stream":
+            self.stream(req, write)
+            return
+        if op not in self._ops:
+            raise ValueError(f"bilinmeyen işlem: {op!r}")
+        write(self._ops[op](req))
+
+    # ----------------------- işlemler -----------------------
+    def info(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        return {"model": self.model_name, "pid": os.getpid(), "uptime_s": time.time() - self.started,
+                "requests": self.requests, "max_new_tokens": self.pipe.max_new_tokens,
+                "constrained": getattr(self.pipe, "grammar", None) is not None}
+
+    def generate(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        prompts, stop = req["prompts"], req.get("stop")
+        before = usage()
+        if len(prompts) == 1:
+            texts = [self.pipe.submit(prompts[0], stop=stop)]
+        else:
+            outs = self.pipe(prompts, batch_size=req.get("batch_size"), stop=stop)
+            texts = [out[0]["generated_text"] for out in outs]
+        return {"texts": texts, **_delta(before)}
+
+    def tokenize(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        return {"input_ids": self.pipe._encode(req["texts"])}
+
+    def stream(self, req: Dict[str, Any], write: Callable[[Dict[str, Any]], None]) -> None:
+        # Akışlar birleştirilmez: her akış kendi `generate`'ini çalıştırır ve modeli
+        # diğer üretimlerle sırayla kullanır (pipeline üretim kilidi). Yalnızca
+        # `op=generate` istemleri `submit` ile tek `generate`'te toplanır.
+        before = usage()
+        pieces = self.pipe.stream(req["prompt"], stop=req.get("stop"))
+        try:
+            for text in pieces:
+                write({"text": text})
+        finally:
+            # Yazma başarısızsa (istemci ayrıldı) üreteç kapanır ve üretim kesilir.
+            pieces.close()
+        write({"done": True, **_delta(before)})
+
+    # ----------------------- yaşam döngüsü -----------------------
+    def serve_forever(self) -> None:
+        try:
+            self._server.serve_forever()
+        finally:
+            self.close()
+
+    def shutdown(self) -> None:
+        """Başka bir iş parçacığından `serve_forever`'ı durdurur."""
+        self._server.shutdown()
+
+    def close(self) -> None:
+        self._server.server_close()
+        if isinstance(self.sockaddr, str) and os.path.exists(self.sockaddr):
+            os.unlink(self.sockaddr)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Kalıcı model sunucusu (run_chat / run_kpi için AGENTKIT_MODEL_SERVER)")
+    ap.add_argument("--address", default=MODEL_SERVER or DEFAULT_ADDRESS,
+                    help="unix:/yol/model.sock ya da host:port (varsayılan AGENTKIT_MODEL_SERVER)")
+    ap.add_argument("--cpu", action="store_true")
+    ap.add_argument("--cpu-engine", choices=["fp32", "bf16", "int8"], default=None,
+                    help="CPU yükleme motoru (varsayılan CPU_ENGINE)")
+    ap.add_argument("--no-unsloth", action="store_true")
+    args = ap.parse_args(argv)
+
+    from agentkit.config import settings
+    from agentkit.models.loader import ModelLoader
+
+    if args.cpu:
+        os.environ["FORCE_CPU"] = "1"
+        os.environ["CUDA_VISIBLE_DEVICES"] = ""
+        settings.force_cpu = True
+        settings.cuda_visible_devices = ""
+    if args.cpu_engine:
+        settings.cpu.engine = args.cpu_engine
+    family, sockaddr = parse_address(args.address)
+    if family == socket.AF_UNIX:
+        ModelServer._claim_socket(sockaddr)  # model yüklenmeden önce: adres başka sunucuda mı
+    settings.apply()
+    t0 = time.perf_counter()
+    pipe = ModelLoader(settings).build_pipeline(use_unsloth=not args.no_unsloth)
+    if settings.gen.constrained_json:
+        from agentkit.grammar import ActionGrammar
+        from agentkit.tools import registry
+        pipe.grammar = ActionGrammar.from_tools([t.name for t in registry.get_tools()])
+    server = ModelServer(pipe, args.address, settings.model_name)
+    # SIGTERM'de de soket dosyası silinsin.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"Model sunucusu hazır: {args.address} ({settings.model_name}, yükleme {time.perf_counter() - t0:.1f} s)",
+          flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
@@ -0,0 +1,28 @@
+from typing import Optional
+
+from agentkit.storage.store import CustomerStore, normalize_phone
+from agentkit.storage.base import StorageBackend
+from agentkit.storage.catalog import PackageCatalog
+from agentkit.storage.fork import ForkBackend
+from agentkit.storage.json_backend import JsonBackend
+from agentkit.storage.lazy import LazyCustomerStore
+from agentkit.storage.phones import PhoneAllocator, PhoneSpaceExhausted
+
+
+def open_backend(
+    kind: str,
+    user_db: str,
+    package_db: str,
+    journal_path: Optional[str] = None,
+    compact_every: int = 500,
+    sqlite_db: Optional[str] = None,
+    lazy: bool = False,
+) -> StorageBackend:
+    """`AGENTKIT_STORAGE` değerine göre ("json" veya "sqlite") arka ucu kurar."""
+    kind = (kind or "json").strip().lower()
+    if kind == "json":
+        return JsonBackend(user_db, package_db, journal_path=journal_path, compact_every=compact_every, lazy=lazy)
+    if kind == "sqlite":
+        from agentkit.storage.sqlite_backend import SqliteBackend
+        return SqliteBackend(sqlite_db or user_db.rsplit(".", 1)[0] + ".db", user_db=user_db, package_db=package_db)
+    raise ValueError(f"Bilinmeyen depolama arka ucu: {kind!r} (json | sqlite)")
@@ -0,0 +1,235 @@
+# src/agentkit/storage/base.py
+from __future__ import annotations
+
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+from agentkit.storage.catalog import PackageCatalog
+from agentkit.storage.locks import StripedLock
+from agentkit.storage.phones import PhoneAllocator
+from agentkit.storage.timeline import EDITABLE_BILL_STATUSES, CustomerTimeline, TimelineCache
+
+
+class StorageBackend(ABC):
+    """Araç katmanının veri erişim arayüzü; müşteriler düz `dict`, yazmalar `transaction(...)` içinde."""
+
+    name = "base"
+    locks: StripedLock
+    # Tüm kayıtlar bellekte mi (okuma ucuz); sonuç önbelleği (tools/cache.py) buna göre açılır.
+    in_memory = False
+    # `poll` başka süreçlerin yazmalarını gördükçe artar.
+    external_changes = 0
+
+    def __init__(self) -> None:
+        self.locks = StripedLock()
+
+    # ----------------------- müşteriler -----------------------
+    @abstractmethod
+    def users(self) -> List[dict]:
+        """Tüm müşteriler (geriye dönük uyumluluk; büyük veride pahalı olabilir)."""
+
+    @abstractmethod
+    def find(self, identifier: str) -> Optional[dict]:
+        """T.C. no, müşteri ID veya telefon numarasıyla müşteri bulur."""
+
+    @abstractmethod
+    def find_by_phone(self, phone: str) -> Optional[dict]:
+        ...
+
+    def has_phone(self, phone: str) -> bool:
+        return self.find_by_phone(phone) is not None
+
+    @property
+    def phones(self) -> PhoneAllocator:
+        """Yeni numara tahsisi; çakışma kontrolü `has_phone` ile."""
+        alloc = getattr(self, "_phones", None)
+        if alloc is None:
+            alloc = self._phones = PhoneAllocator(self.has_phone)
+        return alloc
+
+    @abstractmethod
+    def save(self, changed: Iterable[dict] = ()) -> None:
+        """Değişen müşterileri kalıcı hale getirir."""
+
+    def add_listener(self, fn: Callable[[Optional[List[dict]]], None]) -> None:
+        """
+        Değişiklik bildirimi: `fn(changed)` yazılan kayıtlar görünür olduktan
+        (SQLite'ta COMMIT'ten) sonra çağrılır; `None` tüm verinin değişmiş
+        olabileceğini bildirir (ör. `_abort`).
+        """
+        self.__dict__.setdefault("_listeners", []).append(fn)
+
+    def _notify(self, changed: Optional[List[dict]]) -> None:
+        for fn in self.__dict__.get("_listeners", ()):
+            fn(changed)
+
+    def poll(self) -> None:
+        """Başka bir süreç veriyi değiştirdiyse dinleyicilere `None` bildirir (ör. sonuç önbelleği boşalır)."""
+        version = self._external_version()
+        if version is None or version == self.__dict__.get("_seen_version"):
+            return
+        self._seen_version = version
+        self.external_changes += 1
+        self._notify(None)
+
+    def _external_version(self) -> Any:
+        # Yalnızca başka süreçlerin yazmalarıyla değişen damga; None: arka uç izlemiyor.
+        return None
+
+    # ----------------------- işlemler -----------------------
+    @contextmanager
+    def transaction(self, *identifiers: str, phones: Iterable[str] = ()) -> Iterator[List[Optional[dict]]]:
+        """
+        Verilen müşterileri kilitleyip döner (önce `identifiers`, sonra `phones`
+        ile bulunanlar). Blok içinde yapılan değişiklikler `save(...)` ile
+        yazılır; blok hata ile biterse `_abort()` çağrılır.
+        """
+        lookups = [(self.find, i) for i in identifiers] + [(self.find_by_phone, p) for p in phones]
+        state = self._batch_state()
+        resolve = (lambda fn, x: fn(x)) if state is None else self._batch_resolver(state)
+        keys = self._lock_keys(lookups, [resolve(fn, x) for fn, x in lookups])
+        while True:
+            with self.locks.acquire_many(keys), self._exclusive():
+                customers = [resolve(fn, x) for fn, x in lookups]
+                now = self._lock_keys(lookups, customers)
+                if now == keys:
+                    try:
+                        yield customers
+                    except BaseException:
+                        if state is not None:
+                            state["failed"] = True
+                        else:
+                            self._abort()
+                        raise
+                    return
+            # Kilit beklenirken kimlik çözümlemesi değişti (ör. numara değişikliği); yeniden dene.
+            keys = now
+
+    @contextmanager
+    def batch(self, *identifiers: str, phones: Iterable[str] = ()) -> Iterator[List[Optional[dict]]]:
+        """
+        Toplu işlem: verilen müşterilerin kilitleri tek seferde alınır, blok
+        içindeki `transaction(...)` çağrıları aynı kayıt nesnelerini görür ve
+        `defer(...)` ile bildirilen değişiklikler çıkışta tek `save(...)` ile
+        yazılır. Blok içindeki bir işlem hata verirse yazılanlar yazıldıktan
+        sonra `_abort()` ile bellek diskten yenilenir.
+
+        Blokta dokunulan tüm müşteriler `identifiers`/`phones` içinde olmalıdır;
+        aksi halde şerit kilitleri sırasız alınır.
+        """
+        phones = tuple(phones)
+        local = self.__dict__.setdefault("_batch_local", threading.local())
+        if getattr(local, "state", None) is not None:
+            with self.transaction(*identifiers, phones=phones) as customers:
+                yield customers
+            return
+        with self.transaction(*identifiers, phones=phones) as customers:
+            state = local.state = {"pending": {}, "records": {}, "idents": {}, "failed": False}
+            # Kilit altında çözülen kayıtlar bloktaki işlemlerce yeniden aranmaz.
+            names = ["find"] * len(identifiers) + ["find_by_phone"] * len(phones)
+            for name, x, c in zip(names, identifiers + phones, customers):
+                if c and c.get("customer_id"):
+                    c = state["records"].setdefault(c["customer_id"], c)
+                state["idents"][(name, x)] = c
+            try:
+                yield customers
+            finally:
+                local.state = None
+                if state["pending"]:
+                    self.save(list(state["pending"].values()))
+                if state["failed"]:
+                    self._abort()
+
+    @staticmethod
+    def _batch_resolver(state: dict):
+        # Toplu işlemde kimlikler bir kez çözülür ve aynı müşteri hep aynı (henüz yazılmamış) nesneyle döner.
+        idents, records = state["idents"], state["records"]
+
+        def resolve(fn, x):
+            key = (fn.__name__, x)
+            if key not in idents:
+                c = fn(x)
+                if c and c.get("customer_id"):
+                    c = records.setdefault(c["customer_id"], c)
+                idents[key] = c
+            return idents[key]
+        return resolve
+
+    def _batch_state(self) -> Optional[dict]:
+        local = self.__dict__.get("_batch_local")
+        return getattr(local, "state", None) if local is not None else None
+
+    def defer(self, changed: Iterable[dict]) -> bool:
+        """Toplu işlem içindeyse değişiklikleri biriktirir ve True döner; değilse False."""
+        state = self._batch_state()
+        if state is None:
+            return False
+        for u in changed:
+            if u:
+                state["pending"][id(u)] = u
+        return True
+
+    @staticmethod
+    def _lock_keys(lookups, customers) -> List[str]:
+        return [(c.get("customer_id") or "") if c else f"?{x}" for (_, x), c in zip(lookups, customers)]
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """Süreçler arası özel erişim; varsayılan: yok."""
+        yield
+
+    def _abort(self) -> None:
+        """Yarıda kalan işlem sonrası bellekteki durumu geçersiz kılar."""
+
+    # ----------------------- paketler -----------------------
+    @abstractmethod
+    def load_packages(self) -> List[dict]:
+        ...
+
+    def packages_version(self) -> Any:
+        """Katalog değiştiğinde değişen damga; None ise katalog her erişimde yeniden yüklenir."""
+        return None
+
+    @property
+    def catalog(self) -> PackageCatalog:
+        cat = getattr(self, "_catalog", None)
+        if cat is None:
+            cat = self._catalog = PackageCatalog(self.load_packages, self.packages_version)
+        return cat
+
+    # ----------------------- fatura / randevu sorguları -----------------------
+    @property
+    def timelines(self) -> TimelineCache:
+        cache = getattr(self, "_timelines", None)
+        if cache is None:
+            cache = self._timelines = TimelineCache()
+        return cache
+
+    def timeline(self, customer: dict) -> CustomerTimeline:
+        """Müşterinin ayrıştırılmış ve tarihe göre sıralı fatura/randevu indeksi."""
+        return self.timelines.get(customer)
+
+    def bill_by_id(self, customer: dict, bill_id: str) -> Optional[dict]:
+        return self.timeline(customer).bill_by_id(bill_id)
+
+    def latest_bill(self, customer: dict) -> Optional[dict]:
+        """En son tarihli fatura. Tarih formatı bozuksa ValueError/KeyError yükselir."""
+        return self.timeline(customer).latest_bill()
+
+    def latest_editable_bill(self, customer: dict) -> Optional[dict]:
+        """Durumu Beklemede/Gecikmiş olan en son fatura."""
+        return self.timeline(customer).latest_editable_bill()
+
+    def latest_appointment(self, customer: dict) -> Optional[dict]:
+        """Tarih+saate göre en son randevu. Veri bozuksa ValueError/KeyError yükselir."""
+        return self.timeline(customer).latest_appointment()
+
+    def fork(self) -> "StorageBackend":
+        """Kopyala-yaz çatal: yazmalar yalnızca çatalın belleğinde kalır (bkz. storage/fork.py)."""
+        from agentkit.storage.fork import ForkBackend
+        return ForkBackend(self)
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,67 @@
+# src/agentkit/storage/catalog.py
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class PackageCatalog:
+    """
+    Paket kataloğunun meslek grubu → paket listesi indeksi.
+
+    Katalog bir kez yüklenir; paket adları (ör. " Müthiş 10 GB") ve grup
+    adları bu sırada bir kez normalize edilir. Her erişimde `version()`
+    (katalog dosyasının mtime/boyut damgası) kontrol edilir; değiştiyse indeks
+    yeniden kurulur, böylece fiyat güncellemeleri yeniden başlatmadan görünür.
+    """
+
+    def __init__(self, load: Callable[[], List[dict]], version: Callable[[], Any] = lambda: None):
+        self._load = load
+        self._version = version
+        self._lock = threading.Lock()
+        self._stamp: Any = object()
+        self._packages: List[dict] = []
+        self._by_group: Dict[str, Tuple[dict, ...]] = {}
+        self._by_name: Dict[str, dict] = {}
+
+    @staticmethod
+    def normalize_group(group: Optional[str]) -> str:
+        return (group or "").strip().lower()
+
+    def _refresh(self) -> None:
+        stamp = self._version()
+        if stamp == self._stamp and stamp is not None:
+            return
+        with self._lock:
+            if stamp == self._stamp and stamp is not None:
+                return
+            packages, by_group, by_name = [], {}, {}
+            for raw in self._load():
+                p = dict(raw)
+                p["name"] = (p.get("name") or "").strip()
+                packages.append(p)
+                by_name.setdefault(p["name"], p)
+                groups = {self.normalize_group(g) for g in p.get("allowed_groups", ["genel"])}
+                for g in groups:
+                    by_group.setdefault(g, []).append(p)
+            self._packages = packages
+            self._by_group = {g: tuple(ps) for g, ps in by_group.items()}
+            self._by_name = by_name
+            self._stamp = stamp
+
+    def packages(self) -> List[dict]:
+        self._refresh()
+        return list(self._packages)
+
+    def for_group(self, group: Optional[str], exclude: Optional[str] = None) -> List[dict]:
+        """Gruba açık paketler (katalog sırasıyla); `exclude` adlı paket hariç."""
+        self._refresh()
+        pkgs = self._by_group.get(self.normalize_group(group), ())
+        if exclude is None:
+            return list(pkgs)
+        exclude = exclude.strip()
+        return [p for p in pkgs if p["name"] != exclude]
+
+    def by_name(self, name: str) -> Optional[dict]:
+        self._refresh()
+        return self._by_name.get((name or "").strip())
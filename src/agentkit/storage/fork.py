@@ -0,0 +1,111 @@
+# src/agentkit/storage/fork.py
+from __future__ import annotations
+
+import copy
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from agentkit.storage.base import StorageBackend
+from agentkit.storage.catalog import PackageCatalog
+from agentkit.storage.store import normalize_phone
+
+
+class ForkBackend(StorageBackend):
+    """Bir arka ucun kopyala-yaz çatalı; yazmalar yalnızca çatalın belleğinde kalır."""
+
+    name = "fork"
+
+    def __init__(self, base: StorageBackend):
+        super().__init__()
+        self.base = base
+        self.in_memory = base.in_memory
+        self._records: Dict[str, dict] = {}  # customer_id → çataldaki kopya
+        self._saved: Dict[str, dict] = {}  # customer_id → son kaydedilen hal (`_abort` buna döner)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @staticmethod
+    def _matches(u: dict, ident: str) -> bool:
+        return bool(ident) and (u.get("tc_no") == ident or u.get("customer_id") == ident
+                                or normalize_phone(u.get("phone_number", "")) == normalize_phone(ident))
+
+    def _own(self, u: Optional[dict]) -> Optional[dict]:
+        # İşlem içinde okunan kayıt çatala kopyalanır; dışarıda ana kayıt salt okunur döner.
+        if u is None or not getattr(self._local, "writing", 0):
+            return u
+        cid = u.get("customer_id") or ""
+        with self._lock:
+            own = self._records.get(cid)
+            if own is None:
+                own = self._records[cid] = copy.deepcopy(u)
+            return own
+
+    def _resolve(self, found: Optional[dict], match) -> Optional[dict]:
+        with self._lock:
+            for u in self._records.values():
+                if match(u):
+                    return u
+        if found is None:
+            return None
+        if (found.get("customer_id") or "") in self._records:
+            # Çatalda bu müşterinin kimliği değişmiş (ör. numara değişikliği).
+            return None
+        return self._own(found)
+
+    # ----------------------- müşteriler -----------------------
+    def users(self) -> List[dict]:
+        with self._lock:
+            records = dict(self._records)
+        return [records.get(u.get("customer_id") or "", u) for u in self.base.users()]
+
+    def find(self, identifier: str) -> Optional[dict]:
+        ident = identifier or ""
+        return self._resolve(self.base.find(ident), lambda u: self._matches(u, ident))
+
+    def find_by_phone(self, phone: str) -> Optional[dict]:
+        num = normalize_phone(phone)
+        return self._resolve(self.base.find_by_phone(phone),
+                             lambda u: bool(num) and normalize_phone(u.get("phone_number", "")) == num)
+
+    def save(self, changed: Iterable[dict] = ()) -> None:
+        changed = [u for u in changed if u]
+        with self._lock:
+            for u in changed:
+                cid = u.get("customer_id") or ""
+                self._records[cid] = u
+                self._saved[cid] = copy.deepcopy(u)
+        self.timelines.discard(changed)
+        self._notify(changed)
+
+    @contextmanager
+    def transaction(self, *identifiers: str, phones: Iterable[str] = ()) -> Iterator[List[Optional[dict]]]:
+        depth = getattr(self._local, "writing", 0)
+        self._local.writing = depth + 1
+        try:
+            with super().transaction(*identifiers, phones=phones) as customers:
+                yield customers
+        finally:
+            self._local.writing = depth
+
+    def _external_version(self) -> int:
+        # Ana arka ucun gördüğü dış değişiklikler çatalın okumalarını da değiştirir.
+        self.base.poll()
+        return self.base.external_changes
+
+    def _abort(self) -> None:
+        with self._lock:
+            self._records = {cid: copy.deepcopy(u) for cid, u in self._saved.items()}
+        self.timelines.clear()
+        self._notify(None)
+
+    # ----------------------- paketler -----------------------
+    def load_packages(self) -> List[dict]:
+        return self.base.load_packages()
+
+    def packages_version(self) -> Any:
+        return self.base.packages_version()
+
+    @property
+    def catalog(self) -> PackageCatalog:
+        return self.base.catalog
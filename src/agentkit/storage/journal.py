@@ -0,0 +1,86 @@
+# src/agentkit/storage/journal.py
+from __future__ import annotations
+
+import os
+import json
+import threading
+from typing import Iterator, List, Tuple
+
+
+class MutationJournal:
+    """Müşteri kayıtları için yalnızca-ekleme yazma günlüğü; satır başına bir müşterinin güncel hali."""
+
+    def __init__(self, path: str, fsync: bool = True):
+        self.path = path
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._entries = 0
+
+    @property
+    def entries(self) -> int:
+        """Son sıkıştırmadan bu yana eklenen satır sayısı."""
+        return self._entries
+
+    def size(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+
+    def append(self, items: List[Tuple[int, dict]]) -> Tuple[int, int]:
+        """Satırları ekler; yazılan bölümün (başlangıç, bitiş) bayt ofsetlerini döner."""
+        if not items:
+            size = self.size()
+            return size, size
+        lines = "".join(
+            json.dumps({"pos": pos, "customer_id": u.get("customer_id"), "record": u}, ensure_ascii=False) + "\n"
+            for pos, u in items
+        )
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            data = lines.encode("utf-8")
+            with open(self.path, "ab") as f:
+                start = f.seek(0, os.SEEK_END)
+                f.write(data)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            self._entries += len(items)
+        return start, start + len(data)
+
+    def replay(self, start: int = 0) -> Iterator[Tuple[int, dict]]:
+        """Bayt ofseti `start`tan itibaren (ofset, satır) çiftlerini döner."""
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(start)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # yarım kalmış son satır (çökme) → yok say
+                start += len(raw)
+                try:
+                    entry = json.loads(raw)
+                except ValueError:
+                    continue
+                yield start, entry
+
+    def truncate_before(self, offset: int) -> None:
+        """`offset`e kadar olan satırları atar, sonrasını korur (sıkıştırma sonrası)."""
+        with self._lock:
+            tail = b""
+            try:
+                with open(self.path, "rb") as f:
+                    f.seek(offset)
+                    tail = f.read()
+            except FileNotFoundError:
+                pass
+            tmp = self.path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(tail)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            self._entries = tail.count(b"\n")
@@ -0,0 +1,72 @@
+# src/agentkit/storage/json_backend.py
+from __future__ import annotations
+
+import os
+import json
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from agentkit.storage.base import StorageBackend
+from agentkit.storage.lazy import LazyCustomerStore
+from agentkit.storage.store import CustomerStore
+
+
+class JsonBackend(StorageBackend):
+    """user.json + packages.json ile çalışan varsayılan arka uç."""
+
+    name = "json"
+
+    def __init__(self, user_db: str, package_db: str, journal_path: Optional[str] = None, compact_every: int = 500,
+                 lazy: bool = False):
+        self.user_db = user_db
+        self.package_db = package_db
+        # lazy: yalnızca kimlik indeksi bellekte, kayıtlar istendiğinde dosyadan ayrıştırılır.
+        store_cls = LazyCustomerStore if lazy else CustomerStore
+        self.in_memory = not lazy
+        self.store = store_cls(user_db, journal_path=journal_path, compact_every=compact_every)
+        # Sıkıştırma da aynı şeritleri kullandığı için kilitler depoyla paylaşılır.
+        self.locks = self.store.locks
+
+    def users(self) -> List[dict]:
+        return self.store.users()
+
+    def find(self, identifier: str) -> Optional[dict]:
+        return self.store.find(identifier)
+
+    def find_by_phone(self, phone: str) -> Optional[dict]:
+        return self.store.find_by_phone(phone)
+
+    def has_phone(self, phone: str) -> bool:
+        return self.store.has_phone(phone)
+
+    def save(self, changed: Iterable[dict] = ()) -> None:
+        changed = list(changed)
+        self.store.save(changed)
+        # Fatura/randevu listeleri yerinde değişmiş olabilir.
+        self.timelines.discard(changed)
+        self._notify(changed)
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        with self.store.process_lock:
+            yield
+
+    def _external_version(self) -> int:
+        self.store.refresh()
+        return self.store.external
+
+    def _abort(self) -> None:
+        self.store.invalidate()
+        self.timelines.clear()
+        self._notify(None)
+
+    def load_packages(self) -> List[dict]:
+        with open(self.package_db, encoding="utf-8") as f:
+            return json.load(f)
+
+    def packages_version(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.package_db)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
@@ -0,0 +1,420 @@
+# src/agentkit/storage/lazy.py
+from __future__ import annotations
+
+import os
+import json
+import codecs
+import bisect
+import logging
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from agentkit.storage.store import CustomerStore, normalize_phone
+
+log = logging.getLogger(__name__)
+
+_HASH_MASK = (1 << 64) - 1
+_CHUNK = 1 << 20
+_pread = getattr(os, "pread", None)
+
+
+def _h(key: str) -> int:
+    # İndeks süreç içinde kurulur; bu yüzden süreç başına tohumlanan hash() yeterli.
+    # 0 "alan boş" anlamına gelir.
+    return (hash(key) & _HASH_MASK) or 1
+
+
+class _Snapshot:
+    """
+    Açık user.json tanıtıcısı ve üzerindeki sıkı (array tabanlı) kimlik indeksi.
+
+    Kayıtlar `os.pread` ile okunur. mmap denendi; rastgele aramalarda çekirdeğin
+    fault-around'u komşu sayfaları da eşlediği için RSS kısa sürede dosya
+    boyutuna çıkıyordu (MADV_RANDOM ile de).
+    """
+
+    __slots__ = ("file", "stamp", "offsets", "lengths", "hashes", "positions", "_seek_lock")
+
+    def __init__(self, file, stamp, offsets: array, lengths: array, hashes, positions):
+        self.file = file
+        self.stamp = stamp
+        self.offsets = offsets
+        self.lengths = lengths
+        # Alan başına (tc, id, telefon): hash'e göre sıralı hash'ler ve konumlar.
+        self.hashes: Tuple[array, array, array] = hashes
+        self.positions: Tuple[array, array, array] = positions
+        self._seek_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def raw(self, pos: int) -> bytes:
+        if _pread is not None:
+            return _pread(self.file.fileno(), self.lengths[pos], self.offsets[pos])
+        with self._seek_lock:  # Windows: pread yok
+            self.file.seek(self.offsets[pos])
+            return self.file.read(self.lengths[pos])
+
+    def record(self, pos: int) -> dict:
+        return json.loads(self.raw(pos))
+
+    def candidates(self, field: int, key: str) -> Iterable[int]:
+        hs, ps, h = self.hashes[field], self.positions[field], _h(key)
+        i = bisect.bisect_left(hs, h)
+        while i < len(hs) and hs[i] == h:
+            yield ps[i]
+            i += 1
+
+
+def _scan(path: str) -> _Snapshot:
+    """
+    user.json'u tek geçişte tarar: her kaydın bayt aralığını ve kimlik alanlarının
+    hash'lerini tutar, kaydın kendisini bırakır. Bellekte aynı anda tek kayıt bulunur.
+
+    Tanıtıcı açık tutulur; dosya os.replace ile değiştirilse de snapshot
+    taranan sürümden okumaya devam eder.
+    """
+    f = open(path, "rb")
+    try:
+        st = os.fstat(f.fileno())
+        offsets, lengths, hashes = _index_stream(path, f, st.st_size)
+    except BaseException:
+        f.close()
+        raise
+    positions = []
+    for field in range(3):
+        hs = hashes[field]
+        # 0 = alan boş; sıralama kararlı olduğundan eşit hash'ler konum sırasında kalır.
+        order = sorted((p for p in range(len(hs)) if hs[p]), key=hs.__getitem__)
+        hashes[field] = array("Q", (hs[p] for p in order))
+        positions.append(array("q", order))
+        del order, hs
+    return _Snapshot(f, (st.st_ino, st.st_mtime_ns, st.st_size), offsets, lengths, tuple(hashes), tuple(positions))
+
+
+def _record_keys(data: bytes) -> Tuple[str, str, str]:
+    rec = json.loads(data)
+    return CustomerStore._keys_for(rec) if isinstance(rec, dict) else ("", "", "")
+
+
+def _rekeyed(snap: _Snapshot, overlay: Dict[int, bytes]) -> Tuple[tuple, tuple]:
+    """
+    `overlay` ile yeniden yazılan dosyanın hash dizileri: yalnızca kimlik alanı
+    değişen kayıtların girdileri taşınır, diziler gerekmedikçe kopyalanmaz.
+    """
+    hashes, positions = list(snap.hashes), list(snap.positions)
+    copied = [False, False, False]
+    for pos, data in overlay.items():
+        for field, (old, new) in enumerate(zip(_record_keys(snap.raw(pos)), _record_keys(data))):
+            if old == new:
+                continue
+            if not copied[field]:
+                hashes[field], positions[field] = array("Q", hashes[field]), array("q", positions[field])
+                copied[field] = True
+            hs, ps = hashes[field], positions[field]
+            if old:
+                i = bisect.bisect_left(hs, _h(old))
+                while ps[i] != pos:
+                    i += 1
+                del hs[i], ps[i]
+            if new:
+                h = _h(new)
+                i = bisect.bisect_left(hs, h)
+                while i < len(hs) and hs[i] == h and ps[i] < pos:  # eşit hash'ler konum sırasında
+                    i += 1
+                hs.insert(i, h)
+                ps.insert(i, pos)
+    return tuple(hashes), tuple(positions)
+
+
+def _index_stream(path: str, f, size: int) -> Tuple[array, array, List[array]]:
+    offsets, lengths = array("q"), array("q")
+    raw_hashes = [array("Q"), array("Q"), array("Q")]
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    # buf: base baytından başlayan çözülmüş metin; i: buf içindeki karakter,
+    # ib: buf[:i]'nin bayt uzunluğu; read: decoder'a verilen bayt sayısı.
+    buf, base, i, ib, read = "", 0, 0, 0, 0
+
+    def refill() -> bool:
+        nonlocal buf, base, i, ib, read
+        if read >= size:
+            return False
+        buf, base, i, ib = buf[i:], base + ib, 0, 0
+        chunk = f.read(_CHUNK)
+        if not chunk:
+            return False
+        read += len(chunk)
+        buf += utf8.decode(chunk, final=read >= size)
+        return True
+
+    started = False
+    while True:
+        j = i
+        while True:
+            while j < len(buf) and buf[j] in " \t\r\n,":
+                j += 1
+            ib, i = ib + (j - i), j  # boşluk ve virgül tek baytlıktır
+            if j < len(buf) or not refill():
+                break
+            j = i
+        if i >= len(buf):
+            break
+        ch = buf[i]
+        if not started:
+            if ch != "[":
+                raise ValueError(f"{path}: müşteri listesi bir JSON dizisi olmalı")
+            started, i, ib = True, i + 1, ib + 1
+            continue
+        if ch == "]":
+            break
+        while True:
+            try:
+                rec, end = decoder.raw_decode(buf, i)
+                break
+            except json.JSONDecodeError:
+                if not refill():
+                    raise
+        n = len(buf[i:end].encode("utf-8"))
+        offsets.append(base + ib)
+        lengths.append(n)
+        keys = CustomerStore._keys_for(rec) if isinstance(rec, dict) else ("", "", "")
+        for field, key in enumerate(keys):
+            raw_hashes[field].append(_h(key) if key else 0)
+        i, ib = end, ib + n
+    if not started:
+        raise ValueError(f"{path}: müşteri listesi bir JSON dizisi olmalı")
+    return offsets, lengths, raw_hashes
+
+
+class LazyCustomerStore(CustomerStore):
+    """Çok büyük user.json için tembel depo: yalnızca bayt aralıkları ve kimlik hash'leri bellekte."""
+
+    def __init__(self, path: str, journal_path: Optional[str] = None, compact_every: int = 500):
+        super().__init__(path, journal_path=journal_path, compact_every=compact_every)
+        self._snap: Optional[_Snapshot] = None
+        self._overlay: Dict[int, dict] = {}
+        self._ov_idx: Tuple[Dict[str, int], Dict[str, int], Dict[str, int]] = ({}, {}, {})
+        # Katmana son yazılış sırası: sıkıştırmadan sonra yazılanlar katmanda kalır.
+        self._seq = 0
+        self._written: Dict[int, int] = {}
+
+    # ----------------------- yükleme -----------------------
+    def sync(self) -> None:
+        with self._lock:
+            stamp = self._file_stamp()
+            if stamp is None or stamp != self._stamp:
+                snap = _scan(self.path)
+                self._snap = snap
+                self._overlay, self._ov_idx = {}, ({}, {}, {})
+                self._keys, self._pos, self._written = {}, {}, {}
+                self._journal_offset = 0
+                # Taranan dosyanın damgası (stat ile açma arasında değişmiş olabilir).
+                self._stamp = snap.stamp
+                self.external += 1
+                log.debug("Tembel indeks kuruldu: %d müşteri (%s)", len(snap), self.path)
+            self._replay_journal()
+
+    def invalidate(self) -> None:
+        # Tüm dosyayı yeniden taramak yerine yalnızca katmandaki kayıtları
+        # kalıcı hallerine (snapshot + günlük) döndürür.
+        with self._lock:
+            snap = self._snap
+            if snap is None:
+                return
+            for pos in list(self._overlay):
+                self._set(pos, snap.record(pos))
+            self._journal_offset = 0
+            self._replay_journal()
+
+    def _apply(self, entry: dict) -> None:
+        pos, rec, cid = entry.get("pos"), entry.get("record"), entry.get("customer_id")
+        if not isinstance(rec, dict):
+            return
+        snap = self._snap
+        if not (isinstance(pos, int) and 0 <= pos < len(snap) and self._record_at(snap, pos).get("customer_id") == cid):
+            pos = self._lookup(snap, 1, cid)[0] if cid else None
+            if pos is None:
+                return
+        self._set(pos, rec)
+
+    # ----------------------- katman -----------------------
+    def _record_at(self, snap: _Snapshot, pos: int) -> dict:
+        rec = self._overlay.get(pos)
+        return rec if rec is not None else snap.record(pos)
+
+    def _set(self, pos: int, rec: dict) -> None:
+        old = self._overlay.get(pos)
+        if old is not None:
+            self._pos.pop(id(old), None)
+            for key, idx in zip(self._keys.pop(pos, ("", "", "")), self._ov_idx):
+                if key and idx.get(key) == pos:
+                    del idx[key]
+        keys = self._keys_for(rec)
+        for key, idx in zip(keys, self._ov_idx):
+            if key and idx.get(key, pos + 1) > pos:
+                idx[key] = pos
+        self._overlay[pos] = rec
+        self._keys[pos] = keys
+        self._pos[id(rec)] = pos
+        self._seq += 1
+        self._written[pos] = self._seq
+
+    def _drop(self, pos: int) -> None:
+        # Kayıt artık dosyadakiyle aynı; katmandan çıkar, dosyadan okunur.
+        self._pos.pop(id(self._overlay.pop(pos)), None)
+        del self._written[pos]
+        for key, idx in zip(self._keys.pop(pos, ("", "", "")), self._ov_idx):
+            if key and idx.get(key) == pos:
+                del idx[key]
+
+    def _lookup(self, snap: _Snapshot, field: int, key: str) -> Tuple[Optional[int], Optional[dict]]:
+        """Alanı `key` olan en küçük konumlu müşteri: katman indeksi + doğrulanmış dosya adayları."""
+        ov = self._ov_idx[field].get(key)
+        for pos in snap.candidates(field, key):
+            if ov is not None and pos > ov:
+                break
+            if pos in self._overlay:
+                continue  # katmandaki kayıtlar kendi indeksinden bulunur
+            rec = snap.record(pos)
+            if self._keys_for(rec)[field] == key:
+                return pos, rec
+        if ov is not None:
+            return ov, self._overlay.get(ov)
+        return None, None
+
+    def reindex(self, u: dict) -> None:
+        with self._lock:
+            pos = self._pos.get(id(u))
+            if pos is not None and self._overlay.get(pos) is u and self._keys_for(u) != self._keys.get(pos):
+                self._set(pos, u)
+
+    # ----------------------- sorgular -----------------------
+    def users(self) -> List[dict]:
+        """Tüm müşterileri ayrıştırır; tembel modun amacına aykırıdır, yalnızca uyumluluk için."""
+        self.refresh()
+        snap = self._snap
+        return [self._record_at(snap, pos) for pos in range(len(snap))]
+
+    def find(self, identifier: str) -> Optional[dict]:
+        self.refresh()
+        snap, ident = self._snap, identifier or ""
+        best, found = None, None
+        for field, key in enumerate((ident, ident, normalize_phone(ident) if ident else "")):
+            if not key:
+                continue
+            pos, rec = self._lookup(snap, field, key)
+            if pos is not None and (best is None or pos < best):
+                best, found = pos, rec
+        return found
+
+    def find_by_phone(self, phone: str) -> Optional[dict]:
+        self.refresh()
+        key = normalize_phone(phone)
+        return self._lookup(self._snap, 2, key)[1] if key else None
+
+    def has_phone(self, phone: str) -> bool:
+        return self.find_by_phone(phone) is not None
+
+    # ----------------------- kalıcılık -----------------------
+    def _locate(self, u: dict) -> Optional[int]:
+        pos = self._pos.get(id(u))
+        if pos is not None and self._overlay.get(pos) is u:
+            return pos
+        # Dosyadan yeni ayrıştırılmış kayıt: değişmeyen kimlik alanıyla konumla.
+        for field, key in ((1, u.get("customer_id")), (0, u.get("tc_no"))):
+            if key:
+                pos = self._lookup(self._snap, field, key)[0]
+                if pos is not None:
+                    return pos
+        return None
+
+    def save(self, changed: Iterable[dict] = ()) -> None:
+        changed = list(changed)
+        with self._lock:
+            items = []
+            for u in changed:
+                pos = self._locate(u)
+                if pos is None:
+                    log.warning("Kaydedilecek müşteri dosyada bulunamadı: %s", u.get("customer_id"))
+                    continue
+                self._set(pos, u)
+                items.append((pos, u))
+            if self.journal is None or not changed:
+                self._rewrite()
+                if self.journal is not None:
+                    self.journal.truncate_before(self.journal.size())
+                    self._journal_offset = 0
+                return
+            if not items:
+                return
+            start, end = self.journal.append(items)
+            if start == self._journal_offset:
+                self._journal_offset = end
+            if self.journal.entries >= self.compact_every:
+                self._start_compaction()
+
+    def _dump_overlay(self) -> Dict[int, bytes]:
+        return {pos: json.dumps(rec, ensure_ascii=False).encode("utf-8") for pos, rec in self._overlay.items()}
+
+    def _write_stream(self, snap: _Snapshot, overlay: Dict[int, bytes]) -> Tuple[str, array, array]:
+        """Dosyayı akış halinde yazar: katmandakiler serileştirilmiş, diğerleri ham bayt olarak."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        offsets, lengths = array("q"), array("q")
+        with open(tmp, "wb", buffering=_CHUNK) as f:
+            f.write(b"[\n")
+            written = 2
+            for pos in range(len(snap)):
+                data = overlay.get(pos)
+                if data is None:
+                    data = snap.raw(pos)
+                if pos:
+                    f.write(b",\n")
+                    written += 2
+                offsets.append(written)
+                lengths.append(len(data))
+                f.write(data)
+                written += len(data)
+            f.write(b"\n]\n")
+            f.flush()
+            os.fsync(f.fileno())
+        return tmp, offsets, lengths
+
+    def _install(self, tmp: str, snap: _Snapshot, offsets: array, lengths: array,
+                 overlay: Dict[int, bytes], index: Tuple[tuple, tuple], seq: int) -> None:
+        os.replace(tmp, self.path)
+        f = open(self.path, "rb")
+        st = os.fstat(f.fileno())
+        # Eski tanıtıcı, onu okuyan iş parçacıkları bitince çöp toplayıcıyla kapanır.
+        self._snap = _Snapshot(f, (st.st_ino, st.st_mtime_ns, st.st_size), offsets, lengths, *index)
+        self._stamp = self._snap.stamp
+        # Yazılan kayıtlar dosyada; `seq`'ten sonra yeniden yazılanlar katmanda kalır.
+        for pos in overlay:
+            if self._written.get(pos, seq + 1) <= seq:
+                self._drop(pos)
+
+    def _rewrite(self) -> None:
+        snap, overlay = self._snap, self._dump_overlay()
+        tmp, offsets, lengths = self._write_stream(snap, overlay)
+        self._install(tmp, snap, offsets, lengths, overlay, _rekeyed(snap, overlay), self._seq)
+
+    def compact(self) -> None:
+        if self.journal is None:
+            return
+        with self.process_lock:
+            with self.locks.acquire_all(), self._lock:
+                snap, seq = self._snap, self._seq
+                overlay = self._dump_overlay()
+                offset = self._journal_offset
+            tmp, offsets, lengths = self._write_stream(snap, overlay)
+            index = _rekeyed(snap, overlay)
+            with self._lock:
+                if self._snap is not snap:  # arada dosya dışarıdan değişti ve yeniden tarandı
+                    os.remove(tmp)
+                    return
+                self._install(tmp, snap, offsets, lengths, overlay, index, seq)
+                self.journal.truncate_before(offset)
+                self._journal_offset = self.journal.size()
+        log.debug("Tembel müşteri deposu sıkıştırıldı: %s", self.path)
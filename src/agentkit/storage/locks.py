@@ -0,0 +1,96 @@
+# src/agentkit/storage/locks.py
+from __future__ import annotations
+
+import os
+import zlib
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: süreçler arası kilit yok, yalnızca süreç içi kilit
+    fcntl = None  # type: ignore
+
+
+class StripedLock:
+    """Müşteri anahtarına göre şeritlenmiş kilitler; birden çok şerit sıralı alınır."""
+
+    def __init__(self, stripes: int = 64):
+        self._locks = [threading.RLock() for _ in range(max(1, stripes))]
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    def stripe(self, key: str) -> int:
+        return zlib.crc32((key or "").encode("utf-8")) % len(self._locks)
+
+    @contextmanager
+    def acquire_many(self, keys: Iterable[str]) -> Iterator[None]:
+        with self._acquire_stripes(sorted({self.stripe(k) for k in keys})):
+            yield
+
+    @contextmanager
+    def acquire_all(self) -> Iterator[None]:
+        """Tüm şeritleri alır (ör. snapshot sıkıştırma sırasında yazmaları durdurmak için)."""
+        with self._acquire_stripes(range(len(self._locks))):
+            yield
+
+    @contextmanager
+    def _acquire_stripes(self, idxs: Iterable[int]) -> Iterator[None]:
+        held: List[threading.RLock] = []
+        try:
+            for i in idxs:
+                self._locks[i].acquire()
+                held.append(self._locks[i])
+            yield
+        finally:
+            for lk in reversed(held):
+                lk.release()
+
+
+class InterProcessLock:
+    """Aynı veri dizinini paylaşan süreçler arasında `flock` kilidi; süreç içinde referans sayımlı."""
+
+    def __init__(self, path: str, on_acquire: Optional[Callable[[], None]] = None):
+        self.path = path
+        self.on_acquire = on_acquire
+        self._mutex = threading.Lock()
+        self._count = 0
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> None:
+        with self._mutex:
+            if self._count == 0:
+                if fcntl is not None:
+                    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                    self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                    fcntl.flock(self._fd, fcntl.LOCK_EX)
+                try:
+                    if self.on_acquire is not None:
+                        self.on_acquire()
+                except BaseException:
+                    self._unlock()
+                    raise
+            self._count += 1
+
+    def release(self) -> None:
+        with self._mutex:
+            self._count -= 1
+            if self._count == 0:
+                self._unlock()
+
+    def _unlock(self) -> None:
+        if self._fd is not None:
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            finally:
+                os.close(self._fd)
+                self._fd = None
+
+    def __enter__(self) -> "InterProcessLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
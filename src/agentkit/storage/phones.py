@@ -0,0 +1,50 @@
+# src/agentkit/storage/phones.py
+"""Yeni telefon numarası tahsisi (rastgele çekim, arka ucun telefon indeksiyle çakışma kontrolü)."""
+from __future__ import annotations
+
+import random
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, Set
+
+PHONE_PREFIX = "05"
+PHONE_SPACE = 10 ** 9
+
+
+class PhoneSpaceExhausted(RuntimeError):
+    pass
+
+
+class PhoneAllocator:
+    def __init__(self, is_taken: Callable[[str], bool], max_attempts: int = 1000):
+        self.is_taken = is_taken
+        self.max_attempts = max_attempts
+        self._reserved: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> str:
+        """Boş bir numarayı rezerve eder; kayıt yazıldıktan (veya vazgeçildikten) sonra `release` edilmeli."""
+        for _ in range(self.max_attempts):
+            num = f"{PHONE_PREFIX}{random.randrange(PHONE_SPACE):09d}"
+            with self._lock:
+                if num in self._reserved:
+                    continue
+                self._reserved.add(num)
+            if not self.is_taken(num):
+                return num
+            self.release(num)
+        raise PhoneSpaceExhausted(f"{self.max_attempts} denemede boş numara bulunamadı")
+
+    def release(self, num: str) -> None:
+        with self._lock:
+            self._reserved.discard(num)
+
+    @contextmanager
+    def allocate(self) -> Iterator[str]:
+        """Blok boyunca rezerve edilen numara; blok içinde müşteriye yazılıp kaydedilmeli."""
+        num = self.reserve()
+        try:
+            yield num
+        finally:
+            self.release(num)
+
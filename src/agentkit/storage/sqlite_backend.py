@@ -0,0 +1,386 @@
+# src/agentkit/storage/sqlite_backend.py
+from __future__ import annotations
+
+import os
+import json
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional
+
+from agentkit.storage.base import EDITABLE_BILL_STATUSES, StorageBackend
+from agentkit.storage.store import normalize_phone
+from agentkit.storage.timeline import parse_date, parse_datetime
+
+log = logging.getLogger(__name__)
+
+# Müşteri dokümanından ayrı tablolara taşınan alt koleksiyonlar.
+_CHILD_KEYS = ("bills", "appointments", "blocked_numbers")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS customers (
+    customer_id TEXT PRIMARY KEY,
+    pos         INTEGER NOT NULL,
+    tc_no       TEXT,
+    phone       TEXT,
+    doc         TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_customers_tc ON customers(tc_no);
+CREATE INDEX IF NOT EXISTS ix_customers_phone ON customers(phone);
+
+CREATE TABLE IF NOT EXISTS bills (
+    customer_id TEXT NOT NULL,
+    seq         INTEGER NOT NULL,
+    bill_id     TEXT,
+    bill_date   TEXT,
+    status      TEXT,
+    doc         TEXT NOT NULL,
+    PRIMARY KEY (customer_id, seq)
+);
+CREATE INDEX IF NOT EXISTS ix_bills_date ON bills(customer_id, bill_date);
+CREATE INDEX IF NOT EXISTS ix_bills_id ON bills(customer_id, bill_id);
+
+CREATE TABLE IF NOT EXISTS appointments (
+    customer_id TEXT NOT NULL,
+    seq         INTEGER NOT NULL,
+    sort_key    TEXT,
+    doc         TEXT NOT NULL,
+    PRIMARY KEY (customer_id, seq)
+);
+CREATE INDEX IF NOT EXISTS ix_appointments_sort ON appointments(customer_id, sort_key);
+
+CREATE TABLE IF NOT EXISTS blocked_numbers (
+    customer_id TEXT NOT NULL,
+    seq         INTEGER NOT NULL,
+    number      TEXT NOT NULL,
+    PRIMARY KEY (customer_id, seq)
+);
+CREATE INDEX IF NOT EXISTS ix_blocked_number ON blocked_numbers(customer_id, number);
+
+CREATE TABLE IF NOT EXISTS packages (
+    seq  INTEGER PRIMARY KEY,
+    id   TEXT,
+    name TEXT,
+    doc  TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _norm_date(s, fmt: str) -> Optional[str]:
+    # Geçerli tarihler ISO biçiminde saklanır; metin sıralaması tarih sırasıdır.
+    try:
+        return datetime.strptime(s, fmt).strftime(fmt)
+    except (TypeError, ValueError):
+        return None
+
+
+def _dumps(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False)
+
+
+class SqliteBackend(StorageBackend):
+    """Gömülü SQLite arka ucu; fatura, randevu ve engelli numaralar indeksli tablolarda."""
+
+    name = "sqlite"
+
+    def __init__(self, db_path: str, user_db: Optional[str] = None, package_db: Optional[str] = None):
+        super().__init__()
+        self.db_path = db_path
+        self.user_db = user_db
+        self.package_db = package_db
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        con = self._con()
+        con.executescript(_SCHEMA)
+        con.execute("INSERT OR IGNORE INTO meta(key, value) VALUES ('data_version', '0')")
+        self._import_if_empty()
+        self._version_lock = threading.Lock()
+        self._seen_version = self._external_version()
+
+    # ----------------------- bağlantı -----------------------
+    def _con(self) -> sqlite3.Connection:
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None)
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("PRAGMA synchronous=NORMAL")
+            self._local.con = con
+            self._local.depth = 0
+            self._local.changed = []
+            self._local.bump = None
+        return con
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Açık bir işlem içindeyse ona katılır, değilse kendi işlemini açıp kapatır."""
+        con = self._con()
+        if self._local.depth:
+            yield con
+            return
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            yield con
+        except BaseException:
+            con.execute("ROLLBACK")
+            self._local.changed, self._local.bump = [], None
+            raise
+        con.execute("COMMIT")
+        self._committed()
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        con = self._con()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield
+            finally:
+                self._local.depth -= 1
+            return
+        con.execute("BEGIN IMMEDIATE")
+        self._local.depth = 1
+        try:
+            yield
+        except BaseException:
+            con.execute("ROLLBACK")
+            self._local.changed, self._local.bump = [], None
+            raise
+        else:
+            con.execute("COMMIT")
+        finally:
+            self._local.depth = 0
+        self._committed()
+
+    def _committed(self) -> None:
+        # Dinleyiciler COMMIT'ten sonra çağrılır; öncesinde okuyan başka bir
+        # iş parçacığı eski veriyi önbelleğe geri koyamasın.
+        changed, self._local.changed = self._local.changed, []
+        bump, self._local.bump = self._local.bump, None
+        if bump is not None:
+            with self._version_lock:
+                # Araya başka sürecin yazması girmediyse sürüm artışı bizimdir, önbelleği boşaltmaz.
+                if self._seen_version == bump[0]:
+                    self._seen_version = bump[1]
+        if changed:
+            self._notify(changed)
+
+    def _external_version(self) -> int:
+        return int(self._con().execute("SELECT value FROM meta WHERE key = 'data_version'").fetchone()[0])
+
+    def close(self) -> None:
+        con = getattr(self._local, "con", None)
+        if con is not None:
+            con.close()
+            self._local.con = None
+
+    # ----------------------- içe aktarma -----------------------
+    def _import_if_empty(self) -> None:
+        # Boşluk kontrolü yazma kilidi altında: aynı anda açılan süreçler
+        # içe aktarmayı yalnızca bir kez yapar, canlı veriyi ezmez.
+        if self.user_db and os.path.exists(self.user_db):
+            with self._write() as con:
+                if con.execute("SELECT 1 FROM customers LIMIT 1").fetchone() is None:
+                    with open(self.user_db, encoding="utf-8") as f:
+                        users = json.load(f)
+                    for pos, u in enumerate(users):
+                        self._write_customer(con, u, pos)
+                    log.info("SQLite: %d müşteri içe aktarıldı (%s)", len(users), self.user_db)
+        self._sync_packages()
+
+    def _package_stamp(self) -> Optional[str]:
+        try:
+            st = os.stat(self.package_db) if self.package_db else None
+        except OSError:
+            return None
+        return f"{st.st_mtime_ns}:{st.st_size}" if st else None
+
+    def _sync_packages(self) -> None:
+        """packages.json içe aktarılandan farklıysa (mtime/boyut) paket tablosunu yeniler."""
+        stamp = self._package_stamp()
+        if stamp is None:
+            return
+        q = "SELECT value FROM meta WHERE key = 'packages_stamp'"
+        row = self._con().execute(q).fetchone()
+        if row and row[0] == stamp:
+            return
+        with open(self.package_db, encoding="utf-8") as f:
+            pkgs = json.load(f)
+        with self._write() as con:
+            row = con.execute(q).fetchone()
+            if row and row[0] == stamp:
+                return
+            con.execute("DELETE FROM packages")
+            con.executemany(
+                "INSERT INTO packages(seq, id, name, doc) VALUES (?, ?, ?, ?)",
+                [(i, p.get("id"), p.get("name"), _dumps(p)) for i, p in enumerate(pkgs)],
+            )
+            con.execute("INSERT OR REPLACE INTO meta(key, value) VALUES ('packages_stamp', ?)", (stamp,))
+
+    def _write_customer(self, con: sqlite3.Connection, u: dict, pos: Optional[int] = None) -> None:
+        cid = u.get("customer_id")
+        if pos is None:
+            row = con.execute("SELECT pos FROM customers WHERE customer_id = ?", (cid,)).fetchone()
+            pos = row[0] if row else con.execute("SELECT COALESCE(MAX(pos) + 1, 0) FROM customers").fetchone()[0]
+        doc = {k: v for k, v in u.items() if k not in _CHILD_KEYS}
+        # Alt koleksiyonun var olup olmadığı (boş liste vs. hiç yok) da korunur.
+        doc["__children__"] = [k for k in _CHILD_KEYS if k in u]
+        con.execute(
+            "INSERT OR REPLACE INTO customers(customer_id, pos, tc_no, phone, doc) VALUES (?, ?, ?, ?, ?)",
+            (cid, pos, u.get("tc_no"), normalize_phone(u.get("phone_number", "")), _dumps(doc)),
+        )
+        for table in _CHILD_KEYS:
+            con.execute(f"DELETE FROM {table} WHERE customer_id = ?", (cid,))
+        con.executemany(
+            "INSERT INTO bills(customer_id, seq, bill_id, bill_date, status, doc) VALUES (?, ?, ?, ?, ?, ?)",
+            [(cid, i, b.get("bill_id"), _norm_date(b.get("bill_date"), "%Y-%m-%d"), b.get("status"), _dumps(b))
+             for i, b in enumerate(u.get("bills", []))],
+        )
+        con.executemany(
+            "INSERT INTO appointments(customer_id, seq, sort_key, doc) VALUES (?, ?, ?, ?)",
+            [(cid, i, _norm_date(f"{a.get('date')} {a.get('time')}", "%Y-%m-%d %H:%M"), _dumps(a))
+             for i, a in enumerate(u.get("appointments", []))],
+        )
+        con.executemany(
+            "INSERT INTO blocked_numbers(customer_id, seq, number) VALUES (?, ?, ?)",
+            [(cid, i, n) for i, n in enumerate(u.get("blocked_numbers", []))],
+        )
+
+    def _assemble(self, con: sqlite3.Connection, cid: str, doc_text: str) -> dict:
+        u = json.loads(doc_text)
+        present = u.pop("__children__", list(_CHILD_KEYS))
+        if "bills" in present:
+            u["bills"] = [json.loads(r[0]) for r in con.execute("SELECT doc FROM bills WHERE customer_id = ? ORDER BY seq", (cid,))]
+        if "appointments" in present:
+            u["appointments"] = [json.loads(r[0]) for r in con.execute("SELECT doc FROM appointments WHERE customer_id = ? ORDER BY seq", (cid,))]
+        if "blocked_numbers" in present:
+            u["blocked_numbers"] = [r[0] for r in con.execute("SELECT number FROM blocked_numbers WHERE customer_id = ? ORDER BY seq", (cid,))]
+        return u
+
+    # ----------------------- müşteriler -----------------------
+    def users(self) -> List[dict]:
+        con = self._con()
+        rows = con.execute("SELECT customer_id, doc FROM customers ORDER BY pos").fetchall()
+        return [self._assemble(con, cid, doc) for cid, doc in rows]
+
+    def find(self, identifier: str) -> Optional[dict]:
+        ident = identifier or ""
+        con = self._con()
+        row = con.execute(
+            "SELECT customer_id, doc FROM customers WHERE tc_no = ? OR customer_id = ? OR (phone = ? AND phone != '') "
+            "ORDER BY pos LIMIT 1",
+            (ident, ident, normalize_phone(ident)),
+        ).fetchone()
+        return self._assemble(con, *row) if row else None
+
+    def find_by_phone(self, phone: str) -> Optional[dict]:
+        con = self._con()
+        row = con.execute(
+            "SELECT customer_id, doc FROM customers WHERE phone = ? ORDER BY pos LIMIT 1", (normalize_phone(phone),)
+        ).fetchone()
+        return self._assemble(con, *row) if row else None
+
+    def has_phone(self, phone: str) -> bool:
+        row = self._con().execute("SELECT 1 FROM customers WHERE phone = ? LIMIT 1", (normalize_phone(phone),)).fetchone()
+        return row is not None
+
+    def save(self, changed: Iterable[dict] = ()) -> None:
+        changed = list(changed)
+        with self._write() as con:
+            for u in changed:
+                self._write_customer(con, u)
+            self._local.changed.extend(changed)
+            # Başka süreçlerin önbellekleri bu sayaçla değişikliği fark eder (`poll`).
+            version = int(con.execute("SELECT value FROM meta WHERE key = 'data_version'").fetchone()[0])
+            con.execute("UPDATE meta SET value = ? WHERE key = 'data_version'", (str(version + 1),))
+            first = self._local.bump[0] if self._local.bump else version
+            self._local.bump = (first, version + 1)
+
+    # ----------------------- paketler -----------------------
+    def load_packages(self) -> List[dict]:
+        self._sync_packages()
+        return [json.loads(r[0]) for r in self._con().execute("SELECT doc FROM packages ORDER BY seq")]
+
+    def packages_version(self) -> Optional[str]:
+        # Katalog dosyası yoksa tablo tek kaynaktır ve değişmez.
+        return self._package_stamp() or "db"
+
+    # ----------------------- indeksli sorgular -----------------------
+    # Sorgular yalnızca sıra numarasını (seq) döndürür; araçlar kaydı yerinde
+    # değiştirebilsin diye müşteri dict'indeki aynı nesne verilir.
+    @staticmethod
+    def _pick(customer: dict, key: str, row) -> Optional[dict]:
+        items = customer.get(key, [])
+        return items[row[0]] if row and row[0] < len(items) else None
+
+    def bill_by_id(self, customer: dict, bill_id: str) -> Optional[dict]:
+        row = self._con().execute(
+            "SELECT seq FROM bills WHERE customer_id = ? AND bill_id = ? ORDER BY seq LIMIT 1",
+            (customer.get("customer_id"), bill_id),
+        ).fetchone()
+        return self._pick(customer, "bills", row)
+
+    # Tarihi ayrıştırılamayan kayıtlarda (sütun NULL) hata, JSON arka ucundaki
+    # (CustomerTimeline) ile aynı olsun diye müşteri dict'indeki değerden yeniden üretilir.
+    @staticmethod
+    def _bad_bill(customer: dict, seq: int, missing_ok: bool = False) -> None:
+        bills = customer.get("bills", [])
+        b = bills[seq] if seq < len(bills) else {}
+        if "bill_date" not in b:
+            if missing_ok:
+                return
+            raise KeyError("bill_date")
+        parse_date(b["bill_date"])
+        raise ValueError("fatura tarihi YYYY-MM-DD biçiminde değil")
+
+    @staticmethod
+    def _bad_appointment(customer: dict, seq: int) -> None:
+        apps = customer.get("appointments", [])
+        a = apps[seq] if seq < len(apps) else {}
+        parse_datetime(f"{a['date']} {a['time']}")
+        raise ValueError("randevu tarihi/saati YYYY-MM-DD HH:MM biçiminde değil")
+
+    def latest_bill(self, customer: dict) -> Optional[dict]:
+        con, cid = self._con(), customer.get("customer_id")
+        bad = con.execute(
+            "SELECT seq FROM bills WHERE customer_id = ? AND bill_date IS NULL ORDER BY seq LIMIT 1", (cid,)
+        ).fetchone()
+        if bad:
+            self._bad_bill(customer, bad[0])
+        row = con.execute(
+            "SELECT seq FROM bills WHERE customer_id = ? ORDER BY bill_date DESC, seq LIMIT 1", (cid,)
+        ).fetchone()
+        return self._pick(customer, "bills", row)
+
+    def latest_editable_bill(self, customer: dict) -> Optional[dict]:
+        con, cid = self._con(), customer.get("customer_id")
+        for (seq,) in con.execute(
+            "SELECT seq FROM bills WHERE customer_id = ? AND status IN (?, ?) AND bill_date IS NULL ORDER BY seq",
+            (cid, *EDITABLE_BILL_STATUSES),
+        ).fetchall():
+            # JSON arka ucundaki gibi yalnızca `bill_date` alanı hiç olmayan fatura 1900-01-01 sayılır.
+            self._bad_bill(customer, seq, missing_ok=True)
+        row = con.execute(
+            "SELECT seq FROM bills WHERE customer_id = ? AND status IN (?, ?) "
+            "ORDER BY COALESCE(bill_date, '1900-01-01') DESC, seq LIMIT 1",
+            (cid, *EDITABLE_BILL_STATUSES),
+        ).fetchone()
+        return self._pick(customer, "bills", row)
+
+    def latest_appointment(self, customer: dict) -> Optional[dict]:
+        con, cid = self._con(), customer.get("customer_id")
+        bad = con.execute(
+            "SELECT seq FROM appointments WHERE customer_id = ? AND sort_key IS NULL ORDER BY seq LIMIT 1", (cid,)
+        ).fetchone()
+        if bad:
+            self._bad_appointment(customer, bad[0])
+        row = con.execute(
+            "SELECT seq FROM appointments WHERE customer_id = ? ORDER BY sort_key DESC, seq LIMIT 1", (cid,)
+        ).fetchone()
+        return self._pick(customer, "appointments", row)
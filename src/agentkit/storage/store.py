@@ -0,0 +1,238 @@
+# src/agentkit/storage/store.py
+from __future__ import annotations
+
+import os
+import json
+import threading
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from agentkit.storage.journal import MutationJournal
+from agentkit.storage.locks import InterProcessLock, StripedLock
+
+log = logging.getLogger(__name__)
+
+
+def normalize_phone(s: str) -> str:
+    return (s or "").replace(" ", "").replace("-", "")
+
+
+class CustomerStore:
+    """user.json için süreç içi müşteri deposu; kimlik alanlarına hash indeksli, isteğe bağlı günlüklü."""
+
+    def __init__(self, path: str, journal_path: Optional[str] = None, compact_every: int = 500):
+        self.path = path
+        self.journal = MutationJournal(journal_path) if journal_path else None
+        self.compact_every = compact_every
+        self._compacting: Optional[threading.Thread] = None
+        self._lock = threading.RLock()
+        self._users: List[dict] = []
+        self._by_tc: Dict[str, int] = {}
+        self._by_id: Dict[str, int] = {}
+        self._by_phone: Dict[str, int] = {}
+        self._keys: Dict[int, Tuple[str, str, str]] = {}
+        self._pos: Dict[int, int] = {}
+        self._stamp: Optional[Tuple[int, int, int]] = None
+        # Diskten (başka süreçlerin yazdığı) değişiklik uygulandıkça artar; kendi yazmalarımız saymaz.
+        self.external = 0
+        self._journal_offset = 0
+        self.locks = StripedLock()
+        self.process_lock = InterProcessLock(path + ".lock", on_acquire=self.sync)
+
+    # ----------------------- yükleme -----------------------
+    def _file_stamp(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def refresh(self) -> None:
+        """Dosya ilk kez okunmadıysa veya diskte değiştiyse yeniden yükler."""
+        stamp = self._file_stamp()
+        if stamp is not None and stamp == self._stamp:
+            if self.journal is None or self.journal.size() == self._journal_offset:
+                return
+        self.sync()
+
+    def sync(self) -> None:
+        """
+        Bellekteki durumu diskle eşitler: snapshot değiştiyse baştan yükler,
+        değişmediyse yalnızca günlüğün yeni kuyruğunu uygular.
+        """
+        with self._lock:
+            stamp = self._file_stamp()
+            if stamp is None or stamp != self._stamp:
+                with open(self.path, encoding="utf-8") as f:
+                    users = json.load(f)
+                self._reset(users)
+                self._journal_offset = 0
+                self._stamp = stamp
+                self.external += 1
+            self._replay_journal()
+
+    def invalidate(self) -> None:
+        """Bir sonraki erişimde diskten baştan yüklemeye zorlar (ör. yarıda kalan işlem)."""
+        with self._lock:
+            self._stamp = None
+
+    def _replay_journal(self) -> None:
+        if self.journal is None:
+            return
+        applied = 0
+        for offset, entry in self.journal.replay(self._journal_offset):
+            self._apply(entry)
+            self._journal_offset = offset
+            applied += 1
+        if applied:
+            self.external += 1
+            log.debug("Günlükten %d müşteri kaydı uygulandı: %s", applied, self.journal.path)
+
+    def _apply(self, entry: dict) -> None:
+        pos, rec = entry.get("pos"), entry.get("record")
+        if not isinstance(rec, dict):
+            return
+        cid = entry.get("customer_id")
+        if not (isinstance(pos, int) and 0 <= pos < len(self._users) and self._users[pos].get("customer_id") == cid):
+            # Snapshot elle düzenlenmiş olabilir; müşteri ID ile yeniden konumla.
+            pos = self._by_id.get(cid) if cid else None
+            if pos is None:
+                return
+        self._unindex(pos)
+        self._pos.pop(id(self._users[pos]), None)
+        self._users[pos] = rec
+        self._index(pos, rec)
+
+    def _reset(self, users: List[dict]) -> None:
+        self._users = users
+        self._by_tc, self._by_id, self._by_phone = {}, {}, {}
+        self._keys, self._pos = {}, {}
+        for pos, u in enumerate(users):
+            self._index(pos, u)
+
+    # ----------------------- indeksler -----------------------
+    @staticmethod
+    def _keys_for(u: dict) -> Tuple[str, str, str]:
+        return (u.get("tc_no") or "", u.get("customer_id") or "", normalize_phone(u.get("phone_number", "")))
+
+    def _index(self, pos: int, u: dict) -> None:
+        keys = self._keys_for(u)
+        for key, idx in zip(keys, (self._by_tc, self._by_id, self._by_phone)):
+            if key:
+                # Değer listedeki sıra; eski doğrusal taramadaki gibi ilk eşleşen müşteri kazanır.
+                idx.setdefault(key, pos)
+        self._keys[pos] = keys
+        self._pos[id(u)] = pos
+
+    def _unindex(self, pos: int) -> None:
+        for key, idx in zip(self._keys.pop(pos, ("", "", "")), (self._by_tc, self._by_id, self._by_phone)):
+            if key and idx.get(key) == pos:
+                del idx[key]
+
+    def reindex(self, u: dict) -> None:
+        """Kimlik alanları değişen müşterinin indeks girdilerini günceller."""
+        with self._lock:
+            pos = self._pos.get(id(u))
+            if pos is None or self._users[pos] is not u:
+                return
+            if self._keys_for(u) == self._keys.get(pos):
+                return
+            self._unindex(pos)
+            self._index(pos, u)
+
+    # ----------------------- sorgular -----------------------
+    def users(self) -> List[dict]:
+        self.refresh()
+        return self._users
+
+    def find(self, identifier: str) -> Optional[dict]:
+        """T.C. no, müşteri ID veya telefon numarasıyla O(1) arama."""
+        self.refresh()
+        ident = identifier or ""
+        hits = [
+            self._by_tc.get(ident),
+            self._by_id.get(ident),
+            self._by_phone.get(normalize_phone(ident)) if ident else None,
+        ]
+        hits = [h for h in hits if h is not None]
+        return self._users[min(hits)] if hits else None
+
+    def find_by_phone(self, phone: str) -> Optional[dict]:
+        self.refresh()
+        pos = self._by_phone.get(normalize_phone(phone))
+        return self._users[pos] if pos is not None else None
+
+    def has_phone(self, phone: str) -> bool:
+        self.refresh()
+        return normalize_phone(phone) in self._by_phone
+
+    # ----------------------- kalıcılık -----------------------
+    def save(self, changed: Iterable[dict] = ()) -> None:
+        """
+        Değişen müşterileri yeniden indeksler ve kalıcı hale getirir.
+
+        Günlük açıksa yalnızca `changed` kayıtları eklenir; değilse (veya
+        `changed` boşsa) liste tümüyle diske yazılır.
+        """
+        changed = list(changed)
+        with self._lock:
+            for u in changed:
+                self.reindex(u)
+            if self.journal is None or not changed:
+                self._write_snapshot(json.dumps(self._users, ensure_ascii=False, indent=2))
+                if self.journal is not None:
+                    self.journal.truncate_before(self.journal.size())
+                    self._journal_offset = 0
+                return
+            items = [(self._pos[id(u)], u) for u in changed if id(u) in self._pos]
+            start, end = self.journal.append(items)
+            if start == self._journal_offset:
+                # Arada başka sürecin satırı yoksa kendi yazdığımızı yeniden oynatmayız.
+                self._journal_offset = end
+            if self.journal.entries >= self.compact_every:
+                self._start_compaction()
+
+    def _write_snapshot(self, text: str) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._stamp = self._file_stamp()
+
+    def _start_compaction(self) -> None:
+        if self._compacting is not None and self._compacting.is_alive():
+            return
+        self._compacting = threading.Thread(target=self.compact, name="customer-store-compaction", daemon=True)
+        self._compacting.start()
+
+    def compact(self) -> None:
+        """Snapshot'ı günceller ve snapshot'a giren günlük satırlarını atar."""
+        if self.journal is None:
+            return
+        with self.process_lock:
+            # Serileştirme sırasında hiçbir iş parçacığı kaydı yerinde değiştirmesin.
+            with self.locks.acquire_all(), self._lock:
+                text = json.dumps(self._users, ensure_ascii=False, indent=2)
+                offset = self._journal_offset
+            # Disk yazması şerit kilitleri dışında; bu arada gelen yazmalar
+            # günlüğün kuyruğunda kalır. Dosya kilidi hâlâ bizde olduğundan
+            # kuyruktaki satırların hepsi bu sürece aittir ve bellekte uygulanmıştır.
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            with self._lock:
+                os.replace(tmp, self.path)
+                self._stamp = self._file_stamp()
+                self.journal.truncate_before(offset)
+                self._journal_offset = self.journal.size()
+        log.debug("Müşteri deposu sıkıştırıldı: %s", self.path)
+
+    def wait_compaction(self) -> None:
+        t = self._compacting
+        if t is not None:
+            t.join()
@@ -0,0 +1,158 @@
+# src/agentkit/storage/timeline.py
+"""Müşteri başına tarihe göre sıralı fatura / randevu indeksi."""
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+EDITABLE_BILL_STATUSES = ("Beklemede", "Gecikmiş")
+
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_DATETIME_RE = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}")
+_NO_DATE = datetime(1900, 1, 1)
+
+
+def _parse(s: Any, fmt: str, pattern: "re.Pattern[str]") -> datetime:
+    # Hızlı yol: tam biçimli metin; hata ya da farklı yazımda strptime ile aynı sonuç/hata.
+    if isinstance(s, str) and pattern.fullmatch(s):
+        try:
+            if len(s) == 10:
+                return datetime(int(s[:4]), int(s[5:7]), int(s[8:10]))
+            return datetime(int(s[:4]), int(s[5:7]), int(s[8:10]), int(s[11:13]), int(s[14:16]))
+        except ValueError:
+            pass
+    return datetime.strptime(s, fmt)
+
+
+def parse_date(s: Any) -> datetime:
+    return _parse(s, "%Y-%m-%d", _DATE_RE)
+
+
+def parse_datetime(s: Any) -> datetime:
+    return _parse(s, "%Y-%m-%d %H:%M", _DATETIME_RE)
+
+
+class CustomerTimeline:
+    """Tek müşterinin sıralı fatura/randevu indeksi. Eşitlikte listedeki ilk kayıt "en son" sayılır."""
+
+    __slots__ = ("record", "_bills_ref", "_n_bills", "_apps_ref", "_n_apps", "bills", "apps",
+                 "_bills_sorted", "_bill_errors", "_by_id", "_apps_sorted", "_app_error")
+
+    def __init__(self, record: dict):
+        self.record = record
+        self._bills_ref, self._apps_ref = record.get("bills"), record.get("appointments")
+        self.bills: List[dict] = self._bills_ref or []
+        self.apps: List[dict] = self._apps_ref or []
+        self._n_bills, self._n_apps = len(self.bills), len(self.apps)
+        self._bills_sorted: Optional[List[Tuple[datetime, int, dict]]] = None
+        self._bill_errors: List[Tuple[dict, Exception]] = []
+        self._by_id: Optional[Dict[Any, dict]] = None
+        self._apps_sorted: Optional[List[Tuple[datetime, int, dict]]] = None
+        self._app_error: Optional[Exception] = None
+
+    def valid_for(self, record: dict) -> bool:
+        bills, apps = record.get("bills"), record.get("appointments")
+        return (record is self.record and bills is self._bills_ref and apps is self._apps_ref
+                and len(bills or ()) == self._n_bills and len(apps or ()) == self._n_apps)
+
+    # ----------------------- faturalar -----------------------
+    def _index_bills(self) -> List[Tuple[datetime, int, dict]]:
+        if self._bills_sorted is None:
+            out, errors = [], []
+            for i, b in enumerate(self.bills):
+                if "bill_date" not in b:
+                    errors.append((b, KeyError("bill_date")))
+                    out.append((_NO_DATE, -i, b))  # latest_editable_bill için 1900-01-01 sayılır
+                    continue
+                try:
+                    out.append((parse_date(b["bill_date"]), -i, b))
+                except (ValueError, TypeError) as e:
+                    errors.append((b, e))
+            out.sort(key=lambda t: (t[0], t[1]))
+            self._bill_errors, self._bills_sorted = errors, out
+        return self._bills_sorted
+
+    def bill_by_id(self, bill_id: str) -> Optional[dict]:
+        if self._by_id is None:
+            by_id: Dict[Any, dict] = {}
+            for b in self.bills:
+                by_id.setdefault(b.get("bill_id"), b)
+            self._by_id = by_id
+        return self._by_id.get(bill_id)
+
+    def latest_bill(self) -> Optional[dict]:
+        bills = self._index_bills()
+        if self._bill_errors:
+            raise self._bill_errors[0][1].with_traceback(None)
+        return bills[-1][2] if bills else None
+
+    def latest_editable_bill(self) -> Optional[dict]:
+        bills = self._index_bills()
+        # Durum yerinde değişebildiği için indekslenmez; sondan ilk düzenlenebilir fatura aranır.
+        for b, e in self._bill_errors:
+            if b.get("status") in EDITABLE_BILL_STATUSES and not isinstance(e, KeyError):
+                raise e.with_traceback(None)
+        for _, _, b in reversed(bills):
+            if b.get("status") in EDITABLE_BILL_STATUSES:
+                return b
+        return None
+
+    # ----------------------- randevular -----------------------
+    def _index_apps(self) -> List[Tuple[datetime, int, dict]]:
+        if self._apps_sorted is None and self._app_error is None:
+            out = []
+            try:
+                for i, a in enumerate(self.apps):
+                    out.append((parse_datetime(f"{a['date']} {a['time']}"), -i, a))
+                out.sort(key=lambda t: (t[0], t[1]))
+                self._apps_sorted = out
+            except (KeyError, ValueError) as e:
+                self._app_error = e
+        if self._app_error is not None:
+            raise self._app_error.with_traceback(None)
+        return self._apps_sorted
+
+    def latest_appointment(self) -> Optional[dict]:
+        apps = self._index_apps()
+        return apps[-1][2] if apps else None
+
+
+class TimelineCache:
+    """Müşteri ID → CustomerTimeline; boyutu sınırlı (LRU), iş parçacığı güvenli."""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Any, CustomerTimeline]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(record: dict) -> Any:
+        return record.get("customer_id") or id(record)
+
+    def get(self, record: dict) -> CustomerTimeline:
+        key = self._key(record)
+        with self._lock:
+            tl = self._entries.get(key)
+            if tl is not None and tl.valid_for(record):
+                self._entries.move_to_end(key)
+                return tl
+        tl = CustomerTimeline(record)
+        with self._lock:
+            self._entries[key] = tl
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return tl
+
+    def discard(self, records: Iterable[dict]) -> None:
+        with self._lock:
+            for r in records:
+                if r:
+                    self._entries.pop(self._key(r), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -1 +1,6 @@
-from agentkit.models.loader import ModelLoader
+def __getattr__(name):
+    # Geriye dönük uyumluluk: `from agentkit.tools import ModelLoader` (torch/transformers) ilk erişimde yüklenir.
+    if name == "ModelLoader":
+        from agentkit.models.loader import ModelLoader
+        return ModelLoader
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,31 +1,81 @@
 # src/agentkit/tools/api_functions.py
-import os, json, random
+import os, random, threading
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timedelta
 
+from agentkit.storage import PhoneSpaceExhausted, StorageBackend, normalize_phone, open_backend
+from agentkit.tools.cache import cached, note_customer
+from agentkit.tools.result import ToolResult
+
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 DATA_DIR = os.getenv("AGENTKIT_DATA_DIR", os.path.join(ROOT, "data"))
 USER_DB = os.getenv("AGENTKIT_USER_DB", os.path.join(DATA_DIR, "user.json"))
 PACKAGE_DB = os.getenv("AGENTKIT_PACKAGES_DB", os.path.join(DATA_DIR, "packages.json"))
+# Verilmezse "<USER_DB>.journal"; "off" verilirse her yazma user.json'u baştan yazar.
+USER_JOURNAL = os.getenv("AGENTKIT_USER_JOURNAL", "")
+JOURNAL_COMPACT_EVERY = int(os.getenv("AGENTKIT_JOURNAL_COMPACT_EVERY", "500"))
+# "json" (varsayılan) veya "sqlite"
+STORAGE = os.getenv("AGENTKIT_STORAGE", "json")
+SQLITE_DB = os.getenv("AGENTKIT_SQLITE_DB", os.path.join(DATA_DIR, "agentkit.db"))
+# Çok büyük user.json için: yalnızca kimlik indeksi bellekte (yalnızca json arka ucu)
+LAZY_LOAD = os.getenv("AGENTKIT_LAZY_LOAD", "false").lower() in {"1", "true", "yes"}
+
+_backend_obj = None
+_backend_key = None
+_backend_lock = threading.Lock()
+# use_backend(...) ile bağlama özel arka uç (ör. KPI senaryosu için çatal).
+_backend_override: ContextVar[StorageBackend | None] = ContextVar("agentkit_backend", default=None)
+
+def _backend() -> StorageBackend:
+    override = _backend_override.get()
+    if override is not None:
+        return override
+    # USER_DB / STORAGE çalışma anında değiştirilirse arka uç yeniden kurulur.
+    # Kilit: eşzamanlı ilk çağrılar aynı nesneyi (aynı kilitleri) paylaşmalı.
+    global _backend_obj, _backend_key
+    key = (STORAGE, USER_DB, PACKAGE_DB, SQLITE_DB, LAZY_LOAD)
+    if _backend_obj is not None and _backend_key == key:
+        return _backend_obj
+    with _backend_lock:
+        if _backend_obj is None or _backend_key != key:
+            journal = None if USER_JOURNAL.lower() == "off" else (USER_JOURNAL or USER_DB + ".journal")
+            _backend_obj = open_backend(STORAGE, USER_DB, PACKAGE_DB, journal_path=journal,
+                                        compact_every=JOURNAL_COMPACT_EVERY, sqlite_db=SQLITE_DB, lazy=LAZY_LOAD)
+            _backend_key = key
+        return _backend_obj
+
+@contextmanager
+def use_backend(backend: StorageBackend):
+    """Blok boyunca (ve bloktan başlatılan async araçlarda) araçlar `backend`'i kullanır."""
+    token = _backend_override.set(backend)
+    try:
+        yield backend
+    finally:
+        _backend_override.reset(token)
 
 def _load_users():
-    with open(USER_DB, encoding="utf-8") as f:
-        return json.load(f)
+    return _backend().users()
 
-def _save_users(users):
-    os.makedirs(os.path.dirname(USER_DB), exist_ok=True)
-    with open(USER_DB, "w", encoding="utf-8") as f:
-        json.dump(users, f, ensure_ascii=False, indent=2)
+def _save_users(*changed):
+    backend = _backend()
+    # Toplu işlem (tools/batch.py) içindeyse yazma blok sonuna ertelenir.
+    if not backend.defer(changed):
+        backend.save(changed)
 
 def _load_packages():
-    with open(PACKAGE_DB, encoding="utf-8") as f:
-        return json.load(f)
+    return _backend().load_packages()
 
-def _normalize_phone(s: str) -> str:
-    return (s or "").replace(" ", "").replace("-", "")
+# Salt okunur araçların sonuçları önbelleklenir; müşteri kaydedilince düşer (bkz. tools/cache.py).
+_cached = cached(lambda: _backend())
+
+_normalize_phone = normalize_phone
 
 def _find_user(identifier: str, users=None):
     if users is None:
-        users = _load_users()
+        u = _backend().find(identifier)
+        note_customer(u)
+        return u
     ident = _normalize_phone(identifier)
     for u in users:
         if u.get("tc_no") == identifier:
@@ -36,850 +86,397 @@ def _find_user(identifier: str, users=None):
             return u
     return None
 
-def getUserInfo(user_identifier: str) -> str:
+def _detach(value):
+    # Kayıttan alınan JSON ağacının kopyası (dict/list yeniden kurulur, yapraklar paylaşılır).
+    if isinstance(value, dict):
+        return {k: _detach(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_detach(v) for v in value]
+    return value
+
+def _snapshot(u: dict, value):
+    # Yazan araçlar kaydı şerit kilidi altında yerinde değiştirir; `ToolResult` ise kilit dışında
+    # (ör. önbellekten) serileştirilir. Döndürülen alanlar bu yüzden kilit altında kopyalanır.
+    with _backend().locks.acquire_many([u.get("customer_id") or ""]):
+        return _detach(value)
+
+@_cached
+def getUserInfo(user_identifier: str) -> ToolResult:
     u = _find_user(user_identifier)
     if not u:
-        return json.dumps({"success": False, "error": "Kullanıcı bulunamadı."}, ensure_ascii=False)
+        return ToolResult({"success": False, "error": "Kullanıcı bulunamadı."})
     data = {
         "tc_no": u.get("tc_no"),
         "name": u.get("name"),
         "current_package": u.get("current_package"),
         "contract_end_date": u.get("contract_end_date"),
     }
-    return json.dumps({"success": True, "data": data}, ensure_ascii=False)
+    return ToolResult({"success": True, "data": data})
 
-def getAvailablePackages(user_identifier: str) -> str:
-    users = _load_users()
-    pkgs = _load_packages()
-    c = _find_user(user_identifier, users)
+@cached(lambda: _backend(), version=lambda b: b.packages_version())
+def getAvailablePackages(user_identifier: str) -> ToolResult:
+    catalog = _backend().catalog
+    c = _find_user(user_identifier)
     if not c:
-        return json.dumps({"success": False, "error": "Kullanıcı bulunamadı. Paket önerisi yapılamadı."}, ensure_ascii=False)
-    cur = c.get("current_package", "")
-    occ = (c.get("occupation", "") or "").strip().lower()
-    out = []
-    for p in pkgs:
-        name = p.get("name", "")
-        groups = [g.lower() for g in p.get("allowed_groups", ["genel"])]
-        if occ in groups and name != cur:
-            out.append(p)
+        return ToolResult({"success": False, "error": "Kullanıcı bulunamadı. Paket önerisi yapılamadı."})
+    occ = catalog.normalize_group(c.get("occupation"))
+    out = catalog.for_group(occ, exclude=c.get("current_package", ""))
     if not out:
-        return json.dumps({"success": True, "data": [], "message": f"{occ} grubuna özel paket bulunamadı."}, ensure_ascii=False)
-    return json.dumps({"success": True, "data": out, "message": f"{occ} grubuna özel {len(out)} paket bulundu."}, ensure_ascii=False)
-
-def initiatePackageChange(user_identifier: str, new_package_name: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            if u.get("payment_status") == "Gecikmiş":
-                return json.dumps({"success": False, "message": "Gecikmiş fatura nedeniyle paket değişikliği yapılamıyor."}, ensure_ascii=False)
-            old = u.get("current_package", "belirtilmemiş")
-            u["current_package"] = new_package_name
-            _save_users(users)
-            return json.dumps({"success": True, "message": f"Mevcut paket güncellendi: {old} → {new_package_name}", "new_package": new_package_name}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı. Paket güncellenemedi."}, ensure_ascii=False)
-
-def getBillDetails(user_identifier: str, bill_id: str | None = None, period: str | None = None) -> str:
-    users = _load_users()
-    c = _find_user(user_identifier, users)
+        return ToolResult({"success": True, "data": [], "message": f"{occ} grubuna özel paket bulunamadı."})
+    return ToolResult({"success": True, "data": out, "message": f"{occ} grubuna özel {len(out)} paket bulundu."})
+
+def initiatePackageChange(user_identifier: str, new_package_name: str) -> ToolResult:
+    with _backend().transaction(user_identifier) as (u,):
+        if not u:
+            return ToolResult({"success": False, "message": "Kullanıcı bulunamadı. Paket güncellenemedi."})
+        if u.get("payment_status") == "Gecikmiş":
+            return ToolResult({"success": False, "message": "Gecikmiş fatura nedeniyle paket değişikliği yapılamıyor."})
+        old = u.get("current_package", "belirtilmemiş")
+        u["current_package"] = new_package_name
+        _save_users(u)
+        return ToolResult({"success": True, "message": f"Mevcut paket güncellendi: {old} → {new_package_name}", "new_package": new_package_name})
+
+@_cached
+def getBillDetails(user_identifier: str, bill_id: str | None = None, period: str | None = None) -> ToolResult:
+    c = _find_user(user_identifier)
     if not c:
-        return json.dumps({"success": False, "error": "Kullanıcı bulunamadı."}, ensure_ascii=False)
+        return ToolResult({"success": False, "error": "Kullanıcı bulunamadı."})
     bills = c.get("bills", [])
     if not bills:
-        return json.dumps({"success": False, "error": "Bu kullanıcıya ait fatura kaydı bulunamadı."}, ensure_ascii=False)
+        return ToolResult({"success": False, "error": "Bu kullanıcıya ait fatura kaydı bulunamadı."})
     if bill_id:
-        b = next((x for x in bills if x.get("bill_id") == bill_id), None)
+        b = _backend().bill_by_id(c, bill_id)
         if b:
-            return json.dumps({"success": True, "data": b, "message": f"{bill_id} ID'li fatura bulundu."}, ensure_ascii=False)
-        return json.dumps({"success": False, "error": f"{bill_id} ID'li fatura bulunamadı."}, ensure_ascii=False)
+            return ToolResult({"success": True, "data": _snapshot(c, b), "message": f"{bill_id} ID'li fatura bulundu."})
+        return ToolResult({"success": False, "error": f"{bill_id} ID'li fatura bulunamadı."})
     if period == "son":
         try:
-            latest = max(bills, key=lambda x: datetime.strptime(x["bill_date"], "%Y-%m-%d"))
-            return json.dumps({"success": True, "data": latest, "message": "En son fatura getirildi."}, ensure_ascii=False)
+            latest = _backend().latest_bill(c)
+            return ToolResult({"success": True, "data": _snapshot(c, latest), "message": "En son fatura getirildi."})
         except Exception as e:
-            return json.dumps({"success": False, "error": f"Tarih formatı hatalı: {e}"}, ensure_ascii=False)
+            return ToolResult({"success": False, "error": f"Tarih formatı hatalı: {e}"})
     if period == "tümü":
-        return json.dumps({"success": True, "data": bills, "message": "Tüm faturalar listelendi."}, ensure_ascii=False)
-    return json.dumps({"success": True, "data": bills, "message": "Varsayılan olarak tüm faturalar getirildi."}, ensure_ascii=False)
+        return ToolResult({"success": True, "data": _snapshot(c, bills), "message": "Tüm faturalar listelendi."})
+    return ToolResult({"success": True, "data": _snapshot(c, bills), "message": "Varsayılan olarak tüm faturalar getirildi."})
 
-def checkServiceAvailability(address_street: str | None = None, address_city: str | None = None, address_zip_code: str | None = None, user_identifier: str | None = None, service_type: str = "Fiber İnternet") -> str:
-    return json.dumps({"success": True, "available": True, "message": "Adresinizde hizmet mevcut (örnek)."}, ensure_ascii=False)
+def checkServiceAvailability(address_street: str | None = None, address_city: str | None = None, address_zip_code: str | None = None, user_identifier: str | None = None, service_type: str = "Fiber İnternet") -> ToolResult:
+    return ToolResult({"success": True, "available": True, "message": "Adresinizde hizmet mevcut (örnek)."})
 
-def scheduleTechnicalSupport(user_identifier: str, issue_description: str, preferred_date: str, preferred_time: str) -> str:
-    users = _load_users()
+def scheduleTechnicalSupport(user_identifier: str, issue_description: str, preferred_date: str, preferred_time: str) -> ToolResult:
     try:
         req_dt = datetime.strptime(f"{preferred_date} {preferred_time}", "%Y-%m-%d %H:%M")
         if req_dt < datetime.now():
-            return json.dumps({"success": False, "error": "Geçmiş tarihe randevu alınamaz."}, ensure_ascii=False)
+            return ToolResult({"success": False, "error": "Geçmiş tarihe randevu alınamaz."})
         if req_dt.weekday() >= 5 or not (9 <= req_dt.hour < 17):
-            return json.dumps({"success": False, "error": "Randevular hafta içi 09:00–17:00 arasıdır."}, ensure_ascii=False)
+            return ToolResult({"success": False, "error": "Randevular hafta içi 09:00–17:00 arasıdır."})
     except ValueError:
-        return json.dumps({"success": False, "error": "Tarih/saat formatı geçersiz. YYYY-MM-DD ve HH:MM olmalı."}, ensure_ascii=False)
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            apps = u.setdefault("appointments", [])
-            for a in apps:
-                if a.get("date") == preferred_date and a.get("time") == preferred_time:
-                    return json.dumps({"success": False, "error": "Bu tarih ve saat için zaten randevunuz var."}, ensure_ascii=False)
-            app_id = f"destek-{random.randint(10, 100)}"
-            new_app = {
-                "appointment_id": app_id,
-                "issue": issue_description,
-                "date": preferred_date,
-                "time": preferred_time,
-                "status": "Planlandı",
-                "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "active": True,
-            }
-            apps.append(new_app)
-            _save_users(users)
-            return json.dumps({"success": True, "message": f"Randevu oluşturuldu. Takip: {app_id}", "appointment": new_app}, ensure_ascii=False)
-    return json.dumps({"success": False, "error": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def cancelSubscription(user_identifier: str, reason: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            for k in ["current_package", "package_start_date", "package_end_date", "remaining_data", "remaining_minutes", "remaining_sms"]:
-                u.pop(k, None)
-            u["status"] = "pasif"
-            u["service_status"] = "Abonelik iptal edildi"
-            u["cancellation_reason"] = reason
-            u["cancellation_date"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            _save_users(users)
-            return json.dumps({"success": True, "message": f"Aboneliğiniz '{reason}' nedeniyle iptal edildi."}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def getUsageHistory(user_identifier: str, period: str = "Son 3 Ay") -> str:
-    users = _load_users()
-    c = _find_user(user_identifier, users)
+        return ToolResult({"success": False, "error": "Tarih/saat formatı geçersiz. YYYY-MM-DD ve HH:MM olmalı."})
+    with _backend().transaction(user_identifier) as (u,):
+        if not u:
+            return ToolResult({"success": False, "error": "Kullanıcı bulunamadı."})
+        apps = u.setdefault("appointments", [])
+        for a in apps:
+            if a.get("date") == preferred_date and a.get("time") == preferred_time:
+                return ToolResult({"success": False, "error": "Bu tarih ve saat için zaten randevunuz var."})
+        app_id = f"destek-{random.randint(10, 100)}"
+        new_app = {
+            "appointment_id": app_id,
+            "issue": issue_description,
+            "date": preferred_date,
+            "time": preferred_time,
+            "status": "Planlandı",
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "active": True,
+        }
+        apps.append(new_app)
+        _save_users(u)
+        return ToolResult({"success": True, "message": f"Randevu oluşturuldu. Takip: {app_id}", "appointment": _detach(new_app)})
+
+def cancelSubscription(user_identifier: str, reason: str) -> ToolResult:
+    with _backend().transaction(user_identifier) as (u,):
+        if not u:
+            return ToolResult({"success": False, "message": "Kullanıcı bulunamadı."})
+        for k in ["current_package", "package_start_date", "package_end_date", "remaining_data", "remaining_minutes", "remaining_sms"]:
+            u.pop(k, None)
+        u["status"] = "pasif"
+        u["service_status"] = "Abonelik iptal edildi"
+        u["cancellation_reason"] = reason
+        u["cancellation_date"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        _save_users(u)
+        return ToolResult({"success": True, "message": f"Aboneliğiniz '{reason}' nedeniyle iptal edildi."})
+
+@_cached
+def getUsageHistory(user_identifier: str, period: str = "Son 3 Ay") -> ToolResult:
+    c = _find_user(user_identifier)
     if not c:
-        return json.dumps({"success": False, "error": "Kullanıcı bulunamadı."}, ensure_ascii=False)
+        return ToolResult({"success": False, "error": "Kullanıcı bulunamadı."})
     data = c.get("usage_history", {})
     if data:
-        return json.dumps({"success": True, "data": data, "message": f"{c.get('name','')} için kullanım geçmişi getirildi."}, ensure_ascii=False)
-    return json.dumps({"success": True, "data": {}, "message": f"{c.get('name','')} için kullanım geçmişi bulunamadı."}, ensure_ascii=False)
+        return ToolResult({"success": True, "data": _snapshot(c, data), "message": f"{c.get('name','')} için kullanım geçmişi getirildi."})
+    return ToolResult({"success": True, "data": {}, "message": f"{c.get('name','')} için kullanım geçmişi bulunamadı."})
 
-def blockIncomingNumber(user_identifier: str, target_number: str) -> str:
-    users = _load_users()
+def blockIncomingNumber(user_identifier: str, target_number: str) -> ToolResult:
     num = _normalize_phone(target_number)
     if not num.isdigit() or len(num) != 11 or not num.startswith("05"):
-        return json.dumps({"success": False, "error": "Geçersiz numara. 05XXXXXXXXX biçiminde girin."}, ensure_ascii=False)
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            bl = u.setdefault("blocked_numbers", [])
-            if num in bl:
-                return json.dumps({"success": False, "error": "Bu numara zaten engelli."}, ensure_ascii=False)
-            bl.append(num)
-            _save_users(users)
-            return json.dumps({"success": True, "message": f"{num} engellendi."}, ensure_ascii=False)
-    return json.dumps({"success": False, "error": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def unblockIncomingNumber(user_identifier: str, target_number: str) -> str:
-    users = _load_users()
+        return ToolResult({"success": False, "error": "Geçersiz numara. 05XXXXXXXXX biçiminde girin."})
+    with _backend().transaction(user_identifier) as (u,):
+        if not u:
+            return ToolResult({"success": False, "error": "Kullanıcı bulunamadı."})
+        bl = u.setdefault("blocked_numbers", [])
+        if num in bl:
+            return ToolResult({"success": False, "error": "Bu numara zaten engelli."})
+        bl.append(num)
+        _save_users(u)
+        return ToolResult({"success": True, "message": f"{num} engellendi."})
+
+def unblockIncomingNumber(user_identifier: str, target_number: str) -> ToolResult:
     num = _normalize_phone(target_number)
     if len(num) != 11 or not num.startswith("05"):
-        return json.dumps({"success": False, "error": "Geçersiz numara formatı."}, ensure_ascii=False)
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            bl = u.get("blocked_numbers", [])
-            if num not in bl:
-                return json.dumps({"success": False, "error": "Bu numara engelli listesinde değil."}, ensure_ascii=False)
-            bl.remove(num)
-            u["blocked_numbers"] = bl
-            _save_users(users)
-            return json.dumps({"success": True, "message": f"{num} engeli kaldırıldı."}, ensure_ascii=False)
-    return json.dumps({"success": False, "error": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def activateEsim(user_identifier: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            if u.get("esim_active"):
-                return json.dumps({"success": False, "message": "eSIM zaten aktif."}, ensure_ascii=False)
-            u["esim_active"] = True
-            _save_users(users)
-            return json.dumps({"success": True, "message": "eSIM aktivasyonu başarılı."}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def suspendLineDueToLoss(user_identifier: str, reason: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            u["status"] = "pasif"
-            u["service_status"] = "Askıya Alındı"
-            _save_users(users)
-            return json.dumps({"success": True, "message": f"Hattınız '{reason}' nedeniyle askıya alındı."}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def deactivateEsim(user_identifier: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            if not u.get("esim_active"):
-                return json.dumps({"success": False, "message": "eSIM zaten devre dışı."}, ensure_ascii=False)
-            u["esim_active"] = False
-            _save_users(users)
-            return json.dumps({"success": True, "message": "eSIM devre dışı bırakıldı."}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def removeDataRestriction(user_identifier: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            if not u.get("roaming_restricted", False):
-                return json.dumps({"success": False, "message": "Aktif veri kısıtlaması yok."}, ensure_ascii=False)
-            u["roaming_restricted"] = False
-            _save_users(users)
-            return json.dumps({"success": True, "message": "Yurt dışı veri kısıtlaması kaldırıldı."}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def activateChildProfile(user_identifier: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            if u.get("child_mode_enabled") is True:
-                return json.dumps({"success": True, "message": "Çocuk profili zaten aktif."}, ensure_ascii=False)
-            u["child_mode_enabled"] = True
-            _save_users(users)
-            return json.dumps({"success": True, "message": "Çocuk profili aktif edildi."}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def deactivateChildProfile(user_identifier: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            if u.get("child_mode_enabled") is False:
-                return json.dumps({"success": True, "message": "Çocuk profili zaten devre dışı."}, ensure_ascii=False)
-            u["child_mode_enabled"] = False
-            _save_users(users)
-            return json.dumps({"success": True, "message": "Çocuk profili devre dışı bırakıldı."}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def enable5G(user_identifier: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            if u.get("network_mode") == "5G":
-                return json.dumps({"success": False, "message": "Zaten 5G'ye tanımlısınız."}, ensure_ascii=False)
-            city = (u.get("address", {}).get("city", "") or "").lower()
-            if city not in ["ankara", "izmir", "istanbul"]:
-                return json.dumps({"success": False, "message": f"{city.title()} bölgesinde 5G altyapısı yok."}, ensure_ascii=False)
-            u["network_mode"] = "5G"
-            _save_users(users)
-            return json.dumps({"success": True, "message": "5G ağ profili aktif edildi."}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def getCallHistory(user_identifier: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            call_types = ["Gelen", "Giden", "Cevapsız"]
-            hist = []
-            for _ in range(5):
-                t = (datetime.now() - timedelta(minutes=random.randint(1, 1440))).strftime("%H:%M")
-                hist.append({"type": random.choice(call_types), "number": f"05{random.randint(100000000, 999999999)}", "time": t})
-            return json.dumps({"success": True, "call_history": hist, "message": f"{u.get('name','')} için son 5 çağrı kaydı."}, ensure_ascii=False)
-    return json.dumps({"success": False, "error": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def getSupportTicketStatus(user_identifier: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            apps = u.get("appointments", [])
-            if not apps:
-                return json.dumps({"success": False, "message": "Teknik destek kaydı bulunmuyor."}, ensure_ascii=False)
-            try:
-                last = sorted(apps, key=lambda x: datetime.strptime(f"{x['date']} {x['time']}", "%Y-%m-%d %H:%M"), reverse=True)[0]
-            except Exception as e:
-                return json.dumps({"success": False, "error": f"Randevu verisi okunamadı: {e}"}, ensure_ascii=False)
-            return json.dumps({"success": True, "ticket": {"ticket_id": last.get("appointment_id","destek-XXXX"), "status": last.get("status",""), "created_at": last.get("created_at",""), "description": last.get("issue","")}, "message": "Son teknik destek kaydınız:"}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def checkServiceStatus(user_identifier: str) -> str:
-    return json.dumps({"success": True, "status": "Aktif", "message": "Hizmet aktif (örnek)."}, ensure_ascii=False)
-
-def addAuthorizedContact(user_identifier: str, name: str, phone: str) -> str:
-    users = _load_users()
-    cleaned = _normalize_phone(phone)
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            lst = u.setdefault("authorized_contacts", [])
-            for c in lst:
-                if _normalize_phone(c.get("phone","")) == cleaned:
-                    return json.dumps({"success": False, "error": f"{phone} zaten yetkili kişiler arasında."}, ensure_ascii=False)
-            lst.append({"name": name, "phone": cleaned})
-            _save_users(users)
-            return json.dumps({"success": True, "message": f"{name} ({cleaned}) yetkili olarak eklendi."}, ensure_ascii=False)
-    return json.dumps({"success": False, "error": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def requestNumberPorting(user_identifier: str, current_operator: str, reason: str) -> str:
-    return json.dumps({"success": True, "message": "Numara taşıma başvurusu alındı (örnek)."}, ensure_ascii=False)
-
-def _generate_unique_phone(users):
-    while True:
-        new_num = "05" + "".join(str(random.randint(0, 9)) for _ in range(9))
-        if not any(_normalize_phone(u.get("phone_number","")) == new_num for u in users):
-            return new_num
-
-def requestNumberChange(user_identifier: str, reason: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            old = u.get("phone_number")
-            new = _generate_unique_phone(users)
-            u["phone_number"] = new
-            u["status"] = "aktif"
-            _save_users(users)
-            return json.dumps({"success": True, "message": f"Numaranız '{reason}' nedeniyle değiştirildi. Yeni: {new}. Eski: {old}."}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def pausePackageTemporarily(user_identifier: str, duration_days: int, reason: str) -> str:
-    return json.dumps({"success": True, "message": f"Paket {duration_days} gün askıya alındı (örnek)."}, ensure_ascii=False)
-
-def activateInternationalRoaming(user_identifier: str) -> str:
-    users = _load_users()
-    c = _find_user(user_identifier, users)
-    if not c:
-        return json.dumps({"success": False, "error": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-    if c.get("roaming_restricted") is False:
-        return json.dumps({"success": True, "message": "Yurt dışı kullanım zaten açık."}, ensure_ascii=False)
-    c["roaming_restricted"] = False
-    _save_users(users)
-    return json.dumps({"success": True, "message": "Yurt dışı kullanım başarıyla açıldı.", "roaming_status": "Açık"}, ensure_ascii=False)
-
-def sendGiftPackage(sender_id: str, receiver_number: str, package_type: str, amount: int) -> str:
-    if (package_type or "").lower() != "internet":
-        return json.dumps({"success": False, "error": "Şu anda yalnızca internet paketi hediye edilebilir."}, ensure_ascii=False)
-    if amount <= 0 or amount > 10:
-        return json.dumps({"success": False, "error": "Gönderim miktarı geçersiz ya da limit üstü (maksimum 10 GB)."}, ensure_ascii=False)
-    users = _load_users()
-    s = _find_user(sender_id, users)
-    r = next((u for u in users if _normalize_phone(u.get("phone_number","")) == _normalize_phone(receiver_number)), None)
-    if not s:
-        return json.dumps({"success": False, "error": "Gönderen kullanıcı bulunamadı."}, ensure_ascii=False)
-    if not r:
-        return json.dumps({"success": False, "error": "Alıcı kullanıcı bulunamadı."}, ensure_ascii=False)
-    gb_price = 50
-    total = gb_price * amount
-    bills = s.get("bills", [])
-    editable = [b for b in bills if b.get("status") in ["Beklemede", "Gecikmiş"]]
-    if not editable:
-        return json.dumps({"success": False, "error": "Düzenlenebilir fatura bulunamadı."}, ensure_ascii=False)
-    latest = max(editable, key=lambda b: datetime.strptime(b.get("bill_date", "1900-01-01"), "%Y-%m-%d"))
-    latest["amount"] = float(latest.get("amount", 0)) + total
-    br = latest.setdefault("breakdown", {})
-    try:
-        base_val = float(str(br.get("base", "0")).replace(" TL", ""))
-    except Exception:
-        base_val = 0.0
-    br["base"] = f"{base_val + total:.2f} TL"
-    details = latest.get("details", "")
-    latest["details"] = (details + " + " if details else "") + f"{amount} GB hediye internet"
-    r.setdefault("usage_history", {})
-    r["usage_history"]["internet_gb_used_monthly"] = r["usage_history"].get("internet_gb_used_monthly", 0) + amount
-    _save_users(users)
-    return json.dumps({"success": True, "message": f"{r.get('name','')} kullanıcısına {amount} GB gönderildi. Faturaya {total} TL eklendi.", "updated_bill": latest}, ensure_ascii=False)
-
-def getReceivedGifts(user_identifier: str) -> str:
-    return json.dumps({"success": True, "gifts": [{"type": "internet", "amount": "2GB", "sender": "Bilinmiyor", "date": "2025-07-04"}]}, ensure_ascii=False)
-
-def requestInstallmentPlan(user_identifier: str, total_amount: float, installments: int) -> str:
-    return json.dumps({"success": True, "message": f"{total_amount} TL {installments} taksite bölündü (örnek)."}, ensure_ascii=False)
-
-def checkInfrastructure(address: str) -> str:
-    return json.dumps({"success": True, "infrastructure": "fiber (örnek)"}, ensure_ascii=False)
-
-def scheduleInternetRelocation(user_identifier: str, new_address: dict) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            old = u.get("address", {})
-            u["address"] = new_address
-            u.setdefault("appointments", []).append({
-                "type": "İnternet Nakil",
-                "requested_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "status": "Planlandı",
-                "old_address": old,
-                "new_address": new_address,
-            })
-            _save_users(users)
-            return json.dumps({"success": True, "message": f"İnternet taşıma kaydedildi. Yeni adres: {new_address.get('street')}, {new_address.get('city')} ({new_address.get('zip_code')})"}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı. Taşıma yapılamadı."}, ensure_ascii=False)
-
-def checkContractEndDate(user_identifier: str) -> str:
-    return json.dumps({"success": True, "contract_end_date": "2025-12-31", "days_remaining": 180, "message": "Taahhüt bitiş tarihi (örnek)."}, ensure_ascii=False)
-
-def freezeLine(user_identifier: str, reason: str = "Kullanıcı talebiyle donduruldu") -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            if u.get("status") == "pasif":
-                return json.dumps({"success": True, "message": "Hattınız zaten pasif."}, ensure_ascii=False)
-            u["status"] = "pasif"
-            _save_users(users)
-            return json.dumps({"success": True, "message": f"Hat donduruldu. ({reason})"}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def activateLine(user_identifier: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            if u.get("status") == "aktif" and (u.get("service_status","").lower() == "aktif"):
-                return json.dumps({"success": True, "message": "Hattınız zaten aktif."}, ensure_ascii=False)
-            u["status"] = "aktif"
-            u["service_status"] = "Aktif"
-            _save_users(users)
-            return json.dumps({"success": True, "message": "Hat aktifleştirildi."}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def deleteSubscription(user_identifier: str, reason: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            u["status"] = "pasif"
-            u["service_status"] = "İptal Edildi"
-            _save_users(users)
-            return json.dumps({"success": True, "message": f"Abonelik '{reason}' nedeniyle iptal edildi."}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-import os, json, random
-from datetime import datetime, timedelta
-
-ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-DATA_DIR = os.getenv("AGENTKIT_DATA_DIR", os.path.join(ROOT, "data"))
-USER_DB = os.getenv("AGENTKIT_USER_DB", os.path.join(DATA_DIR, "user.json"))
-PACKAGE_DB = os.getenv("AGENTKIT_PACKAGES_DB", os.path.join(DATA_DIR, "packages.json"))
-
-def _load_users():
-    with open(USER_DB, encoding="utf-8") as f:
-        return json.load(f)
-
-def _save_users(users):
-    os.makedirs(os.path.dirname(USER_DB), exist_ok=True)
-    with open(USER_DB, "w", encoding="utf-8") as f:
-        json.dump(users, f, ensure_ascii=False, indent=2)
-
-def _load_packages():
-    with open(PACKAGE_DB, encoding="utf-8") as f:
-        return json.load(f)
-
-def _normalize_phone(s: str) -> str:
-    return (s or "").replace(" ", "").replace("-", "")
-
-def _find_user(identifier: str, users=None):
-    if users is None:
-        users = _load_users()
-    ident = _normalize_phone(identifier)
-    for u in users:
-        if u.get("tc_no") == identifier:
-            return u
-        if u.get("customer_id") == identifier:
-            return u
-        if _normalize_phone(u.get("phone_number", "")) == ident:
-            return u
-    return None
-
-def getUserInfo(user_identifier: str) -> str:
+        return ToolResult({"success": False, "error": "Geçersiz numara formatı."})
+    with _backend().transaction(user_identifier) as (u,):
+        if not u:
+            return ToolResult({"success": False, "error": "Kullanıcı bulunamadı."})
+        bl = u.get("blocked_numbers", [])
+        if num not in bl:
+            return ToolResult({"success": False, "error": "Bu numara engelli listesinde değil."})
+        bl.remove(num)
+        u["blocked_numbers"] = bl
+        _save_users(u)
+        return ToolResult({"success": True, "message": f"{num} engeli kaldırıldı."})
+
+def activateEsim(user_identifier: str) -> ToolResult:
+    with _backend().transaction(user_identifier) as (u,):
+        if not u:
+            return ToolResult({"success": False, "message": "Kullanıcı bulunamadı."})
+        if u.get("esim_active"):
+            return ToolResult({"success": False, "message": "eSIM zaten aktif."})
+        u["esim_active"] = True
+        _save_users(u)
+        return ToolResult({"success": True, "message": "eSIM aktivasyonu başarılı."})
+
+def suspendLineDueToLoss(user_identifier: str, reason: str) -> ToolResult:
+    with _backend().transaction(user_identifier) as (u,):
+        if not u:
+            return ToolResult({"success": False, "message": "Kullanıcı bulunamadı."})
+        u["status"] = "pasif"
+        u["service_status"] = "Askıya Alındı"
+        _save_users(u)
+        return ToolResult({"success": True, "message": f"Hattınız '{reason}' nedeniyle askıya alındı."})
+
+def deactivateEsim(user_identifier: str) -> ToolResult:
+    with _backend().transaction(user_identifier) as (u,):
+        if not u:
+            return ToolResult({"success": False, "message": "Kullanıcı bulunamadı."})
+        if not u.get("esim_active"):
+            return ToolResult({"success": False, "message": "eSIM zaten devre dışı."})
+        u["esim_active"] = False
+        _save_users(u)
+        return ToolResult({"success": True, "message": "eSIM devre dışı bırakıldı."})
+
+def removeDataRestriction(user_identifier: str) -> ToolResult:
+    with _backend().transaction(user_identifier) as (u,):
+        if not u:
+            return ToolResult({"success": False, "message": "Kullanıcı bulunamadı."})
+        if not u.get("roaming_restricted", False):
+            return ToolResult({"success": False, "message": "Aktif veri kısıtlaması yok."})
+        u["roaming_restricted"] = False
+        _save_users(u)
+        return ToolResult({"success": True, "message": "Yurt dışı veri kısıtlaması kaldırıldı."})
+
+def activateChildProfile(user_identifier: str) -> ToolResult:
+    with _backend().transaction(user_identifier) as (u,):
+        if not u:
+            return ToolResult({"success": False, "message": "Kullanıcı bulunamadı."})
+        if u.get("child_mode_enabled") is True:
+            return ToolResult({"success": True, "message": "Çocuk profili zaten aktif."})
+        u["child_mode_enabled"] = True
+        _save_users(u)
+        return ToolResult({"success": True, "message": "Çocuk profili aktif edildi."})
+
+def deactivateChildProfile(user_identifier: str) -> ToolResult:
+    with _backend().transaction(user_identifier) as (u,):
+        if not u:
+            return ToolResult({"success": False, "message": "Kullanıcı bulunamadı."})
+        if u.get("child_mode_enabled") is False:
+            return ToolResult({"success": True, "message": "Çocuk profili zaten devre dışı."})
+        u["child_mode_enabled"] = False
+        _save_users(u)
+        return ToolResult({"success": True, "message": "Çocuk profili devre dışı bırakıldı."})
+
+def enable5G(user_identifier: str) -> ToolResult:
+    with _backend().transaction(user_identifier) as (u,):
+        if not u:
+            return ToolResult({"success": False, "message": "Kullanıcı bulunamadı."})
+        if u.get("network_mode") == "5G":
+            return ToolResult({"success": False, "message": "Zaten 5G'ye tanımlısınız."})
+        city = (u.get("address", {}).get("city", "") or "").lower()
+        if city not in ["ankara", "izmir", "istanbul"]:
+            return ToolResult({"success": False, "message": f"{city.title()} bölgesinde 5G altyapısı yok."})
+        u["network_mode"] = "5G"
+        _save_users(u)
+        return ToolResult({"success": True, "message": "5G ağ profili aktif edildi."})
+
+def getCallHistory(user_identifier: str) -> ToolResult:
     u = _find_user(user_identifier)
     if not u:
-        return json.dumps({"success": False, "error": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-    data = {
-        "tc_no": u.get("tc_no"),
-        "name": u.get("name"),
-        "current_package": u.get("current_package"),
-        "contract_end_date": u.get("contract_end_date"),
-    }
-    return json.dumps({"success": True, "data": data}, ensure_ascii=False)
-
-def getAvailablePackages(user_identifier: str) -> str:
-    users = _load_users()
-    pkgs = _load_packages()
-    c = _find_user(user_identifier, users)
-    if not c:
-        return json.dumps({"success": False, "error": "Kullanıcı bulunamadı. Paket önerisi yapılamadı."}, ensure_ascii=False)
-    cur = c.get("current_package", "")
-    occ = (c.get("occupation", "") or "").strip().lower()
-    out = []
-    for p in pkgs:
-        name = p.get("name", "")
-        groups = [g.lower() for g in p.get("allowed_groups", ["genel"])]
-        if occ in groups and name != cur:
-            out.append(p)
-    if not out:
-        return json.dumps({"success": True, "data": [], "message": f"{occ} grubuna özel paket bulunamadı."}, ensure_ascii=False)
-    return json.dumps({"success": True, "data": out, "message": f"{occ} grubuna özel {len(out)} paket bulundu."}, ensure_ascii=False)
-
-def initiatePackageChange(user_identifier: str, new_package_name: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            if u.get("payment_status") == "Gecikmiş":
-                return json.dumps({"success": False, "message": "Gecikmiş fatura nedeniyle paket değişikliği yapılamıyor."}, ensure_ascii=False)
-            old = u.get("current_package", "belirtilmemiş")
-            u["current_package"] = new_package_name
-            _save_users(users)
-            return json.dumps({"success": True, "message": f"Mevcut paket güncellendi: {old} → {new_package_name}", "new_package": new_package_name}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı. Paket güncellenemedi."}, ensure_ascii=False)
-
-def getBillDetails(user_identifier: str, bill_id: str | None = None, period: str | None = None) -> str:
-    users = _load_users()
-    c = _find_user(user_identifier, users)
-    if not c:
-        return json.dumps({"success": False, "error": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-    bills = c.get("bills", [])
-    if not bills:
-        return json.dumps({"success": False, "error": "Bu kullanıcıya ait fatura kaydı bulunamadı."}, ensure_ascii=False)
-    if bill_id:
-        b = next((x for x in bills if x.get("bill_id") == bill_id), None)
-        if b:
-            return json.dumps({"success": True, "data": b, "message": f"{bill_id} ID'li fatura bulundu."}, ensure_ascii=False)
-        return json.dumps({"success": False, "error": f"{bill_id} ID'li fatura bulunamadı."}, ensure_ascii=False)
-    if period == "son":
-        try:
-            latest = max(bills, key=lambda x: datetime.strptime(x["bill_date"], "%Y-%m-%d"))
-            return json.dumps({"success": True, "data": latest, "message": "En son fatura getirildi."}, ensure_ascii=False)
-        except Exception as e:
-            return json.dumps({"success": False, "error": f"Tarih formatı hatalı: {e}"}, ensure_ascii=False)
-    if period == "tümü":
-        return json.dumps({"success": True, "data": bills, "message": "Tüm faturalar listelendi."}, ensure_ascii=False)
-    return json.dumps({"success": True, "data": bills, "message": "Varsayılan olarak tüm faturalar getirildi."}, ensure_ascii=False)
-
-def checkServiceAvailability(address_street: str | None = None, address_city: str | None = None, address_zip_code: str | None = None, user_identifier: str | None = None, service_type: str = "Fiber İnternet") -> str:
-    return json.dumps({"success": True, "available": True, "message": "Adresinizde hizmet mevcut (örnek)."}, ensure_ascii=False)
-
-def scheduleTechnicalSupport(user_identifier: str, issue_description: str, preferred_date: str, preferred_time: str) -> str:
-    users = _load_users()
+        return ToolResult({"success": False, "error": "Kullanıcı bulunamadı."})
+    call_types = ["Gelen", "Giden", "Cevapsız"]
+    hist = []
+    for _ in range(5):
+        t = (datetime.now() - timedelta(minutes=random.randint(1, 1440))).strftime("%H:%M")
+        hist.append({"type": random.choice(call_types), "number": f"05{random.randint(100000000, 999999999)}", "time": t})
+    return ToolResult({"success": True, "call_history": hist, "message": f"{u.get('name','')} için son 5 çağrı kaydı."})
+
+@_cached
+def getSupportTicketStatus(user_identifier: str) -> ToolResult:
+    u = _find_user(user_identifier)
+    if not u:
+        return ToolResult({"success": False, "message": "Kullanıcı bulunamadı."})
+    apps = u.get("appointments", [])
+    if not apps:
+        return ToolResult({"success": False, "message": "Teknik destek kaydı bulunmuyor."})
     try:
-        req_dt = datetime.strptime(f"{preferred_date} {preferred_time}", "%Y-%m-%d %H:%M")
-        if req_dt < datetime.now():
-            return json.dumps({"success": False, "error": "Geçmiş tarihe randevu alınamaz."}, ensure_ascii=False)
-        if req_dt.weekday() >= 5 or not (9 <= req_dt.hour < 17):
-            return json.dumps({"success": False, "error": "Randevular hafta içi 09:00–17:00 arasıdır."}, ensure_ascii=False)
-    except ValueError:
-        return json.dumps({"success": False, "error": "Tarih/saat formatı geçersiz. YYYY-MM-DD ve HH:MM olmalı."}, ensure_ascii=False)
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            apps = u.setdefault("appointments", [])
-            for a in apps:
-                if a.get("date") == preferred_date and a.get("time") == preferred_time:
-                    return json.dumps({"success": False, "error": "Bu tarih ve saat için zaten randevunuz var."}, ensure_ascii=False)
-            app_id = f"destek-{random.randint(10, 100)}"
-            new_app = {
-                "appointment_id": app_id,
-                "issue": issue_description,
-                "date": preferred_date,
-                "time": preferred_time,
-                "status": "Planlandı",
-                "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "active": True,
-            }
-            apps.append(new_app)
-            _save_users(users)
-            return json.dumps({"success": True, "message": f"Randevu oluşturuldu. Takip: {app_id}", "appointment": new_app}, ensure_ascii=False)
-    return json.dumps({"success": False, "error": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def cancelSubscription(user_identifier: str, reason: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            for k in ["current_package", "package_start_date", "package_end_date", "remaining_data", "remaining_minutes", "remaining_sms"]:
-                u.pop(k, None)
-            u["status"] = "pasif"
-            u["service_status"] = "Abonelik iptal edildi"
-            u["cancellation_reason"] = reason
-            u["cancellation_date"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            _save_users(users)
-            return json.dumps({"success": True, "message": f"Aboneliğiniz '{reason}' nedeniyle iptal edildi."}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def getUsageHistory(user_identifier: str, period: str = "Son 3 Ay") -> str:
-    users = _load_users()
-    c = _find_user(user_identifier, users)
-    if not c:
-        return json.dumps({"success": False, "error": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-    data = c.get("usage_history", {})
-    if data:
-        return json.dumps({"success": True, "data": data, "message": f"{c.get('name','')} için kullanım geçmişi getirildi."}, ensure_ascii=False)
-    return json.dumps({"success": True, "data": {}, "message": f"{c.get('name','')} için kullanım geçmişi bulunamadı."}, ensure_ascii=False)
+        last = _backend().latest_appointment(u)
+    except Exception as e:
+        return ToolResult({"success": False, "error": f"Randevu verisi okunamadı: {e}"})
+    return ToolResult({"success": True, "ticket": {"ticket_id": last.get("appointment_id","destek-XXXX"), "status": last.get("status",""), "created_at": last.get("created_at",""), "description": last.get("issue","")}, "message": "Son teknik destek kaydınız:"})
 
-def blockIncomingNumber(user_identifier: str, target_number: str) -> str:
-    users = _load_users()
-    num = _normalize_phone(target_number)
-    if not num.isdigit() or len(num) != 11 or not num.startswith("05"):
-        return json.dumps({"success": False, "error": "Geçersiz numara. 05XXXXXXXXX biçiminde girin."}, ensure_ascii=False)
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            bl = u.setdefault("blocked_numbers", [])
-            if num in bl:
-                return json.dumps({"success": False, "error": "Bu numara zaten engelli."}, ensure_ascii=False)
-            bl.append(num)
-            _save_users(users)
-            return json.dumps({"success": True, "message": f"{num} engellendi."}, ensure_ascii=False)
-    return json.dumps({"success": False, "error": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def unblockIncomingNumber(user_identifier: str, target_number: str) -> str:
-    users = _load_users()
-    num = _normalize_phone(target_number)
-    if len(num) != 11 or not num.startswith("05"):
-        return json.dumps({"success": False, "error": "Geçersiz numara formatı."}, ensure_ascii=False)
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            bl = u.get("blocked_numbers", [])
-            if num not in bl:
-                return json.dumps({"success": False, "error": "Bu numara engelli listesinde değil."}, ensure_ascii=False)
-            bl.remove(num)
-            u["blocked_numbers"] = bl
-            _save_users(users)
-            return json.dumps({"success": True, "message": f"{num} engeli kaldırıldı."}, ensure_ascii=False)
-    return json.dumps({"success": False, "error": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def activateEsim(user_identifier: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            if u.get("esim_active"):
-                return json.dumps({"success": False, "message": "eSIM zaten aktif."}, ensure_ascii=False)
-            u["esim_active"] = True
-            _save_users(users)
-            return json.dumps({"success": True, "message": "eSIM aktivasyonu başarılı."}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def suspendLineDueToLoss(user_identifier: str, reason: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            u["status"] = "pasif"
-            u["service_status"] = "Askıya Alındı"
-            _save_users(users)
-            return json.dumps({"success": True, "message": f"Hattınız '{reason}' nedeniyle askıya alındı."}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def deactivateEsim(user_identifier: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            if not u.get("esim_active"):
-                return json.dumps({"success": False, "message": "eSIM zaten devre dışı."}, ensure_ascii=False)
-            u["esim_active"] = False
-            _save_users(users)
-            return json.dumps({"success": True, "message": "eSIM devre dışı bırakıldı."}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def removeDataRestriction(user_identifier: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            if not u.get("roaming_restricted", False):
-                return json.dumps({"success": False, "message": "Aktif veri kısıtlaması yok."}, ensure_ascii=False)
-            u["roaming_restricted"] = False
-            _save_users(users)
-            return json.dumps({"success": True, "message": "Yurt dışı veri kısıtlaması kaldırıldı."}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def activateChildProfile(user_identifier: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            if u.get("child_mode_enabled") is True:
-                return json.dumps({"success": True, "message": "Çocuk profili zaten aktif."}, ensure_ascii=False)
-            u["child_mode_enabled"] = True
-            _save_users(users)
-            return json.dumps({"success": True, "message": "Çocuk profili aktif edildi."}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def deactivateChildProfile(user_identifier: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            if u.get("child_mode_enabled") is False:
-                return json.dumps({"success": True, "message": "Çocuk profili zaten devre dışı."}, ensure_ascii=False)
-            u["child_mode_enabled"] = False
-            _save_users(users)
-            return json.dumps({"success": True, "message": "Çocuk profili devre dışı bırakıldı."}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def enable5G(user_identifier: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            if u.get("network_mode") == "5G":
-                return json.dumps({"success": False, "message": "Zaten 5G'ye tanımlısınız."}, ensure_ascii=False)
-            city = (u.get("address", {}).get("city", "") or "").lower()
-            if city not in ["ankara", "izmir", "istanbul"]:
-                return json.dumps({"success": False, "message": f"{city.title()} bölgesinde 5G altyapısı yok."}, ensure_ascii=False)
-            u["network_mode"] = "5G"
-            _save_users(users)
-            return json.dumps({"success": True, "message": "5G ağ profili aktif edildi."}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def getCallHistory(user_identifier: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            call_types = ["Gelen", "Giden", "Cevapsız"]
-            hist = []
-            for _ in range(5):
-                t = (datetime.now() - timedelta(minutes=random.randint(1, 1440))).strftime("%H:%M")
-                hist.append({"type": random.choice(call_types), "number": f"05{random.randint(100000000, 999999999)}", "time": t})
-            return json.dumps({"success": True, "call_history": hist, "message": f"{u.get('name','')} için son 5 çağrı kaydı."}, ensure_ascii=False)
-    return json.dumps({"success": False, "error": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def getSupportTicketStatus(user_identifier: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            apps = u.get("appointments", [])
-            if not apps:
-                return json.dumps({"success": False, "message": "Teknik destek kaydı bulunmuyor."}, ensure_ascii=False)
-            try:
-                last = sorted(apps, key=lambda x: datetime.strptime(f"{x['date']} {x['time']}", "%Y-%m-%d %H:%M"), reverse=True)[0]
-            except Exception as e:
-                return json.dumps({"success": False, "error": f"Randevu verisi okunamadı: {e}"}, ensure_ascii=False)
-            return json.dumps({"success": True, "ticket": {"ticket_id": last.get("appointment_id","destek-XXXX"), "status": last.get("status",""), "created_at": last.get("created_at",""), "description": last.get("issue","")}, "message": "Son teknik destek kaydınız:"}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def checkServiceStatus(user_identifier: str) -> str:
-    return json.dumps({"success": True, "status": "Aktif", "message": "Hizmet aktif (örnek)."}, ensure_ascii=False)
-
-def addAuthorizedContact(user_identifier: str, name: str, phone: str) -> str:
-    users = _load_users()
+def checkServiceStatus(user_identifier: str) -> ToolResult:
+    return ToolResult({"success": True, "status": "Aktif", "message": "Hizmet aktif (örnek)."})
+
+def addAuthorizedContact(user_identifier: str, name: str, phone: str) -> ToolResult:
     cleaned = _normalize_phone(phone)
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            lst = u.setdefault("authorized_contacts", [])
-            for c in lst:
-                if _normalize_phone(c.get("phone","")) == cleaned:
-                    return json.dumps({"success": False, "error": f"{phone} zaten yetkili kişiler arasında."}, ensure_ascii=False)
-            lst.append({"name": name, "phone": cleaned})
-            _save_users(users)
-            return json.dumps({"success": True, "message": f"{name} ({cleaned}) yetkili olarak eklendi."}, ensure_ascii=False)
-    return json.dumps({"success": False, "error": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def requestNumberPorting(user_identifier: str, current_operator: str, reason: str) -> str:
-    return json.dumps({"success": True, "message": "Numara taşıma başvurusu alındı (örnek)."}, ensure_ascii=False)
-
-def _generate_unique_phone(users):
-    while True:
-        new_num = "05" + "".join(str(random.randint(0, 9)) for _ in range(9))
-        if not any(_normalize_phone(u.get("phone_number","")) == new_num for u in users):
-            return new_num
-
-def requestNumberChange(user_identifier: str, reason: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            old = u.get("phone_number")
-            new = _generate_unique_phone(users)
+    with _backend().transaction(user_identifier) as (u,):
+        if not u:
+            return ToolResult({"success": False, "error": "Kullanıcı bulunamadı."})
+        lst = u.setdefault("authorized_contacts", [])
+        for c in lst:
+            if _normalize_phone(c.get("phone","")) == cleaned:
+                return ToolResult({"success": False, "error": f"{phone} zaten yetkili kişiler arasında."})
+        lst.append({"name": name, "phone": cleaned})
+        _save_users(u)
+        return ToolResult({"success": True, "message": f"{name} ({cleaned}) yetkili olarak eklendi."})
+
+def requestNumberPorting(user_identifier: str, current_operator: str, reason: str) -> ToolResult:
+    return ToolResult({"success": True, "message": "Numara taşıma başvurusu alındı (örnek)."})
+
+def requestNumberChange(user_identifier: str, reason: str) -> ToolResult:
+    backend = _backend()
+    with backend.transaction(user_identifier) as (u,):
+        if not u:
+            return ToolResult({"success": False, "message": "Kullanıcı bulunamadı."})
+        old = u.get("phone_number")
+        # Numara kayıt yazılana kadar rezerve: eşzamanlı değişiklikler aynı numarayı alamaz.
+        try:
+            new = backend.phones.reserve()
+        except PhoneSpaceExhausted:
+            return ToolResult({"success": False, "message": "Şu anda uygun yeni numara bulunamadı."})
+        try:
             u["phone_number"] = new
             u["status"] = "aktif"
-            _save_users(users)
-            return json.dumps({"success": True, "message": f"Numaranız '{reason}' nedeniyle değiştirildi. Yeni: {new}. Eski: {old}."}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def pausePackageTemporarily(user_identifier: str, duration_days: int, reason: str) -> str:
-    return json.dumps({"success": True, "message": f"Paket {duration_days} gün askıya alındı (örnek)."}, ensure_ascii=False)
-
-def activateInternationalRoaming(user_identifier: str) -> str:
-    users = _load_users()
-    c = _find_user(user_identifier, users)
-    if not c:
-        return json.dumps({"success": False, "error": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-    if c.get("roaming_restricted") is False:
-        return json.dumps({"success": True, "message": "Yurt dışı kullanım zaten açık."}, ensure_ascii=False)
-    c["roaming_restricted"] = False
-    _save_users(users)
-    return json.dumps({"success": True, "message": "Yurt dışı kullanım başarıyla açıldı.", "roaming_status": "Açık"}, ensure_ascii=False)
-
-def sendGiftPackage(sender_id: str, receiver_number: str, package_type: str, amount: int) -> str:
+            _save_users(u)
+        finally:
+            backend.phones.release(new)
+        return ToolResult({"success": True, "message": f"Numaranız '{reason}' nedeniyle değiştirildi. Yeni: {new}. Eski: {old}."})
+
+def pausePackageTemporarily(user_identifier: str, duration_days: int, reason: str) -> ToolResult:
+    return ToolResult({"success": True, "message": f"Paket {duration_days} gün askıya alındı (örnek)."})
+
+def activateInternationalRoaming(user_identifier: str) -> ToolResult:
+    with _backend().transaction(user_identifier) as (c,):
+        if not c:
+            return ToolResult({"success": False, "error": "Kullanıcı bulunamadı."})
+        if c.get("roaming_restricted") is False:
+            return ToolResult({"success": True, "message": "Yurt dışı kullanım zaten açık."})
+        c["roaming_restricted"] = False
+        _save_users(c)
+        return ToolResult({"success": True, "message": "Yurt dışı kullanım başarıyla açıldı.", "roaming_status": "Açık"})
+
+def sendGiftPackage(sender_id: str, receiver_number: str, package_type: str, amount: int) -> ToolResult:
     if (package_type or "").lower() != "internet":
-        return json.dumps({"success": False, "error": "Şu anda yalnızca internet paketi hediye edilebilir."}, ensure_ascii=False)
+        return ToolResult({"success": False, "error": "Şu anda yalnızca internet paketi hediye edilebilir."})
     if amount <= 0 or amount > 10:
-        return json.dumps({"success": False, "error": "Gönderim miktarı geçersiz ya da limit üstü (maksimum 10 GB)."}, ensure_ascii=False)
-    users = _load_users()
-    s = _find_user(sender_id, users)
-    r = next((u for u in users if _normalize_phone(u.get("phone_number","")) == _normalize_phone(receiver_number)), None)
-    if not s:
-        return json.dumps({"success": False, "error": "Gönderen kullanıcı bulunamadı."}, ensure_ascii=False)
-    if not r:
-        return json.dumps({"success": False, "error": "Alıcı kullanıcı bulunamadı."}, ensure_ascii=False)
-    gb_price = 50
-    total = gb_price * amount
-    bills = s.get("bills", [])
-    editable = [b for b in bills if b.get("status") in ["Beklemede", "Gecikmiş"]]
-    if not editable:
-        return json.dumps({"success": False, "error": "Düzenlenebilir fatura bulunamadı."}, ensure_ascii=False)
-    latest = max(editable, key=lambda b: datetime.strptime(b.get("bill_date", "1900-01-01"), "%Y-%m-%d"))
-    latest["amount"] = float(latest.get("amount", 0)) + total
-    br = latest.setdefault("breakdown", {})
-    try:
-        base_val = float(str(br.get("base", "0")).replace(" TL", ""))
-    except Exception:
-        base_val = 0.0
-    br["base"] = f"{base_val + total:.2f} TL"
-    details = latest.get("details", "")
-    latest["details"] = (details + " + " if details else "") + f"{amount} GB hediye internet"
-    r.setdefault("usage_history", {})
-    r["usage_history"]["internet_gb_used_monthly"] = r["usage_history"].get("internet_gb_used_monthly", 0) + amount
-    _save_users(users)
-    return json.dumps({"success": True, "message": f"{r.get('name','')} kullanıcısına {amount} GB gönderildi. Faturaya {total} TL eklendi.", "updated_bill": latest}, ensure_ascii=False)
-
-def getReceivedGifts(user_identifier: str) -> str:
-    return json.dumps({"success": True, "gifts": [{"type": "internet", "amount": "2GB", "sender": "Bilinmiyor", "date": "2025-07-04"}]}, ensure_ascii=False)
-
-def requestInstallmentPlan(user_identifier: str, total_amount: float, installments: int) -> str:
-    return json.dumps({"success": True, "message": f"{total_amount} TL {installments} taksite bölündü (örnek)."}, ensure_ascii=False)
-
-def checkInfrastructure(address: str) -> str:
-    return json.dumps({"success": True, "infrastructure": "fiber (örnek)"}, ensure_ascii=False)
-
-def scheduleInternetRelocation(user_identifier: str, new_address: dict) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            old = u.get("address", {})
-            u["address"] = new_address
-            u.setdefault("appointments", []).append({
-                "type": "İnternet Nakil",
-                "requested_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "status": "Planlandı",
-                "old_address": old,
-                "new_address": new_address,
-            })
-            _save_users(users)
-            return json.dumps({"success": True, "message": f"İnternet taşıma kaydedildi. Yeni adres: {new_address.get('street')}, {new_address.get('city')} ({new_address.get('zip_code')})"}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı. Taşıma yapılamadı."}, ensure_ascii=False)
-
-def checkContractEndDate(user_identifier: str) -> str:
-    return json.dumps({"success": True, "contract_end_date": "2025-12-31", "days_remaining": 180, "message": "Taahhüt bitiş tarihi (örnek)."}, ensure_ascii=False)
-
-def freezeLine(user_identifier: str, reason: str = "Kullanıcı talebiyle donduruldu") -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            if u.get("status") == "pasif":
-                return json.dumps({"success": True, "message": "Hattınız zaten pasif."}, ensure_ascii=False)
-            u["status"] = "pasif"
-            _save_users(users)
-            return json.dumps({"success": True, "message": f"Hat donduruldu. ({reason})"}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def activateLine(user_identifier: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            if u.get("status") == "aktif" and (u.get("service_status","").lower() == "aktif"):
-                return json.dumps({"success": True, "message": "Hattınız zaten aktif."}, ensure_ascii=False)
-            u["status"] = "aktif"
-            u["service_status"] = "Aktif"
-            _save_users(users)
-            return json.dumps({"success": True, "message": "Hat aktifleştirildi."}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı."}, ensure_ascii=False)
-
-def deleteSubscription(user_identifier: str, reason: str) -> str:
-    users = _load_users()
-    for u in users:
-        if _find_user(user_identifier, [u]):
-            u["status"] = "pasif"
-            u["service_status"] = "İptal Edildi"
-            _save_users(users)
-            return json.dumps({"success": True, "message": f"Abonelik '{reason}' nedeniyle iptal edildi."}, ensure_ascii=False)
-    return json.dumps({"success": False, "message": "Kullanıcı bulunamadı."}, ensure_ascii=False)
+        return ToolResult({"success": False, "error": "Gönderim miktarı geçersiz ya da limit üstü (maksimum 10 GB)."})
+    with _backend().transaction(sender_id, phones=[receiver_number]) as (s, r):
+        if s and r and r.get("customer_id") == s.get("customer_id"):
+            r = s  # kendine hediye: iki ayrı kopya birbirinin değişikliğini ezmesin
+        if not s:
+            return ToolResult({"success": False, "error": "Gönderen kullanıcı bulunamadı."})
+        if not r:
+            return ToolResult({"success": False, "error": "Alıcı kullanıcı bulunamadı."})
+        gb_price = 50
+        total = gb_price * amount
+        latest = _backend().latest_editable_bill(s)
+        if not latest:
+            return ToolResult({"success": False, "error": "Düzenlenebilir fatura bulunamadı."})
+        latest["amount"] = float(latest.get("amount", 0)) + total
+        br = latest.setdefault("breakdown", {})
+        try:
+            base_val = float(str(br.get("base", "0")).replace(" TL", ""))
+        except Exception:
+            base_val = 0.0
+        br["base"] = f"{base_val + total:.2f} TL"
+        details = latest.get("details", "")
+        latest["details"] = (details + " + " if details else "") + f"{amount} GB hediye internet"
+        r.setdefault("usage_history", {})
+        r["usage_history"]["internet_gb_used_monthly"] = r["usage_history"].get("internet_gb_used_monthly", 0) + amount
+        _save_users(s, r)
+        return ToolResult({"success": True, "message": f"{r.get('name','')} kullanıcısına {amount} GB gönderildi. Faturaya {total} TL eklendi.", "updated_bill": _detach(latest)})
+
+def getReceivedGifts(user_identifier: str) -> ToolResult:
+    return ToolResult({"success": True, "gifts": [{"type": "internet", "amount": "2GB", "sender": "Bilinmiyor", "date": "2025-07-04"}]})
+
+def requestInstallmentPlan(user_identifier: str, total_amount: float, installments: int) -> ToolResult:
+    return ToolResult({"success": True, "message": f"{total_amount} TL {installments} taksite bölündü (örnek)."})
+
+def checkInfrastructure(address: str) -> ToolResult:
+    return ToolResult({"success": True, "infrastructure": "fiber (örnek)"})
+
+def scheduleInternetRelocation(user_identifier: str, new_address: dict) -> ToolResult:
+    with _backend().transaction(user_identifier) as (u,):
+        if not u:
+            return ToolResult({"success": False, "message": "Kullanıcı bulunamadı. Taşıma yapılamadı."})
+        old = u.get("address", {})
+        u["address"] = new_address
+        u.setdefault("appointments", []).append({
+            "type": "İnternet Nakil",
+            "requested_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "status": "Planlandı",
+            "old_address": old,
+            "new_address": new_address,
+        })
+        _save_users(u)
+        return ToolResult({"success": True, "message": f"İnternet taşıma kaydedildi. Yeni adres: {new_address.get('street')}, {new_address.get('city')} ({new_address.get('zip_code')})"})
+
+def checkContractEndDate(user_identifier: str) -> ToolResult:
+    return ToolResult({"success": True, "contract_end_date": "2025-12-31", "days_remaining": 180, "message": "Taahhüt bitiş tarihi (örnek)."})
+
+def freezeLine(user_identifier: str, reason: str = "Kullanıcı talebiyle donduruldu") -> ToolResult:
+    with _backend().transaction(user_identifier) as (u,):
+        if not u:
+            return ToolResult({"success": False, "message": "Kullanıcı bulunamadı."})
+        if u.get("status") == "pasif":
+            return ToolResult({"success": True, "message": "Hattınız zaten pasif."})
+        u["status"] = "pasif"
+        _save_users(u)
+        return ToolResult({"success": True, "message": f"Hat donduruldu. ({reason})"})
+
+def activateLine(user_identifier: str) -> ToolResult:
+    with _backend().transaction(user_identifier) as (u,):
+        if not u:
+            return ToolResult({"success": False, "message": "Kullanıcı bulunamadı."})
+        if u.get("status") == "aktif" and (u.get("service_status","").lower() == "aktif"):
+            return ToolResult({"success": True, "message": "Hattınız zaten aktif."})
+        u["status"] = "aktif"
+        u["service_status"] = "Aktif"
+        _save_users(u)
+        return ToolResult({"success": True, "message": "Hat aktifleştirildi."})
+
+def deleteSubscription(user_identifier: str, reason: str) -> ToolResult:
+    with _backend().transaction(user_identifier) as (u,):
+        if not u:
+            return ToolResult({"success": False, "message": "Kullanıcı bulunamadı."})
+        u["status"] = "pasif"
+        u["service_status"] = "İptal Edildi"
+        _save_users(u)
+        return ToolResult({"success": True, "message": f"Abonelik '{reason}' nedeniyle iptal edildi."})
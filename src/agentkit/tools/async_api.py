@@ -0,0 +1,56 @@
+# src/agentkit/tools/async_api.py
+"""Araçların asenkron karşılıkları; sınırlı bir iş parçacığı havuzunda (`AGENTKIT_TOOL_WORKERS`) çalışır."""
+from __future__ import annotations
+
+import os
+import asyncio
+import functools
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from agentkit.tools import api_functions as api
+from agentkit.tools.result import ToolResult
+from agentkit.tools.schemas import function_schemas
+
+TOOL_WORKERS = int(os.getenv("AGENTKIT_TOOL_WORKERS", str(min(32, (os.cpu_count() or 1) + 4))))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=max(1, TOOL_WORKERS), thread_name_prefix="agentkit-tool")
+    return _executor
+
+
+def shutdown(wait: bool = True) -> None:
+    global _executor
+    with _executor_lock:
+        ex, _executor = _executor, None
+    if ex is not None:
+        ex.shutdown(wait=wait)
+
+
+async def run_tool(fn: Callable[..., ToolResult], *args: Any, **kwargs: Any) -> ToolResult:
+    """Senkron aracı havuzda çalıştırır; olay döngüsü beklemez."""
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(executor(), functools.partial(ctx.run, fn, *args, **kwargs))
+
+
+def make_async(fn: Callable[..., ToolResult]) -> Callable[..., Awaitable[ToolResult]]:
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> ToolResult:
+        return await run_tool(fn, *args, **kwargs)
+    return wrapper
+
+
+async_function_map: Dict[str, Callable[..., Awaitable[ToolResult]]] = {
+    s["name"]: make_async(getattr(api, s["name"])) for s in function_schemas
+}
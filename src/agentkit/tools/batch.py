@@ -0,0 +1,70 @@
+# src/agentkit/tools/batch.py
+"""Arka ofis için toplu araç çağrıları: parça başına tek kilitleme ve tek yazma."""
+from __future__ import annotations
+
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from agentkit.tools import api_functions as api
+from agentkit.tools.result import ToolResult
+
+BATCH_CHUNK = int(os.getenv("AGENTKIT_BATCH_CHUNK", "1000"))
+
+
+def _apply(fn: Callable[..., ToolResult], ident: str, kwargs: Dict[str, Any]) -> ToolResult:
+    try:
+        res = fn(ident, **kwargs)
+    except Exception as e:
+        res = ToolResult({"success": False, "error": f"İşlem hatası: {e}"})
+    return ToolResult({"user_identifier": ident, **res})
+
+
+def run_batch(fn: Callable[..., ToolResult], user_identifiers: Iterable[str], chunk_size: Optional[int] = None,
+              write: bool = True, **kwargs: Any) -> ToolResult:
+    """
+    `fn(user_identifier, **kwargs)` aracını her kimliğe uygular; yazmalar parça
+    başına bir kez yapılır. `write=False` (salt okunur araç) kilit almaz.
+    """
+    ids = [str(i) for i in user_identifiers]
+    size = max(1, chunk_size or BATCH_CHUNK)
+    results: List[Dict[str, Any]] = []
+    if not write:
+        results = [_apply(fn, ident, kwargs) for ident in ids]
+    else:
+        for start in range(0, len(ids), size):
+            chunk = ids[start:start + size]
+            with api._backend().batch(*chunk):
+                results.extend(_apply(fn, ident, kwargs) for ident in chunk)
+    ok = sum(1 for r in results if r.get("success"))
+    return ToolResult({
+        "success": True,
+        "results": results,
+        "succeeded": ok,
+        "failed": len(results) - ok,
+        "message": f"{len(results)} kayıt işlendi: {ok} başarılı, {len(results) - ok} başarısız.",
+    })
+
+
+def enable5GBatch(user_identifiers: List[str], chunk_size: Optional[int] = None) -> ToolResult:
+    return run_batch(api.enable5G, user_identifiers, chunk_size)
+
+
+def unblockIncomingNumberBatch(user_identifiers: List[str], target_number: str, chunk_size: Optional[int] = None) -> ToolResult:
+    return run_batch(api.unblockIncomingNumber, user_identifiers, chunk_size, target_number=target_number)
+
+
+def blockIncomingNumberBatch(user_identifiers: List[str], target_number: str, chunk_size: Optional[int] = None) -> ToolResult:
+    return run_batch(api.blockIncomingNumber, user_identifiers, chunk_size, target_number=target_number)
+
+
+def getBillDetailsBatch(user_identifiers: List[str], bill_id: Optional[str] = None, period: Optional[str] = None,
+                        chunk_size: Optional[int] = None) -> ToolResult:
+    return run_batch(api.getBillDetails, user_identifiers, chunk_size, write=False, bill_id=bill_id, period=period)
+
+
+batch_function_map: Dict[str, Callable[..., ToolResult]] = {
+    "enable5G": enable5GBatch,
+    "unblockIncomingNumber": unblockIncomingNumberBatch,
+    "blockIncomingNumber": blockIncomingNumberBatch,
+    "getBillDetails": getBillDetailsBatch,
+}
@@ -0,0 +1,203 @@
+# src/agentkit/tools/cache.py
+"""Salt okunur araçlar için TTL'li LRU sonuç önbelleği; müşteri kaydedilince o müşterinin girdileri düşer."""
+from __future__ import annotations
+
+import os
+import time
+import inspect
+import functools
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from agentkit.storage import StorageBackend, normalize_phone
+from agentkit.tools.result import ToolResult
+
+# "auto" (varsayılan): yalnızca okuması pahalı arka uçlarda (SQLite, lazy JSON) açık; "true" / "false" zorlar.
+_mode = os.getenv("AGENTKIT_TOOL_CACHE", "auto").strip().lower()
+TOOL_CACHE: Optional[bool] = None if _mode == "auto" else _mode in {"1", "true", "yes"}
+TOOL_CACHE_SIZE = int(os.getenv("AGENTKIT_TOOL_CACHE_SIZE", "4096"))
+TOOL_CACHE_TTL = float(os.getenv("AGENTKIT_TOOL_CACHE_TTL", "30"))
+
+_MISSING = object()
+
+
+class ToolCache:
+    """(araç, argümanlar) → ToolResult; LRU + TTL, müşteri ID'siyle etiketli, iş parçacığı güvenli."""
+
+    def __init__(self, max_entries: int = TOOL_CACHE_SIZE, ttl: float = TOOL_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, str, ToolResult]]" = OrderedDict()
+        self._by_tag: Dict[str, Set[Hashable]] = {}
+        # Her geçersiz kılmada artar; hesaplama sırasında değiştiyse sonuç önbelleğe yazılmaz.
+        self.epoch = 0
+        self._lock = threading.Lock()
+        self._stats: Dict[str, List[int]] = {}
+        self.invalidations = 0
+
+    def _count(self, tool: str, hit: bool) -> None:
+        self._stats.setdefault(tool, [0, 0])[0 if hit else 1] += 1
+
+    def get(self, key: Tuple) -> Optional[ToolResult]:
+        now = time.monotonic()
+        with self._lock:
+            ent = self._entries.get(key)
+            if ent is not None and ent[0] > now:
+                self._entries.move_to_end(key)
+                self._count(key[0], True)
+                return ent[2]
+            if ent is not None:
+                self._drop(key)
+            self._count(key[0], False)
+            return None
+
+    def put(self, key: Tuple, tag: str, result: ToolResult, epoch: int) -> None:
+        with self._lock:
+            if epoch != self.epoch:
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, tag, result)
+            self._by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: Hashable) -> None:
+        _, tag, _ = self._entries.pop(key)
+        keys = self._by_tag.get(tag)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_tag[tag]
+
+    def invalidate(self, changed: Optional[Iterable[dict]]) -> None:
+        """Arka uç dinleyicisi: değişen müşterilerin girdilerini (None ise tümünü) siler."""
+        with self._lock:
+            self.epoch += 1
+            self.invalidations += 1
+            if changed is None:
+                self._entries.clear()
+                self._by_tag.clear()
+                return
+            for u in changed:
+                for key in list(self._by_tag.get((u or {}).get("customer_id") or "", ())):
+                    self._drop(key)
+
+    def clear(self) -> None:
+        self.invalidate(None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            tools = {t: {"hits": h, "misses": m} for t, (h, m) in self._stats.items()}
+            hits = sum(h for h, _ in self._stats.values())
+            misses = sum(m for _, m in self._stats.values())
+            return {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "tools": tools,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self.invalidations = 0
+
+
+_caches_lock = threading.Lock()
+
+
+class _Probe(threading.local):
+    slot: Optional[List[Optional[str]]] = None
+
+
+_probe = _Probe()
+
+
+def note_customer(customer: Optional[dict]) -> None:
+    """Araç içinde bulunan müşteri; önbellek girdisi bu müşterinin ID'siyle etiketlenir."""
+    slot = _probe.slot
+    if slot is not None and customer:
+        slot.append(customer.get("customer_id"))
+
+
+def cache_for(backend: StorageBackend) -> ToolCache:
+    """Arka uca bağlı önbellek; ilk çağrıda oluşturulup dinleyici olarak kaydedilir."""
+    cache = backend.__dict__.get("_tool_cache")
+    if cache is None:
+        with _caches_lock:
+            cache = backend.__dict__.get("_tool_cache")
+            if cache is None:
+                cache = ToolCache()
+                backend.add_listener(cache.invalidate)
+                backend.__dict__["_tool_cache"] = cache
+    return cache
+
+
+def enabled_for(backend: StorageBackend) -> bool:
+    return TOOL_CACHE if TOOL_CACHE is not None else not backend.in_memory
+
+
+def _key_ident(ident: Any) -> Any:
+    # "0532 111 22 33" ve "05321112233" aynı müşteriye çözülür; diğer kimlikler olduğu gibi kalır.
+    if isinstance(ident, str):
+        p = normalize_phone(ident)
+        if p.isdigit():
+            return p
+    return ident
+
+
+def cached(backend: Callable[[], StorageBackend], version: Optional[Callable[[StorageBackend], Any]] = None):
+    """
+    `fn(user_identifier, ...)` aracını önbellekli hale getirir. Araç bulduğu
+    müşteriyi `note_customer` ile bildirmelidir; müşteri bulunamayan sonuçlar
+    saklanmaz. `version(backend)` verilirse anahtara eklenir (ör. paket
+    kataloğu damgası).
+    """
+    def deco(fn: Callable[..., ToolResult]) -> Callable[..., ToolResult]:
+        params = list(inspect.signature(fn).parameters.values())
+        name, nparams = fn.__name__, len(params)
+        index = {p.name: i for i, p in enumerate(params)}
+        defaults = [_MISSING if p.default is inspect.Parameter.empty else p.default for p in params]
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> ToolResult:
+            b = backend()
+            if not enabled_for(b):
+                return fn(*args, **kwargs)
+            # Aynı veriye başka bir süreç yazdıysa (ör. paylaşılan SQLite) önbellek boşalır.
+            b.poll()
+            vals = defaults[:]
+            try:
+                vals[:len(args)] = args
+                for k, v in kwargs.items():
+                    vals[index[k]] = v
+                if len(vals) > nparams or _MISSING in vals:
+                    raise TypeError
+                key = (name, _key_ident(vals[0]), *vals[1:])
+                if version is not None:
+                    key += (version(b),)
+                cache = cache_for(b)
+                res = cache.get(key)
+            except (KeyError, TypeError):
+                return fn(*args, **kwargs)  # hatalı / hashlenemeyen argümanlar: önbelleksiz
+            if res is not None:
+                return res
+            epoch = cache.epoch
+            outer, _probe.slot = _probe.slot, []
+            try:
+                res = fn(*args, **kwargs)
+                found = _probe.slot
+            finally:
+                _probe.slot = outer
+            if found and found[0]:
+                cache.put(key, found[0], res, epoch)
+            return res
+        return wrapper
+    return deco
@@ -0,0 +1,156 @@
+# src/agentkit/tools/metrics.py
+"""Araç başına çağrı sayısı, gecikme histogramı, hata oranı ve (örneklenen) yanıt boyutu."""
+from __future__ import annotations
+
+import os
+import time
+import bisect
+import functools
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+TOOL_METRICS = os.getenv("AGENTKIT_TOOL_METRICS", "true").lower() in {"1", "true", "yes"}
+TOOL_METRICS_SAMPLE = int(os.getenv("AGENTKIT_TOOL_METRICS_SAMPLE", "8"))
+
+# Histogram üst sınırları (ms); son kova sınırsız.
+BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+_BOUNDS_NS = [int(b * 1e6) for b in BUCKETS_MS]
+
+
+class _Stats:
+    __slots__ = ("calls", "errors", "failures", "total_ns", "max_ns", "buckets",
+                 "sized", "bytes_total", "bytes_max", "tokens_total")
+
+    def __init__(self) -> None:
+        self.calls = self.errors = self.failures = self.total_ns = self.max_ns = 0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.sized = self.bytes_total = self.bytes_max = self.tokens_total = 0
+
+
+class ToolMetrics:
+    """Araç adı → sayaçlar; iş parçacığı güvenli."""
+
+    def __init__(self, sample_every: int = TOOL_METRICS_SAMPLE,
+                 token_counter: Optional[Callable[[str], int]] = None):
+        self.sample_every = max(1, sample_every)
+        self.token_counter = token_counter
+        self._stats: Dict[str, _Stats] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def record(self, tool: str, elapsed_ns: int, result: Any = None, error: bool = False) -> None:
+        with self._lock:
+            s = self._stats.get(tool)
+            if s is None:
+                s = self._stats[tool] = _Stats()
+            s.calls += 1
+            s.total_ns += elapsed_ns
+            if elapsed_ns > s.max_ns:
+                s.max_ns = elapsed_ns
+            s.buckets[bisect.bisect_left(_BOUNDS_NS, elapsed_ns)] += 1
+            if error:
+                s.errors += 1
+                return
+            if isinstance(result, dict) and result.get("success") is False:
+                s.failures += 1
+            sample = (s.calls - 1) % self.sample_every == 0
+        if sample and result is not None:
+            self._record_size(s, str(result))
+
+    def _record_size(self, s: _Stats, text: str) -> None:
+        size = len(text.encode("utf-8"))
+        tokens = 0
+        if self.token_counter is not None:
+            try:
+                tokens = self.token_counter(text)
+            except Exception:
+                tokens = 0
+        with self._lock:
+            s.sized += 1
+            s.bytes_total += size
+            s.tokens_total += tokens
+            if size > s.bytes_max:
+                s.bytes_max = size
+
+    def wrap(self, tool: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            t0 = time.perf_counter_ns()
+            try:
+                res = fn(*args, **kwargs)
+            except BaseException:
+                self.record(tool, time.perf_counter_ns() - t0, error=True)
+                raise
+            self.record(tool, time.perf_counter_ns() - t0, res)
+            return res
+        return wrapper
+
+    def wrap_async(self, tool: str, fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            t0 = time.perf_counter_ns()
+            try:
+                res = await fn(*args, **kwargs)
+            except BaseException:
+                self.record(tool, time.perf_counter_ns() - t0, error=True)
+                raise
+            self.record(tool, time.perf_counter_ns() - t0, res)
+            return res
+        return wrapper
+
+    @staticmethod
+    def _quantile(buckets: List[int], calls: int, q: float, max_ms: float) -> float:
+        # Kova üst sınırı (Prometheus `le` gibi); son kovada gözlenen en büyük değer.
+        need, seen = q * calls, 0
+        for i, n in enumerate(buckets):
+            seen += n
+            if seen >= need:
+                return min(BUCKETS_MS[i], max_ms) if i < len(BUCKETS_MS) else max_ms
+        return max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON'a çevrilebilir anlık görüntü; sayaçlar sıfırlanmaz."""
+        with self._lock:
+            items = [(name, s.calls, s.errors, s.failures, s.total_ns, s.max_ns, list(s.buckets),
+                      s.sized, s.bytes_total, s.bytes_max, s.tokens_total) for name, s in self._stats.items()]
+        tools = {}
+        for name, calls, errors, failures, total_ns, max_ns, buckets, sized, b_total, b_max, t_total in items:
+            max_ms = max_ns / 1e6
+            tools[name] = {
+                "calls": calls,
+                "errors": errors,
+                "failures": failures,
+                "error_rate": errors / calls,
+                "failure_rate": failures / calls,
+                "mean_ms": total_ns / calls / 1e6,
+                "p50_ms": self._quantile(buckets, calls, 0.50, max_ms),
+                "p95_ms": self._quantile(buckets, calls, 0.95, max_ms),
+                "p99_ms": self._quantile(buckets, calls, 0.99, max_ms),
+                "max_ms": max_ms,
+                "histogram_ms": {str(le): n for le, n in zip(BUCKETS_MS + ("+Inf",), buckets)},
+                "size_samples": sized,
+                "bytes_mean": b_total / sized if sized else None,
+                "bytes_max": b_max if sized else None,
+                "tokens_mean": t_total / sized if sized and self.token_counter is not None else None,
+            }
+        return {"started_at": self.started_at, "taken_at": time.time(), "sample_every": self.sample_every,
+                "tools": tools}
+
+    def format_table(self) -> str:
+        """Konsol için özet tablo (çağrı sayısına göre)."""
+        tools = self.snapshot()["tools"]
+        lines = [f"{'tool':<30} {'calls':>7} {'err':>5} {'fail':>5} {'p50_ms':>8} {'p95_ms':>8} {'bytes':>7}"]
+        for name, t in sorted(tools.items(), key=lambda kv: -kv[1]["calls"]):
+            size = f"{t['bytes_mean']:>7.0f}" if t["bytes_mean"] is not None else f"{'-':>7}"
+            lines.append(f"{name:<30} {t['calls']:>7} {t['errors']:>5} {t['failures']:>5} "
+                         f"{t['p50_ms']:>8.2f} {t['p95_ms']:>8.2f} {size}")
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self.started_at = time.time()
+
+
+# Süreç geneli örnek; araç kaydı bunu kullanır.
+metrics = ToolMetrics()
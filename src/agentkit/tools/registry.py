@@ -1,12 +1,27 @@
 # src/agentkit/tools/registry.py
-from typing import Any, Dict, List, Optional, Union
-from pydantic import BaseModel, Field, create_model
-from langchain.tools import StructuredTool
+"""LangChain araç kaydı; araçlar ve argüman modelleri ilk erişimde kurulur (bkz. `AGENTKIT_CACHE_DIR`)."""
+from __future__ import annotations
 
+import os
+import sys
+import json
+import keyword
+import hashlib
+import tempfile
+import threading
+import importlib.util
+from typing import Any, Callable, Dict, List, Optional
+
+from agentkit.tools import schemas as _schemas
 from agentkit.tools.schemas import function_schemas
-from agentkit.tools import api_functions as api
 
-function_map = {s["name"]: getattr(api, s["name"]) for s in function_schemas}
+CACHE_DIR = os.path.expanduser(os.getenv("AGENTKIT_CACHE_DIR", os.path.join("~", ".cache", "agentkit")))
+# Üretilen kodun biçimi değişirse artırılır.
+_CODEGEN_VERSION = 1
+
+_lock = threading.RLock()
+_built: Dict[str, Any] = {}
+
 
 def _jsonschema_to_pytype(schema: Dict[str, Any]) -> Any:
     t = schema.get("type", "string")
@@ -25,31 +40,135 @@ def _jsonschema_to_pytype(schema: Dict[str, Any]) -> Any:
         return Dict[str, Any]
     return Any
 
-def build_args_schemas(function_schemas: List[Dict[str, Any]]) -> Dict[str, type[BaseModel]]:
-    out: Dict[str, type[BaseModel]] = {}
+
+def _jsonschema_to_source(schema: Dict[str, Any]) -> str:
+    t = schema.get("type", "string")
+    if t == "array":
+        return f"List[{_jsonschema_to_source(schema.get('items', {'type': 'string'}))}]"
+    return {"string": "str", "integer": "int", "number": "float", "boolean": "bool",
+            "object": "Dict[str, Any]"}.get(t, "Any")
+
+
+def _fields(f: Dict[str, Any]):
+    params = f.get("parameters", {}) or {}
+    required = set(params.get("required", []) or [])
+    for pname, pschema in (params.get("properties", {}) or {}).items():
+        yield pname, pschema, pname in required
+
+
+def build_args_schemas(function_schemas: List[Dict[str, Any]]):
+    from pydantic import BaseModel, ConfigDict, Field, create_model
+
+    out = {}
     for f in function_schemas:
-        params = f.get("parameters", {}) or {}
-        props: Dict[str, Any] = params.get("properties", {}) or {}
-        required = set(params.get("required", []) or [])
         fields: Dict[str, tuple[Any, Any]] = {}
-        for pname, pschema in props.items():
+        for pname, pschema, required in _fields(f):
             ptype = _jsonschema_to_pytype(pschema)
             pdesc = pschema.get("description")
-            if pname in required:
+            if required:
                 fields[pname] = (ptype, Field(..., description=pdesc))
             else:
                 fields[pname] = (Optional[ptype], Field(None, description=pdesc))  # type: ignore
         model_name = f"{f.get('name','Tool')}Args"
-        out[f["name"]] = create_model(model_name, __base__=BaseModel, **fields)  # type: ignore
+        out[f["name"]] = create_model(model_name, __config__=ConfigDict(defer_build=True), **fields)  # type: ignore
     return out
 
-def build_structured_tools() -> List[StructuredTool]:
-    args_schemas = build_args_schemas(function_schemas)
-    tools: List[StructuredTool] = []
+
+def args_source(function_schemas: List[Dict[str, Any]]) -> Optional[str]:
+    """`build_args_schemas` ile aynı modelleri tanımlayan modül kaynağı; adlar uygun değilse None."""
+    lines = [
+        "# agentkit.tools.registry tarafından üretildi; elle değiştirmeyin.",
+        "from typing import Any, Dict, List, Optional",
+        "from pydantic import BaseModel, ConfigDict, Field",
+        "",
+        "ARGS = {}",
+    ]
+    for f in function_schemas:
+        cls = f"{f.get('name', 'Tool')}Args"
+        if not cls.isidentifier():
+            return None
+        lines += ["", "", f"class {cls}(BaseModel):", "    model_config = ConfigDict(defer_build=True)"]
+        for pname, pschema, required in _fields(f):
+            if not pname.isidentifier() or keyword.iskeyword(pname) or pname.startswith("_"):
+                return None
+            ptype = _jsonschema_to_source(pschema)
+            desc = repr(pschema.get("description"))
+            if required:
+                lines.append(f"    {pname}: {ptype} = Field(..., description={desc})")
+            else:
+                lines.append(f"    {pname}: Optional[{ptype}] = Field(None, description={desc})")
+        lines += ["", "", f"ARGS[{f['name']!r}] = {cls}"]
+    return "\n".join(lines) + "\n"
+
+
+def cache_key() -> str:
+    """`schemas.py` içeriği + kod üreteci / pydantic / langchain sürümlerinin özeti."""
+    import pydantic
+    import langchain_core
+
+    h = hashlib.sha256(f"{_CODEGEN_VERSION}:{pydantic.VERSION}:{langchain_core.__version__}".encode())
+    with open(_schemas.__file__, "rb") as f:
+        h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+def _write_atomic(path: str, text: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def _load_args_schemas(key: str):
+    path = os.path.join(CACHE_DIR, f"registry_args_{key}.py")
+    try:
+        if not os.path.exists(path):
+            src = args_source(function_schemas)
+            if src is None:
+                return build_args_schemas(function_schemas)
+            _write_atomic(path, src)
+        name = f"_agentkit_registry_args_{key}"
+        spec = importlib.util.spec_from_file_location(name, path)
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        sys.modules[name] = mod
+        return mod.ARGS
+    except (OSError, SyntaxError, AttributeError):
+        # Önbellek dizini yazılamıyor / dosya bozuk: modeller bellekte kurulur.
+        return build_args_schemas(function_schemas)
+
+
+def _function_map() -> Dict[str, Callable[..., Any]]:
+    with _lock:
+        if "function_map" not in _built:
+            from agentkit.tools import api_functions as api
+            _built["function_map"] = {s["name"]: getattr(api, s["name"]) for s in function_schemas}
+        return _built["function_map"]
+
+
+def build_structured_tools(args_schemas=None) -> list:
+    from langchain_core.tools import StructuredTool
+    from agentkit.tools.async_api import async_function_map
+    from agentkit.tools.metrics import TOOL_METRICS, metrics
+
+    args_schemas = args_schemas or build_args_schemas(function_schemas)
+    function_map = _function_map()
+    tools = []
     for s in function_schemas:
+        func, coroutine = function_map[s["name"]], async_function_map[s["name"]]
+        if TOOL_METRICS:
+            func, coroutine = metrics.wrap(s["name"], func), metrics.wrap_async(s["name"], coroutine)
         tools.append(
             StructuredTool.from_function(
-                func=function_map[s["name"]],
+                func=func,
+                # ainvoke/astream: araç sınırlı iş parçacığı havuzunda, olay döngüsü bloklanmaz.
+                coroutine=coroutine,
                 name=s["name"],
                 description=s.get("description", ""),
                 args_schema=args_schemas[s["name"]],
@@ -58,4 +177,50 @@ def build_structured_tools() -> List[StructuredTool]:
         )
     return tools
 
-tools = build_structured_tools()
+
+def get_tools() -> list:
+    """StructuredTool listesi; süreç başına bir kez kurulur."""
+    with _lock:
+        if "tools" not in _built:
+            _built["key"] = cache_key()
+            _built["tools"] = build_structured_tools(_load_args_schemas(_built["key"]))
+        return _built["tools"]
+
+
+def render_tools(tools: list) -> str:
+    """
+    `render_text_description_and_args` ile aynı metin; kayıttaki araç listesi
+    için önbellekten okunur.
+    """
+    from langchain_core.tools.render import render_text_description_and_args
+
+    if [id(t) for t in tools] != [id(t) for t in get_tools()]:
+        return render_text_description_and_args(tools)
+    with _lock:
+        if "rendered" not in _built:
+            path = os.path.join(CACHE_DIR, f"registry_rendered_{_built['key']}.json")
+            try:
+                with open(path, encoding="utf-8") as f:
+                    _built["rendered"] = json.load(f)["rendered"]
+            except (OSError, ValueError, KeyError):
+                _built["rendered"] = render_text_description_and_args(tools)
+                try:
+                    _write_atomic(path, json.dumps({"rendered": _built["rendered"]}, ensure_ascii=False))
+                except OSError:
+                    pass
+        return _built["rendered"]
+
+
+def __getattr__(name: str) -> Any:
+    # Araçlar ToolResult (dict) döner; eski JSON metni çıktısı için legacy_function_map.
+    if name == "tools":
+        return get_tools()
+    if name == "function_map":
+        return _function_map()
+    if name == "legacy_function_map":
+        from agentkit.tools.result import legacy_map
+        with _lock:
+            if "legacy_function_map" not in _built:
+                _built["legacy_function_map"] = legacy_map(_function_map())
+            return _built["legacy_function_map"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
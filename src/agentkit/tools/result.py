@@ -0,0 +1,49 @@
+# src/agentkit/tools/result.py
+"""Araç sonuçları: `ToolResult` (dict alt sınıfı), metne yalnızca ajan sınırında çevrilir."""
+from __future__ import annotations
+
+import json
+import functools
+from typing import Any, Callable, Dict
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class ToolResult(dict):
+    """Araç yanıtı: {"success": ..., "data"/"message"/"error": ...}.
+
+    Kayıttan gelen alanlar kilit altında kopyalanır; sonuç kilit dışında serileştirilebilir.
+    """
+
+    __slots__ = ()
+
+    def to_json(self) -> str:
+        """Ajana verilen kompakt JSON metni."""
+        if orjson is not None:
+            try:
+                return orjson.dumps(self).decode("utf-8")
+            except TypeError:
+                pass  # orjson'un desteklemediği tür (str olmayan anahtar, büyük int ...)
+        return json.dumps(self, ensure_ascii=False, separators=(",", ":"), default=str)
+
+    def to_legacy(self) -> str:
+        """Araçların eskiden döndürdüğü metnin aynısı."""
+        return json.dumps(self, ensure_ascii=False)
+
+    __str__ = to_json
+
+
+def legacy(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Aracı eski metin çıktılı imzasıyla sarar."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        res = fn(*args, **kwargs)
+        return res.to_legacy() if isinstance(res, ToolResult) else res
+    return wrapper
+
+
+def legacy_map(functions: Dict[str, Callable[..., Any]]) -> Dict[str, Callable[..., Any]]:
+    return {name: legacy(fn) for name, fn in functions.items()}
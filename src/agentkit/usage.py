@@ -0,0 +1,21 @@
+# src/agentkit/usage.py
+"""
+İş parçacığı başına LLM kullanım sayaçları (KPI her senaryoyu kendi iş
+parçacığında koşar). Yerel üretim hattı ve model sunucusu istemcisi aynı
+sayaçlara yazar; torch içe aktarmaz.
+"""
+import threading
+
+_usage = threading.local()
+
+
+def usage() -> dict:
+    """Bu iş parçacığındaki üretim çağrısı, istem ve üretilen token sayıları (kümülatif)."""
+    return {"calls": getattr(_usage, "calls", 0), "prompt_tokens": getattr(_usage, "prompt_tokens", 0),
+            "generated_tokens": getattr(_usage, "generated_tokens", 0)}
+
+
+def record(calls: int = 0, prompt_tokens: int = 0, generated_tokens: int = 0) -> None:
+    _usage.calls = getattr(_usage, "calls", 0) + calls
+    _usage.prompt_tokens = getattr(_usage, "prompt_tokens", 0) + prompt_tokens
+    _usage.generated_tokens = getattr(_usage, "generated_tokens", 0) + generated_tokens